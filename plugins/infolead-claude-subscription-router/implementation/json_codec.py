@@ -0,0 +1,218 @@
+"""
+JSON Codec - Fast JSON encoding/decoding with a stdlib fallback.
+
+Uses orjson when it is installed (several times faster than the json module
+for large state files) and falls back to the standard library otherwise.
+Both backends follow one rule set so results never depend on which is
+installed:
+
+- Integers wider than 64 bits round-trip exactly (orjson would encode-fail
+  or decode them as floats, so those documents go through the stdlib).
+- NaN and Infinity are not JSON: dumps writes them as null and loads
+  rejects the NaN/Infinity literals.
+- Input must be UTF-8 without a byte order mark.
+- Datetime and dataclass values are not encoded: both raise TypeError, so
+  callers convert them explicitly. Enum members and UUIDs, which orjson
+  always encodes natively, are written as their value and string form by
+  the stdlib too.
+- Non-string dict keys are stringified the way orjson's OPT_NON_STR_KEYS
+  does it (including Enum, UUID and datetime keys).
+
+Decode errors are json.JSONDecodeError in all cases.
+
+Usage:
+    from json_codec import dumps, loads
+
+    data = loads(path.read_bytes())
+    path.write_bytes(dumps(data, indent=True))
+
+Change Driver: STATE_PERSISTENCE
+Changes when: Serialization performance requirements evolve
+"""
+
+import json
+import math
+import re
+from datetime import date, time
+from enum import Enum
+from typing import IO, Any, Union
+from uuid import UUID
+
+# Optional accelerator (stdlib json otherwise)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# orjson decodes integers outside the int64/uint64 range as floats; any run
+# of 19+ digits might be one, so such documents are decoded by the stdlib.
+_WIDE_INT_BYTES = re.compile(rb"\d{19}")
+_WIDE_INT_STR = re.compile(r"\d{19}")
+
+
+def _reject_constant(name: str) -> Any:
+    raise json.JSONDecodeError(f"{name} is not valid JSON", name, 0)
+
+
+def _reject(obj: Any) -> Any:
+    """orjson default: nothing beyond what the stdlib path also encodes."""
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    """json default: encode Enum and UUID values the way orjson does."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    return _reject(obj)
+
+
+def _key(key: Any) -> Any:
+    """Dict key as orjson's OPT_NON_STR_KEYS renders it (stdlib handles the rest)."""
+    if isinstance(key, Enum):
+        key = key.value
+    if isinstance(key, UUID):
+        return str(key)
+    if isinstance(key, (date, time)):
+        return key.isoformat()
+    return key
+
+
+def _orjson_keys(obj: Any) -> Any:
+    """Copy obj with dict keys the stdlib rejects converted like orjson's."""
+    if isinstance(obj, dict):
+        return {_key(key): _orjson_keys(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_orjson_keys(value) for value in obj]
+    return obj
+
+
+def _finite(obj: Any) -> Any:
+    """Copy obj with non-finite floats replaced by None (orjson's encoding)."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable value (non-string dict keys are stringified)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        Encoded JSON
+
+    Raises:
+        TypeError: If obj holds a value neither backend encodes
+    """
+    if orjson is not None:
+        option = (orjson.OPT_NON_STR_KEYS
+                  | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_reject, option=option)
+        except orjson.JSONEncodeError:
+            pass  # the stdlib either encodes it (wide ints) or raises TypeError
+    kwargs = {"indent": 2 if indent else None, "allow_nan": False, "default": _stdlib_default}
+    try:
+        text = json.dumps(obj, **kwargs)
+    except TypeError:
+        # Retried only for keys; values the stdlib rejects still raise
+        obj = _orjson_keys(obj)
+        try:
+            text = json.dumps(obj, **kwargs)
+        except ValueError:
+            text = json.dumps(_finite(obj), **kwargs)
+    except ValueError:
+        text = json.dumps(_finite(obj), **kwargs)
+    return text.encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Deserialize JSON from bytes or str.
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+    """
+    if isinstance(data, str):
+        wide = _WIDE_INT_STR.search(data)
+    else:
+        wide = _WIDE_INT_BYTES.search(data)
+    if orjson is not None and wide is None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # re-parse with the stdlib for a consistent verdict
+    if not isinstance(data, str):
+        try:
+            data = bytes(data).decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise json.JSONDecodeError(f"Invalid UTF-8: {e.reason}", "", e.start) from e
+    return json.loads(data, parse_constant=_reject_constant)
+
+
+def dump(obj: Any, fp: IO[str], indent: bool = False) -> None:
+    """Serialize obj as JSON to a text file object."""
+    fp.write(dumps(obj, indent=indent).decode("utf-8"))
+
+
+def load(fp: IO) -> Any:
+    """Deserialize JSON from a text or binary file object."""
+    return loads(fp.read())
+
+
+def test_json_codec() -> None:
+    """Test JSON codec functionality."""
+    print(f"Testing JSON codec (orjson={'yes' if ORJSON_AVAILABLE else 'no'})...")
+
+    # Test 1: Round trip
+    print("Test 1: Round trip")
+    data = {"name": "test", "items": [1, 2.5, None, True], "nested": {"a": "ü"}}
+    assert loads(dumps(data)) == data
+    assert loads(dumps(data).decode("utf-8")) == data
+    print("  OK")
+
+    # Test 2: Indented output
+    print("Test 2: Indentation")
+    assert b'\n  "name"' in dumps(data, indent=True)
+    print("  OK")
+
+    # Test 3: Fallback for values orjson rejects
+    print("Test 3: Wide integers, NaN and non-string keys")
+    assert loads(dumps({"big": 2 ** 70 + 1})) == {"big": 2 ** 70 + 1}
+    assert loads(dumps({"x": float("nan")})) == {"x": None}
+    assert loads(dumps({1: "one"})) == {"1": "one"}
+    print("  OK")
+
+    # Test 4: Decode errors
+    print("Test 4: Decode errors")
+    try:
+        loads(b"{not json")
+        raise AssertionError("Expected JSONDecodeError")
+    except json.JSONDecodeError:
+        pass
+    for bad in (b'{"x": NaN}', b"\xef\xbb\xbf{}"):
+        try:
+            loads(bad)
+            raise AssertionError("Expected JSONDecodeError")
+        except json.JSONDecodeError:
+            pass
+    print("  OK")
+
+    print("\nAll JSON codec tests passed!")
+
+
+if __name__ == "__main__":
+    test_json_codec()
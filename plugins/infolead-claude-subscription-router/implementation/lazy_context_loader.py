@@ -25,7 +25,7 @@ import json
 from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 
 
 # Context budget limits (tokens)
@@ -36,6 +36,12 @@ TOTAL_BUDGET = 200000        # Total Claude Code limit
 # Rough token estimation (4 chars per token average)
 CHARS_PER_TOKEN = 4
 
+# Section markers, matched against the start of each line
+_TEX_SECTION_RE = re.compile(r'\\(chapter|section|subsection)\{([^}]+)\}')
+_PY_DEF_RE = re.compile(r'^(class|def)\s+(\w+)')
+_PY_DEF_START_RE = re.compile(r'^(class|def)\s+')
+_MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+
 
 @dataclass
 class Section:
@@ -182,7 +188,7 @@ class LazyContextLoader:
 
             for i, line in enumerate(lines, start=1):
                 # Match \chapter, \section, \subsection, etc.
-                match = re.match(r'\\(chapter|section|subsection)\{([^}]+)\}', line)
+                match = _TEX_SECTION_RE.match(line)
 
                 if match:
                     # Save previous section if exists
@@ -243,7 +249,7 @@ class LazyContextLoader:
 
             for i, line in enumerate(lines, start=1):
                 # Match class or function definitions
-                match = re.match(r'^(class|def)\s+(\w+)', line)
+                match = _PY_DEF_RE.match(line)
 
                 if match:
                     def_type = match.group(1)
@@ -253,7 +259,7 @@ class LazyContextLoader:
                     # Find end of definition (simplified - just to next def/class)
                     end_line = i
                     for j in range(i, len(lines)):
-                        if re.match(r'^(class|def)\s+', lines[j]):
+                        if _PY_DEF_START_RE.match(lines[j]):
                             end_line = j
                             break
                     else:
@@ -295,7 +301,7 @@ class LazyContextLoader:
 
             for i, line in enumerate(lines, start=1):
                 # Match headings (# Header)
-                match = re.match(r'^(#{1,6})\s+(.+)$', line)
+                match = _MD_HEADING_RE.match(line)
 
                 if match:
                     # Save previous section
@@ -400,6 +406,17 @@ class LazyContextLoader:
             print(f"Error loading section: {e}", file=sys.stderr)
             return None
 
+    def iter_sections(self, file_path: str) -> Iterator[Section]:
+        """Iterate over the sections of a file in document order.
+
+        Args:
+            file_path: Path to file
+
+        Yields:
+            Section metadata
+        """
+        yield from self.metadata_index.get(file_path, ())
+
     def list_sections(self, file_path: str) -> List[Section]:
         """List all sections in a file.
 
@@ -407,9 +424,9 @@ class LazyContextLoader:
             file_path: Path to file
 
         Returns:
-            List of section metadata
+            List of section metadata (a copy; the index is not exposed)
         """
-        return self.metadata_index.get(file_path, [])
+        return list(self.iter_sections(file_path))
 
     def get_stats(self) -> ContextStats:
         """Get context usage statistics.
@@ -36,6 +36,8 @@ from datetime import datetime, timedelta, UTC
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 
+from work_coordinator import read_work_queue
+
 # Metrics storage directory
 METRICS_DIR = Path.home() / ".claude" / "infolead-claude-subscription-router" / "metrics"
 
@@ -387,8 +389,7 @@ class MetricsCollector:
             )
 
         try:
-            with open(state_file) as f:
-                data = json.load(f)
+            data = read_work_queue(state_file)
 
             # Count by status
             work_items = data.get('work_items', [])
@@ -417,7 +418,7 @@ class MetricsCollector:
                 status=status
             )
 
-        except (json.JSONDecodeError, IOError):
+        except (json.JSONDecodeError, IOError, TimeoutError):
             return SolutionMetrics(
                 solution_name='work_coordination',
                 total_events=0,
@@ -887,7 +888,7 @@ class MetricsCollector:
 
             # Show key metrics
             for key, value in sorted(metrics.metrics.items()):
-                if key.endswith('_avg') or key.endswith('_total'):
+                if key.endswith(('_avg', '_total')):
                     display_name = key.replace('_avg', '').replace('_total', ' (total)')
                     if isinstance(value, float):
                         report_lines.append(f"  {display_name}: {value:.1f}")
@@ -1194,9 +1195,8 @@ def display_work_dashboard(work_file: Optional[Path] = None) -> None:
         return
 
     try:
-        with open(work_file) as f:
-            work_data = json.load(f)
-    except (json.JSONDecodeError, IOError):
+        work_data = read_work_queue(work_file)
+    except (json.JSONDecodeError, IOError, TimeoutError):
         print("Could not read work queue.")
         print()
         return
@@ -15,14 +15,14 @@ CLI Usage:
     echo "Test request" | python3 routing_core.py --json
 """
 
-from typing import Dict, Optional, Tuple, List
+from typing import Callable, Dict, Optional, Tuple, List
 import re
 import sys
 import json
 import os
-import subprocess
 from dataclasses import dataclass, asdict
 from enum import Enum
+from functools import lru_cache
 
 
 class RouterDecision(Enum):
@@ -31,9 +31,9 @@ class RouterDecision(Enum):
     ESCALATE_TO_SONNET = "escalate"
 
 
-@dataclass
+@dataclass(frozen=True)
 class RoutingResult:
-    """Result of a routing decision."""
+    """Result of a routing decision (immutable, so cached results can be shared)."""
     decision: RouterDecision
     agent: Optional[str]
     reason: str
@@ -49,6 +49,16 @@ class RoutingResult:
         }
 
 
+def _tier_from_agent_name(agent_name: str) -> str:
+    """Guess model tier from substrings of the agent name."""
+    agent_lower = agent_name.lower()
+    if "haiku" in agent_lower:
+        return "haiku"
+    elif "opus" in agent_lower:
+        return "opus"
+    return "sonnet"
+
+
 def get_model_tier_from_agent_file(agent_name: str, agents_dir: Optional[str] = None) -> str:
     """
     Extract model tier from agent definition file's YAML frontmatter.
@@ -66,20 +76,6 @@ def get_model_tier_from_agent_file(agent_name: str, agents_dir: Optional[str] =
     """
     from pathlib import Path
 
-    # Try to import yaml, fall back gracefully if not available
-    try:
-        import yaml
-    except ImportError:
-        print("Warning: PyYAML not installed. Using fallback agent name matching.", file=sys.stderr)
-        print("Install with: pip install PyYAML", file=sys.stderr)
-        # Fallback to substring matching
-        agent_lower = agent_name.lower()
-        if "haiku" in agent_lower:
-            return "haiku"
-        elif "opus" in agent_lower:
-            return "opus"
-        return "sonnet"
-
     if agents_dir is None:
         # Default to ../agents relative to this file
         agents_dir = Path(__file__).parent.parent / "agents"
@@ -90,12 +86,15 @@ def get_model_tier_from_agent_file(agent_name: str, agents_dir: Optional[str] =
 
     if not agent_file.exists():
         # Fallback to substring matching for unknown agents
-        agent_lower = agent_name.lower()
-        if "haiku" in agent_lower:
-            return "haiku"
-        elif "opus" in agent_lower:
-            return "opus"
-        return "sonnet"
+        return _tier_from_agent_name(agent_name)
+
+    # Imported only once there is a file to parse
+    try:
+        import yaml
+    except ImportError:
+        print("Warning: PyYAML not installed. Using fallback agent name matching.", file=sys.stderr)
+        print("Install with: pip install PyYAML", file=sys.stderr)
+        return _tier_from_agent_name(agent_name)
 
     try:
         content = agent_file.read_text()
@@ -169,6 +168,8 @@ Respond with ONLY a JSON object (no markdown, no explanation):
 
 If the request is ambiguous or requires judgment to route, return null with low confidence."""
 
+    import subprocess
+
     try:
         # Call claude CLI with haiku model
         result = subprocess.run(
@@ -224,6 +225,62 @@ If the request is ambiguous or requires judgment to route, return null with low
         return match_request_to_agents_keywords(request)
 
 
+# Tier keywords for keyword-based matching (substring match on lowercased request)
+TIER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "haiku": ("fix", "typo", "syntax", "format", "lint", "rename", "correct", "spelling"),
+    "sonnet": ("analyze", "implement", "refactor", "integrate", "review", "optimize", "debug", "investigate"),
+    "opus": ("prove", "formalize", "verify correctness", "mathematical", "theorem", "algorithm design"),
+}
+
+
+def _build_tier_masks(
+    tier_keywords: Dict[str, Tuple[str, ...]]
+) -> Tuple[Tuple[Tuple[str, int], ...], Dict[str, int]]:
+    """
+    Assign each distinct keyword a bit and build a bitmask per tier.
+
+    Matching a request then sets one bit per keyword hit, and the number of
+    hits for a tier is popcount(hit_mask & tier_mask).
+
+    Returns:
+        Tuple of ((keyword, bit), ...) and {tier: mask}
+    """
+    bits: Dict[str, int] = {}
+    masks: Dict[str, int] = {}
+    for tier, keywords in tier_keywords.items():
+        mask = 0
+        for kw in keywords:
+            if kw not in bits:
+                bits[kw] = 1 << len(bits)
+            mask |= bits[kw]
+        masks[tier] = mask
+    return tuple(bits.items()), masks
+
+
+def _compile_keyword_matcher(
+    keyword_bits: Tuple[Tuple[str, int], ...]
+) -> Callable[[str], int]:
+    """
+    Generate a specialized hit-mask function for a fixed keyword table.
+
+    The keyword loop is unrolled into a single straight-line expression,
+    e.g. ``return ('fix' in t) << 0 | ('typo' in t) << 1 | ...``, so
+    matching does no per-keyword iteration or tuple unpacking. Keywords are
+    embedded with repr(), so arbitrary keyword text is safe.
+
+    Call again to regenerate after the keyword table changes.
+    """
+    terms = [f"({kw!r} in t) << {bit.bit_length() - 1}" for kw, bit in keyword_bits]
+    src = "def _keyword_hit_mask(t):\n    return " + (" | ".join(terms) or "0") + "\n"
+    namespace: Dict[str, Callable[[str], int]] = {}
+    exec(compile(src, "<routing_core keyword matcher>", "exec"), namespace)
+    return namespace["_keyword_hit_mask"]
+
+
+_KEYWORD_BITS, _TIER_MASK = _build_tier_masks(TIER_KEYWORDS)
+_keyword_hit_mask = _compile_keyword_matcher(_KEYWORD_BITS)
+
+
 def match_request_to_agents_keywords(
     request: str,
     agent_registry: Optional[Dict[str, List[str]]] = None
@@ -264,27 +321,24 @@ def match_request_to_agents_keywords(
             if explicit_file_mentioned(request):
                 return "haiku-general", confidence
 
-    # HAIKU KEYWORDS (require explicit file path)
-    haiku_keywords = ["fix", "typo", "syntax", "format", "lint", "rename", "correct", "spelling"]
-    haiku_matches = sum(1 for kw in haiku_keywords if kw in request_lower)
+    # Single pass over all tier keywords; per-tier counts are popcounts
+    hit_mask = _keyword_hit_mask(request_lower)
+    haiku_matches = (hit_mask & _TIER_MASK["haiku"]).bit_count()
+    sonnet_matches = (hit_mask & _TIER_MASK["sonnet"]).bit_count()
+    opus_matches = (hit_mask & _TIER_MASK["opus"]).bit_count()
 
+    # HAIKU KEYWORDS (require explicit file path)
     if haiku_matches > 0 and explicit_file_mentioned(request):
         # Has haiku keywords AND explicit file path
         confidence = min(0.9, 0.6 + (haiku_matches * 0.1))
         return "haiku-general", confidence
 
     # SONNET PATTERNS (reasoning required)
-    sonnet_keywords = ["analyze", "implement", "refactor", "integrate", "review", "optimize", "debug", "investigate"]
-    sonnet_matches = sum(1 for kw in sonnet_keywords if kw in request_lower)
-
     if sonnet_matches > 0:
         confidence = min(0.9, 0.5 + (sonnet_matches * 0.15))
         return "sonnet-general", confidence
 
     # OPUS PATTERNS (complex reasoning)
-    opus_keywords = ["prove", "formalize", "verify correctness", "mathematical", "theorem", "algorithm design"]
-    opus_matches = sum(1 for kw in opus_keywords if kw in request_lower)
-
     if opus_matches > 0:
         confidence = min(0.95, 0.7 + (opus_matches * 0.1))
         return "opus-general", confidence
@@ -325,6 +379,28 @@ def match_request_to_agents(
         return match_request_to_agents_keywords(request, agent_registry)
 
 
+# Escalation trigger words (substring match on lowercased request)
+COMPLEXITY_KEYWORDS = (
+    "complex", "subtle", "nuanced", "judgment",
+    "trade-off", "best approach", "design", "architecture",
+    "should I", "which is better", "recommend", "decide"
+)
+DESTRUCTIVE_OPERATIONS = ("delete", "remove", "drop")
+BULK_QUANTIFIERS = ("all", "multiple", "*", "every")
+FILE_OPERATIONS = ("edit", "modify", "change", "update", "delete", "remove")
+CREATION_KEYWORDS = ("new", "create", "design", "build", "implement")
+
+# Any escalation pattern keyed on a trigger word needs at least one of these.
+# Bulk quantifiers only matter alongside a destructive operation, so they are
+# not triggers on their own.
+_ESCALATION_TRIGGER_RE = re.compile("|".join(
+    re.escape(kw) for kw in sorted(
+        set(COMPLEXITY_KEYWORDS + DESTRUCTIVE_OPERATIONS + FILE_OPERATIONS + CREATION_KEYWORDS),
+        key=len, reverse=True,
+    )
+))
+
+
 def should_escalate(request: str, context: Optional[Dict] = None) -> RoutingResult:
     """
     Mechanical escalation checklist that Haiku can reliably execute.
@@ -343,54 +419,53 @@ def should_escalate(request: str, context: Optional[Dict] = None) -> RoutingResu
     context = context or {}
     request_lower = request.lower()
 
-    # Check for explicit file paths (used by multiple patterns)
-    has_explicit_path = "/" in request or explicit_file_mentioned(request)
+    # Negative prefilter: patterns 1-4 and 6 all require one of the trigger
+    # words, so a single scan rules them out on most direct-route requests
+    has_trigger = _ESCALATION_TRIGGER_RE.search(request_lower) is not None
 
-    # Pattern 1: Explicit complexity signals
-    complexity_keywords = [
-        "complex", "subtle", "nuanced", "judgment",
-        "trade-off", "best approach", "design", "architecture",
-        "should I", "which is better", "recommend", "decide"
-    ]
-    if any(kw in request_lower for kw in complexity_keywords):
-        return RoutingResult(
-            decision=RouterDecision.ESCALATE_TO_SONNET,
-            agent=None,
-            reason="Request contains complexity signal keywords",
-            confidence=1.0
-        )
+    if has_trigger:
+        # Check for explicit file paths (used by multiple patterns)
+        has_explicit_path = "/" in request or explicit_file_mentioned(request)
 
-    # Pattern 2: Multi-file destructive operations
-    is_destructive = any(op in request_lower for op in ["delete", "remove", "drop"])
-    is_bulk = any(q in request_lower for q in ["all", "multiple", "*", "every"])
-    if is_destructive and is_bulk:
-        return RoutingResult(
-            decision=RouterDecision.ESCALATE_TO_SONNET,
-            agent=None,
-            reason="Bulk destructive operation requires judgment",
-            confidence=1.0
-        )
+        # Pattern 1: Explicit complexity signals
+        if any(kw in request_lower for kw in COMPLEXITY_KEYWORDS):
+            return RoutingResult(
+                decision=RouterDecision.ESCALATE_TO_SONNET,
+                agent=None,
+                reason="Request contains complexity signal keywords",
+                confidence=1.0
+            )
 
-    # Pattern 3: Ambiguous targets (file operations without explicit paths)
-    file_operations = ["edit", "modify", "change", "update", "delete", "remove"]
-    has_file_operation = any(op in request_lower for op in file_operations)
+        # Pattern 2: Multi-file destructive operations
+        is_destructive = any(op in request_lower for op in DESTRUCTIVE_OPERATIONS)
+        is_bulk = any(q in request_lower for q in BULK_QUANTIFIERS)
+        if is_destructive and is_bulk:
+            return RoutingResult(
+                decision=RouterDecision.ESCALATE_TO_SONNET,
+                agent=None,
+                reason="Bulk destructive operation requires judgment",
+                confidence=1.0
+            )
 
-    if has_file_operation and not has_explicit_path:
-        return RoutingResult(
-            decision=RouterDecision.ESCALATE_TO_SONNET,
-            agent=None,
-            reason="File operation without explicit path - needs file discovery",
-            confidence=0.9
-        )
+        # Pattern 3: Ambiguous targets (file operations without explicit paths)
+        has_file_operation = any(op in request_lower for op in FILE_OPERATIONS)
 
-    # Pattern 4: Agent definition modifications (system integrity)
-    if ".claude/agents" in request and any(op in request_lower for op in ["edit", "modify", "update"]):
-        return RoutingResult(
-            decision=RouterDecision.ESCALATE_TO_SONNET,
-            agent=None,
-            reason="Agent definition changes require careful judgment",
-            confidence=1.0
-        )
+        if has_file_operation and not has_explicit_path:
+            return RoutingResult(
+                decision=RouterDecision.ESCALATE_TO_SONNET,
+                agent=None,
+                reason="File operation without explicit path - needs file discovery",
+                confidence=0.9
+            )
+
+        # Pattern 4: Agent definition modifications (system integrity)
+        if ".claude/agents" in request and any(op in request_lower for op in ["edit", "modify", "update"]):
+            return RoutingResult(
+                decision=RouterDecision.ESCALATE_TO_SONNET,
+                agent=None,
+                reason="Agent definition changes require careful judgment",
+                confidence=1.0
+            )
 
     # Pattern 5: Multiple objectives (coordination needed)
     objective_indicators = [" and ", ", then ", " after ", " before ", ";"]
@@ -405,8 +480,7 @@ def should_escalate(request: str, context: Optional[Dict] = None) -> RoutingResu
         )
 
     # Pattern 6: New/unfamiliar project areas (creation requires design)
-    creation_keywords = ["new", "create", "design", "build", "implement"]
-    if any(kw in request_lower for kw in creation_keywords):
+    if has_trigger and any(kw in request_lower for kw in CREATION_KEYWORDS):
         # Exception: simple file creation with explicit name is okay
         if "new file" in request_lower and explicit_file_mentioned(request):
             pass  # Continue to next checks
@@ -482,6 +556,16 @@ def format_routing_output(result: RoutingResult, user_request: str) -> str:
     return "\n".join(output)
 
 
+# Mechanical routing decisions memoised per process, keyed by request text
+ROUTE_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def _route_mechanical(request: str) -> RoutingResult:
+    """Keyword-based routing decision, a pure function of the request text."""
+    return should_escalate(request)
+
+
 def route_request(
     request: str,
     context: Optional[Dict] = None,
@@ -521,7 +605,12 @@ def route_request(
     if context is not None and not isinstance(context, dict):
         raise TypeError(f"context must be dict or None, got {type(context).__name__}")
 
-    return should_escalate(request, context)
+    # LLM answers can vary (and fall back to keywords on transient errors),
+    # so only the mechanical path is memoised. should_escalate does not
+    # consult context yet; key the cache on it once it does.
+    if USE_LLM_ROUTING:
+        return should_escalate(request, context)
+    return _route_mechanical(request)
 
 
 def run_cli() -> None:
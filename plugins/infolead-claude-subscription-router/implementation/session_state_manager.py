@@ -6,6 +6,7 @@ Implements Solution 7 (Basic) from the router architecture.
 
 State Files:
 - session-state.json: Current session focus and active agents
+- session.log: Append-only mutations on top of session-state.json
 - search-history.json: Cross-session search deduplication
 - decisions.json: Decision log with rationale
 
@@ -13,6 +14,7 @@ Change Driver: STATE_PERSISTENCE
 Changes when: Memory requirements evolve
 """
 
+import hashlib
 import json
 import os
 from dataclasses import dataclass, asdict
@@ -20,16 +22,23 @@ from datetime import datetime, timedelta, UTC
 from pathlib import Path
 from typing import Any, Optional, List
 
+import json_codec
 from file_locking import locked_state_file
 
 # State directory
 MEMORY_DIR = Path.home() / ".claude" / "infolead-claude-subscription-router" / "memory"
 
-# State files
+# State files (functions taking memory_dir use the same names inside it)
 SESSION_STATE_FILE = MEMORY_DIR / "session-state.json"
 SEARCH_HISTORY_FILE = MEMORY_DIR / "search-history.json"
 DECISIONS_FILE = MEMORY_DIR / "decisions.json"
 ACTIVE_CONTEXT_FILE = MEMORY_DIR / "active-context.json"
+SESSION_LOG_FILE = MEMORY_DIR / "session.log"
+
+# Compact the session log into session-state.json once it outgrows the
+# snapshot by this factor (never below LOG_COMPACT_MIN_BYTES)
+LOG_COMPACT_RATIO = 4
+LOG_COMPACT_MIN_BYTES = 4096
 
 # TTL for cleanup (30 days)
 DEFAULT_TTL_DAYS = 30
@@ -66,11 +75,17 @@ class DecisionRecord:
     timestamp: str
 
 
-def _ensure_directory() -> None:
+def _memory_file(default: Path, memory_dir: Optional[Path]) -> Path:
+    """State file default, relocated into memory_dir when one is given."""
+    return default if memory_dir is None else Path(memory_dir) / default.name
+
+
+def _ensure_directory(memory_dir: Optional[Path] = None) -> None:
     """Ensure memory directory exists with secure permissions"""
+    directory = MEMORY_DIR if memory_dir is None else Path(memory_dir)
     try:
-        MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-        os.chmod(MEMORY_DIR, 0o700)  # User-only access
+        directory.mkdir(parents=True, exist_ok=True)
+        os.chmod(directory, 0o700)  # User-only access
     except Exception as e:
         raise RuntimeError(f"Failed to create memory directory: {e}") from e
 
@@ -79,13 +94,13 @@ def _atomic_write(file_path: Path, data: dict) -> None:
     """Write data to file atomically with exclusive lock."""
     try:
         # Ensure directory exists
-        _ensure_directory()
+        _ensure_directory(file_path.parent)
 
         # Write with exclusive lock
         with locked_state_file(file_path, "r+", create_if_missing=True) as f:
             f.seek(0)
             f.truncate()
-            json.dump(data, f, indent=2)
+            json_codec.dump(data, f, indent=True)
 
     except Exception as e:
         raise RuntimeError(f"Failed to write {file_path}: {e}") from e
@@ -98,7 +113,7 @@ def _read_json(file_path: Path) -> Optional[dict]:
             return None
 
         with locked_state_file(file_path, "r") as f:
-            return json.load(f)
+            return json_codec.load(f)
 
     except (json.JSONDecodeError, IOError, TimeoutError) as e:
         print(f"Warning: Failed to read {file_path}: {e}")
@@ -106,7 +121,7 @@ def _read_json(file_path: Path) -> Optional[dict]:
 
 
 def save_session_state(
-    focus: str, active_agents: list[str], context: str
+    focus: str, active_agents: list[str], context: str, memory_dir: Optional[Path] = None
 ) -> None:
     """
     Save current session state
@@ -115,6 +130,7 @@ def save_session_state(
         focus: Description of current task focus
         active_agents: List of currently active agent names
         context: Brief context summary
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
     """
     state = SessionState(
         current_focus=focus,
@@ -123,22 +139,95 @@ def save_session_state(
         context_summary=context,
     )
 
-    _atomic_write(SESSION_STATE_FILE, asdict(state))
+    _atomic_write(_memory_file(SESSION_STATE_FILE, memory_dir), asdict(state))
+
+    # The snapshot now supersedes every logged mutation
+    log_file = _memory_file(SESSION_LOG_FILE, memory_dir)
+    if log_file.exists():
+        os.truncate(log_file, 0)
+
+
+def _empty_session_state() -> dict:
+    """Session state dict used before anything has been recorded."""
+    return {
+        "current_focus": "",
+        "active_agents": [],
+        "last_updated": "",
+        "context_summary": ""
+    }
+
+
+def _apply_log_entry(state: dict, entry: dict) -> None:
+    """Apply one session.log mutation to a session state dict."""
+    op = entry.get("op")
+    if op == "focus":
+        state["current_focus"] = entry.get("focus", "")
+    elif op == "add_agent":
+        agents = state.setdefault("active_agents", [])
+        if entry.get("agent") not in agents:
+            agents.append(entry.get("agent"))
+    elif op == "remove_agent":
+        agents = state.setdefault("active_agents", [])
+        if entry.get("agent") in agents:
+            agents.remove(entry.get("agent"))
+    else:
+        return
+    if "ts" in entry:
+        state["last_updated"] = entry["ts"]
+
+
+def _replay_session_log(state: Optional[dict], memory_dir: Optional[Path] = None) -> Optional[dict]:
+    """
+    Replay session.log on top of a snapshot.
+
+    A torn final line (crash mid-append) is skipped rather than failing
+    the whole load.
+    """
+    log_file = _memory_file(SESSION_LOG_FILE, memory_dir)
+    try:
+        data = log_file.read_bytes()
+    except FileNotFoundError:
+        return state
+    except IOError as e:
+        print(f"Warning: Failed to read {log_file}: {e}")
+        return state
+
+    if not data:
+        return state
+    if state is None:
+        state = _empty_session_state()
+
+    for line in data.splitlines():
+        try:
+            entry = json_codec.loads(line)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if isinstance(entry, dict):
+            _apply_log_entry(state, entry)
+    return state
 
 
-def load_session_state() -> Optional[dict]:
+def load_session_state(memory_dir: Optional[Path] = None) -> Optional[dict]:
     """
     Load session state from previous session
 
+    Args:
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
+
     Returns:
         Session state dict or None if no state exists
     """
-    return _read_json(SESSION_STATE_FILE)
+    snapshot = _read_json(_memory_file(SESSION_STATE_FILE, memory_dir))
+    return _replay_session_log(snapshot, memory_dir)
 
 
 def record_search(
-    query: str, results: list[str], agent: str, result_count: int = None
-) -> None:
+    query: str,
+    results: list[str],
+    agent: str,
+    result_count: int = None,
+    memory_dir: Optional[Path] = None,
+) -> dict:
     """
     Record search operation for cross-session deduplication
 
@@ -147,9 +236,15 @@ def record_search(
         results: List of files/results found
         agent: Agent that performed the search
         result_count: Number of results (defaults to len(results))
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
+
+    Returns:
+        The stored search record dict
     """
+    history_file = _memory_file(SEARCH_HISTORY_FILE, memory_dir)
+
     # Load existing history
-    history = _read_json(SEARCH_HISTORY_FILE)
+    history = _read_json(history_file)
     if history is None:
         history = {"searches": []}
 
@@ -163,7 +258,8 @@ def record_search(
     )
 
     # Append to history
-    history["searches"].append(asdict(record))
+    entry = asdict(record)
+    history["searches"].append(entry)
 
     # Clean up old entries (older than TTL)
     history["searches"] = _cleanup_old_entries(
@@ -171,11 +267,12 @@ def record_search(
     )
 
     # Save updated history
-    _atomic_write(SEARCH_HISTORY_FILE, history)
+    _atomic_write(history_file, history)
+    return entry
 
 
 def record_decision(
-    decision: str, rationale: str, alternatives: list[str]
+    decision: str, rationale: str, alternatives: list[str], memory_dir: Optional[Path] = None
 ) -> None:
     """
     Record decision with rationale and alternatives
@@ -184,9 +281,12 @@ def record_decision(
         decision: The decision made
         rationale: Reasoning behind the decision
         alternatives: Other options that were considered
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
     """
+    decisions_file = _memory_file(DECISIONS_FILE, memory_dir)
+
     # Load existing decisions
-    decisions = _read_json(DECISIONS_FILE)
+    decisions = _read_json(decisions_file)
     if decisions is None:
         decisions = {"decisions": []}
 
@@ -207,20 +307,21 @@ def record_decision(
     )
 
     # Save updated decisions
-    _atomic_write(DECISIONS_FILE, decisions)
+    _atomic_write(decisions_file, decisions)
 
 
-def get_recent_searches(hours: int = 24) -> list[dict]:
+def get_recent_searches(hours: int = 24, memory_dir: Optional[Path] = None) -> list[dict]:
     """
     Get search history from recent hours
 
     Args:
         hours: Number of hours to look back
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
 
     Returns:
         List of search records
     """
-    history = _read_json(SEARCH_HISTORY_FILE)
+    history = _read_json(_memory_file(SEARCH_HISTORY_FILE, memory_dir))
     if history is None or "searches" not in history:
         return []
 
@@ -237,17 +338,18 @@ def get_recent_searches(hours: int = 24) -> list[dict]:
     return recent
 
 
-def get_recent_decisions(hours: int = 24) -> list[dict]:
+def get_recent_decisions(hours: int = 24, memory_dir: Optional[Path] = None) -> list[dict]:
     """
     Get decisions from recent hours
 
     Args:
         hours: Number of hours to look back
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
 
     Returns:
         List of decision records
     """
-    decisions = _read_json(DECISIONS_FILE)
+    decisions = _read_json(_memory_file(DECISIONS_FILE, memory_dir))
     if decisions is None or "decisions" not in decisions:
         return []
 
@@ -264,6 +366,11 @@ def get_recent_decisions(hours: int = 24) -> list[dict]:
     return recent
 
 
+def _search_key(query: str) -> bytes:
+    """Short digest of a search query for exact-match deduplication."""
+    return hashlib.blake2b(query.encode("utf-8"), digest_size=8).digest()
+
+
 def _cleanup_old_entries(entries: list[dict], ttl_days: int) -> list[dict]:
     """
     Remove entries older than TTL
@@ -292,15 +399,18 @@ def _cleanup_old_entries(entries: list[dict], ttl_days: int) -> list[dict]:
     return cleaned
 
 
-def clear_session_state() -> None:
+def clear_session_state(memory_dir: Optional[Path] = None) -> None:
     """Clear session state (useful for testing)"""
-    if SESSION_STATE_FILE.exists():
-        SESSION_STATE_FILE.unlink()
+    for default in [SESSION_STATE_FILE, SESSION_LOG_FILE]:
+        file_path = _memory_file(default, memory_dir)
+        if file_path.exists():
+            file_path.unlink()
 
 
-def clear_all_state() -> None:
+def clear_all_state(memory_dir: Optional[Path] = None) -> None:
     """Clear all state files (useful for testing)"""
-    for file_path in [SESSION_STATE_FILE, SEARCH_HISTORY_FILE, DECISIONS_FILE, ACTIVE_CONTEXT_FILE]:
+    for default in [SESSION_STATE_FILE, SESSION_LOG_FILE, SEARCH_HISTORY_FILE, DECISIONS_FILE, ACTIVE_CONTEXT_FILE]:
+        file_path = _memory_file(default, memory_dir)
         if file_path.exists():
             file_path.unlink()
 
@@ -328,6 +438,7 @@ def save_active_context(
     recent_decisions: List[str],
     last_agent: str,
     continuation_summary: str,
+    memory_dir: Optional[Path] = None,
 ) -> None:
     """
     Save active context for session continuation.
@@ -341,6 +452,7 @@ def save_active_context(
         recent_decisions: List of recent decisions made
         last_agent: Name of the last agent used
         continuation_summary: Brief summary of where work left off
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
     """
     context = ActiveContext(
         project_path=project_path,
@@ -351,40 +463,47 @@ def save_active_context(
         timestamp=datetime.now(UTC).isoformat().replace("+00:00", "Z"),
     )
 
-    _atomic_write(ACTIVE_CONTEXT_FILE, asdict(context))
+    _atomic_write(_memory_file(ACTIVE_CONTEXT_FILE, memory_dir), asdict(context))
 
 
-def load_active_context() -> Optional[dict]:
+def load_active_context(memory_dir: Optional[Path] = None) -> Optional[dict]:
     """
     Load active context from previous session.
 
+    Args:
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
+
     Returns:
         Active context dict or None if no context exists
     """
-    return _read_json(ACTIVE_CONTEXT_FILE)
+    return _read_json(_memory_file(ACTIVE_CONTEXT_FILE, memory_dir))
 
 
-def clear_active_context() -> None:
+def clear_active_context(memory_dir: Optional[Path] = None) -> None:
     """Clear active context file."""
-    if ACTIVE_CONTEXT_FILE.exists():
-        ACTIVE_CONTEXT_FILE.unlink()
+    context_file = _memory_file(ACTIVE_CONTEXT_FILE, memory_dir)
+    if context_file.exists():
+        context_file.unlink()
 
 
-def generate_continuation_prompt() -> str:
+def generate_continuation_prompt(memory_dir: Optional[Path] = None) -> str:
     """
     Generate a continuation prompt for starting a new session.
 
     This creates a concise prompt that can be pasted into a new Claude session
     to continue where the previous session left off.
 
+    Args:
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
+
     Returns:
         Formatted continuation prompt string, or empty string if no context
     """
-    context = load_active_context()
+    context = load_active_context(memory_dir)
     if context is None:
         return ""
 
-    state = load_session_state()
+    state = load_session_state(memory_dir)
 
     prompt_parts = []
 
@@ -432,16 +551,19 @@ def generate_continuation_prompt() -> str:
     return "\n".join(prompt_parts)
 
 
-def should_save_context_on_exit() -> bool:
+def should_save_context_on_exit(memory_dir: Optional[Path] = None) -> bool:
     """
     Check if active context should be saved on session exit.
 
     Returns True if there's meaningful session state to preserve.
 
+    Args:
+        memory_dir: Memory directory (defaults to MEMORY_DIR)
+
     Returns:
         True if context should be saved
     """
-    state = load_session_state()
+    state = load_session_state(memory_dir)
     if state is None:
         return False
 
@@ -463,76 +585,133 @@ class SessionStateManager:
 
     This class provides a convenient interface for managing session state,
     wrapping the module-level functions for easier use in tests and applications.
+
+    Mutations are appended to session.log as one JSON line each instead of
+    rewriting session-state.json every time; the log is replayed on load and
+    compacted back into the snapshot once it grows past LOG_COMPACT_RATIO
+    times the snapshot size.
     """
 
-    def __init__(self, memory_dir: Optional[Path] = None):
+    def __init__(self, memory_dir: Optional[Path] = None, fsync: bool = False):
         """
         Initialize session state manager.
 
         Args:
-            memory_dir: Optional custom memory directory (for testing)
+            memory_dir: Memory directory (defaults to MEMORY_DIR); instances
+                with different directories are fully independent
+            fsync: fsync session.log after every mutation
         """
-        global MEMORY_DIR, SESSION_STATE_FILE, SEARCH_HISTORY_FILE, DECISIONS_FILE, ACTIVE_CONTEXT_FILE
-
-        if memory_dir is not None:
-            MEMORY_DIR = Path(memory_dir)
-            SESSION_STATE_FILE = MEMORY_DIR / "session-state.json"
-            SEARCH_HISTORY_FILE = MEMORY_DIR / "search-history.json"
-            DECISIONS_FILE = MEMORY_DIR / "decisions.json"
-            ACTIVE_CONTEXT_FILE = MEMORY_DIR / "active-context.json"
-
-        _ensure_directory()
+        self.memory_dir = Path(memory_dir) if memory_dir is not None else MEMORY_DIR
+        _ensure_directory(self.memory_dir)
+        self._fsync = fsync
         self._state = self._load_or_create_state()
+        self._active_agents = set(self._state.pop("active_agents", []))
+        self._search_stamp: Optional[tuple] = None
+        self._search_by_key = self._load_search_index()
 
     def _load_or_create_state(self) -> dict:
         """Load existing state or create new."""
-        state = load_session_state()
+        state = load_session_state(self.memory_dir)
         if state is None:
-            state = {
-                "current_focus": "",
-                "active_agents": [],
-                "last_updated": "",
-                "context_summary": ""
-            }
+            state = _empty_session_state()
         return state
 
     def update_focus(self, focus: str) -> None:
         """Update the current task focus."""
         self._state["current_focus"] = focus
-        self._save()
+        self._append({"op": "focus", "focus": focus})
 
     def add_active_agent(self, agent: str) -> None:
-        """Add an agent to the active agents list."""
-        if agent not in self._state.get("active_agents", []):
-            if "active_agents" not in self._state:
-                self._state["active_agents"] = []
-            self._state["active_agents"].append(agent)
-            self._save()
+        """Add an agent to the active agents set."""
+        if agent not in self._active_agents:
+            self._active_agents.add(agent)
+            self._append({"op": "add_agent", "agent": agent})
 
     def remove_active_agent(self, agent: str) -> None:
-        """Remove an agent from the active agents list."""
-        if "active_agents" in self._state and agent in self._state["active_agents"]:
-            self._state["active_agents"].remove(agent)
-            self._save()
+        """Remove an agent from the active agents set."""
+        if agent in self._active_agents:
+            self._active_agents.discard(agent)
+            self._append({"op": "remove_agent", "agent": agent})
 
     def get_current_state(self) -> SessionState:
         """Get the current session state as a dataclass."""
         return SessionState(
             current_focus=self._state.get("current_focus", ""),
-            active_agents=self._state.get("active_agents", []),
+            active_agents=sorted(self._active_agents),
             last_updated=self._state.get("last_updated", ""),
             context_summary=self._state.get("context_summary", "")
         )
 
+    def _search_history_stamp(self) -> Optional[tuple]:
+        """(inode, mtime, size) of the search history file, None if absent."""
+        try:
+            st = _memory_file(SEARCH_HISTORY_FILE, self.memory_dir).stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _load_search_index(self) -> dict[bytes, dict]:
+        """Index recorded searches by query digest, keeping the latest."""
+        # Stamped before reading, so a write racing the read shows up as a
+        # changed stamp and is picked up by the next reload
+        self._search_stamp = self._search_history_stamp()
+        history = _read_json(_memory_file(SEARCH_HISTORY_FILE, self.memory_dir))
+        if history is None:
+            return {}
+        return {
+            _search_key(search["query"]): search
+            for search in history.get("searches", [])
+            if "query" in search
+        }
+
+    def _append(self, entry: dict) -> None:
+        """Append one mutation to session.log, compacting when it grows."""
+        entry["ts"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
+        self._state["last_updated"] = entry["ts"]
+        line = json_codec.dumps(entry) + b"\n"
+        log_file = _memory_file(SESSION_LOG_FILE, self.memory_dir)
+
+        # Opened per append: a log unlinked by a clear elsewhere must not
+        # swallow later writes through a stale descriptor
+        try:
+            fd = os.open(log_file, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    # Terminate a torn line so this record isn't glued onto it
+                    line = b"\n" + line
+                os.write(fd, line)
+                if self._fsync:
+                    os.fsync(fd)
+                log_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+        except OSError as e:
+            raise RuntimeError(f"Failed to write {log_file}: {e}") from e
+
+        try:
+            snapshot_size = _memory_file(SESSION_STATE_FILE, self.memory_dir).stat().st_size
+        except FileNotFoundError:
+            snapshot_size = 0
+        if log_size > max(LOG_COMPACT_RATIO * snapshot_size, LOG_COMPACT_MIN_BYTES):
+            self._save()
+
     def _save(self) -> None:
         """Save current state to disk."""
-        self._state["last_updated"] = datetime.now(UTC).isoformat().replace("+00:00", "Z")
         save_session_state(
             focus=self._state.get("current_focus", ""),
-            active_agents=self._state.get("active_agents", []),
-            context=self._state.get("context_summary", "")
+            active_agents=sorted(self._active_agents),
+            context=self._state.get("context_summary", ""),
+            memory_dir=self.memory_dir,
         )
 
+    def compact(self) -> None:
+        """Fold session.log into session-state.json."""
+        self._save()
+
+    def close(self) -> None:
+        """Release resources (the log is opened per append, so nothing is held)."""
+
     def record_search(
         self,
         query: str,
@@ -541,17 +720,23 @@ class SessionStateManager:
         files_found: Optional[List[str]] = None
     ) -> None:
         """Record a search operation."""
-        record_search(
+        entry = record_search(
             query=query,
             results=files_found or [],
             agent=agent,
-            result_count=result_count
+            result_count=result_count,
+            memory_dir=self.memory_dir,
         )
+        self._search_by_key[_search_key(query)] = entry
 
     def check_duplicate_search(self, query: str, hours: int = 24) -> Optional[SearchRecord]:
         """
         Check if a similar search was performed recently.
 
+        Answered from the in-memory index; on a miss, the index is reloaded
+        if the search history file changed since it was read, so searches
+        recorded by other processes are seen too.
+
         Args:
             query: Search query to check
             hours: How far back to look
@@ -559,22 +744,39 @@ class SessionStateManager:
         Returns:
             SearchRecord if duplicate found, None otherwise
         """
-        recent = get_recent_searches(hours=hours)
-        for search in recent:
-            if search["query"] == query:
-                return SearchRecord(
-                    query=search["query"],
-                    timestamp=search["timestamp"],
-                    agent=search["agent"],
-                    result_count=search["result_count"],
-                    files_found=search["files_found"]
-                )
-        return None
+        cutoff = datetime.now(UTC) - timedelta(hours=hours)
+        search = self._recent_search(query, cutoff)
+        if search is None and self._search_history_stamp() != self._search_stamp:
+            self._search_by_key = self._load_search_index()
+            search = self._recent_search(query, cutoff)
+        if search is None:
+            return None
+
+        return SearchRecord(
+            query=search["query"],
+            timestamp=search["timestamp"],
+            agent=search["agent"],
+            result_count=search["result_count"],
+            files_found=search["files_found"]
+        )
+
+    def _recent_search(self, query: str, cutoff: datetime) -> Optional[dict]:
+        """Indexed search record for query if recorded at or after cutoff."""
+        search = self._search_by_key.get(_search_key(query))
+        if search is None or search["query"] != query:
+            return None
+        timestamp = datetime.fromisoformat(search["timestamp"].rstrip("Z")).replace(tzinfo=UTC)
+        if timestamp < cutoff:
+            return None
+        return search
 
     def clear_state(self) -> None:
         """Clear all session state (useful for testing)."""
-        clear_all_state()
+        self.close()
+        clear_all_state(self.memory_dir)
         self._state = self._load_or_create_state()
+        self._active_agents = set(self._state.pop("active_agents", []))
+        self._search_by_key = self._load_search_index()
 
 
 # Test function
@@ -18,14 +18,20 @@ Changes when: Scheduling strategy or timing rules change
 """
 
 import asyncio
+import atexit
 import heapq
+import itertools
 import json
 import os
+import re
 import sys
+import threading
+import weakref
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, date, time, timedelta, UTC
 from enum import Enum
 from pathlib import Path
+from time import monotonic
 from typing import Dict, List, Optional, Callable, Any, Tuple
 
 from file_locking import locked_state_file
@@ -37,6 +43,24 @@ STATE_DIR = Path.home() / ".claude" / "infolead-claude-subscription-router" / "s
 QUEUE_FILE = STATE_DIR / "temporal-work-queue.json"
 RESULTS_DIR = STATE_DIR / "overnight-results"
 
+# add_work() coalesces queue writes: flush after this many pending
+# mutations or once this long has passed since the last write
+FLUSH_MAX_PENDING = 16
+FLUSH_INTERVAL_SECONDS = 0.1
+
+# Schedulers whose unwritten mutations are flushed at interpreter exit
+_LIVE_SCHEDULERS: "weakref.WeakSet[TemporalScheduler]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_schedulers() -> None:
+    """Write mutations still below the flush thresholds when the process exits."""
+    for scheduler in list(_LIVE_SCHEDULERS):
+        try:
+            scheduler._flush_at_exit()
+        except Exception as e:
+            print(f"[temporal] Warning: {e}", file=sys.stderr)
+
 
 class WorkTiming(Enum):
     """Classification of work timing requirements."""
@@ -110,6 +134,40 @@ class TimedWorkItem:
         )
 
 
+# Synchronous patterns (user must be present)
+SYNC_KEYWORDS = (
+    "help me", "which", "should I", "decide", "choose",
+    "review", "edit", "modify", "design", "architecture",
+    "explain", "teach", "show me", "walk through",
+    "interactive", "discuss", "opinion", "preference",
+)
+
+# Asynchronous patterns (can run unattended)
+ASYNC_KEYWORDS = (
+    "search for", "find papers", "analyze", "generate report",
+    "batch", "scan", "index", "collect data", "background",
+    "overnight", "when I'm away", "prepare", "compile",
+    "build", "test suite", "lint", "format all",
+)
+
+# Destructive operations (default sync for safety)
+DESTRUCTIVE_KEYWORDS = ("delete", "remove", "overwrite", "destroy")
+
+# Read-only operations (safe for async)
+READ_ONLY_KEYWORDS = ("read", "search", "find", "list", "show", "count")
+
+
+def _substring_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation with plain substring semantics."""
+    return re.compile("|".join(re.escape(kw) for kw in keywords))
+
+
+_SYNC_RE = _substring_pattern(SYNC_KEYWORDS)
+_ASYNC_RE = _substring_pattern(ASYNC_KEYWORDS)
+_DESTRUCTIVE_RE = _substring_pattern(DESTRUCTIVE_KEYWORDS)
+_READ_ONLY_RE = _substring_pattern(READ_ONLY_KEYWORDS)
+
+
 def classify_work_timing(request: str, context: Optional[Dict] = None) -> WorkTiming:
     """
     Determine if work requires user presence or can run asynchronously.
@@ -131,38 +189,22 @@ def classify_work_timing(request: str, context: Optional[Dict] = None) -> WorkTi
     Returns:
         WorkTiming classification
     """
-    # Synchronous patterns (user must be present)
-    sync_keywords = [
-        "help me", "which", "should I", "decide", "choose",
-        "review", "edit", "modify", "design", "architecture",
-        "explain", "teach", "show me", "walk through",
-        "interactive", "discuss", "opinion", "preference",
-    ]
-
-    # Asynchronous patterns (can run unattended)
-    async_keywords = [
-        "search for", "find papers", "analyze", "generate report",
-        "batch", "scan", "index", "collect data", "background",
-        "overnight", "when I'm away", "prepare", "compile",
-        "build", "test suite", "lint", "format all",
-    ]
-
     request_lower = request.lower()
 
     # Check synchronous signals
-    if any(kw in request_lower for kw in sync_keywords):
+    if _SYNC_RE.search(request_lower):
         return WorkTiming.SYNCHRONOUS
 
     # Check asynchronous signals
-    if any(kw in request_lower for kw in async_keywords):
+    if _ASYNC_RE.search(request_lower):
         return WorkTiming.ASYNCHRONOUS
 
     # Check for destructive operations (default sync for safety)
-    if any(op in request_lower for op in ["delete", "remove", "overwrite", "destroy"]):
+    if _DESTRUCTIVE_RE.search(request_lower):
         return WorkTiming.SYNCHRONOUS
 
     # Check for read-only operations (safe for async)
-    if any(op in request_lower for op in ["read", "search", "find", "list", "show", "count"]):
+    if _READ_ONLY_RE.search(request_lower):
         return WorkTiming.ASYNCHRONOUS
 
     # Check context for additional signals
@@ -181,6 +223,16 @@ class TemporalScheduler:
     Schedule work across time boundaries to maximize quota utilization.
 
     Manages sync/async queues and overnight work scheduling.
+
+    Both queues are min-heaps of (-priority, seq, work) entries: the negated
+    priority is computed once at insert time and seq keeps equal-priority
+    items in insertion order without ever comparing TimedWorkItems.
+
+    add_work() only marks the state dirty and writes it in batches, and the
+    writes themselves run on a background writer thread that always writes
+    the newest snapshot; call flush() (or use the scheduler as a context
+    manager) before handing the state file to another process. Mutations
+    still pending at interpreter exit are flushed by an atexit hook.
     """
 
     def __init__(
@@ -203,58 +255,167 @@ class TemporalScheduler:
         self.active_hours_start = time(9, 0)   # 9 AM
         self.active_hours_end = time(22, 0)    # 10 PM
 
+        # Heap tie-breaker
+        self._seq = itertools.count()
+
+        # Write coalescing
+        self._dirty = False
+        self._pending = 0
+        self._last_flush = monotonic()
+
+        # Background writer
+        self._write_lock = threading.Lock()
+        self._queued_write: Optional[Dict] = None
+        self._writer: Optional[threading.Thread] = None
+        self._write_error: Optional[BaseException] = None
+
         # Load state
         self._load_state()
+        _LIVE_SCHEDULERS.add(self)
+
+    @property
+    def sync_queue(self) -> List[TimedWorkItem]:
+        """Pending synchronous work (read-only snapshot, heap order)."""
+        return [entry[2] for entry in self._sync_heap]
+
+    @property
+    def async_queue(self) -> List[TimedWorkItem]:
+        """Pending asynchronous work (read-only snapshot, heap order)."""
+        return [entry[2] for entry in self._async_heap]
+
+    def _heap_entry(self, work: TimedWorkItem) -> Tuple[int, int, TimedWorkItem]:
+        """Build a heap entry with the priority key cached."""
+        return (-work.priority, next(self._seq), work)
 
     def _load_state(self) -> None:
         """Load scheduler state from file."""
         if not self.state_file.exists():
-            self.sync_queue: List[TimedWorkItem] = []
-            self.async_queue: List[TimedWorkItem] = []
+            self._sync_heap: List[Tuple[int, int, TimedWorkItem]] = []
+            self._async_heap: List[Tuple[int, int, TimedWorkItem]] = []
             self.scheduled_async: List[TimedWorkItem] = []
             self.completed_overnight: List[TimedWorkItem] = []
             self.failed_work: List[TimedWorkItem] = []
             self._save_state()
+            self._wait_for_writes()
             return
 
         try:
             with locked_state_file(self.state_file, "r") as f:
                 data = json.load(f)
 
-            self.sync_queue = [TimedWorkItem.from_dict(w) for w in data.get("sync_queue", [])]
-            self.async_queue = [TimedWorkItem.from_dict(w) for w in data.get("async_queue", [])]
+            # Saved in heap order, so re-numbering in file order keeps the
+            # heap invariant and heapify is a linear pass
+            self._sync_heap = [
+                self._heap_entry(TimedWorkItem.from_dict(w)) for w in data.get("sync_queue", [])
+            ]
+            self._async_heap = [
+                self._heap_entry(TimedWorkItem.from_dict(w)) for w in data.get("async_queue", [])
+            ]
             self.scheduled_async = [TimedWorkItem.from_dict(w) for w in data.get("scheduled_async", [])]
             self.completed_overnight = [TimedWorkItem.from_dict(w) for w in data.get("completed_overnight", [])]
             self.failed_work = [TimedWorkItem.from_dict(w) for w in data.get("failed_work", [])]
 
             # Rebuild heaps
-            heapq.heapify(self.sync_queue)
-            heapq.heapify(self.async_queue)
+            heapq.heapify(self._sync_heap)
+            heapq.heapify(self._async_heap)
 
         except (json.JSONDecodeError, KeyError) as e:
             print(f"[temporal] Warning: Failed to load state: {e}", file=sys.stderr)
-            self.sync_queue = []
-            self.async_queue = []
+            self._sync_heap = []
+            self._async_heap = []
             self.scheduled_async = []
             self.completed_overnight = []
             self.failed_work = []
 
-    def _save_state(self) -> None:
-        """Save scheduler state to file."""
-        data = {
-            "sync_queue": [w.to_dict() for w in self.sync_queue],
-            "async_queue": [w.to_dict() for w in self.async_queue],
+    def _snapshot(self) -> Dict:
+        """Serializable copy of the scheduler state."""
+        return {
+            "sync_queue": [entry[2].to_dict() for entry in self._sync_heap],
+            "async_queue": [entry[2].to_dict() for entry in self._async_heap],
             "scheduled_async": [w.to_dict() for w in self.scheduled_async],
             "completed_overnight": [w.to_dict() for w in self.completed_overnight],
             "failed_work": [w.to_dict() for w in self.failed_work],
             "last_updated": datetime.now(UTC).isoformat(),
         }
 
+    def _save_state(self) -> None:
+        """Snapshot scheduler state and hand it to the background writer."""
+        data = self._snapshot()
+        with self._write_lock:
+            # A snapshot still waiting in the slot is superseded by this one
+            self._queued_write = data
+            if self._writer is None:
+                # Non-daemon, so interpreter shutdown waits for the last write
+                self._writer = threading.Thread(
+                    target=self._drain_writes, name="temporal-scheduler-writer"
+                )
+                self._writer.start()
+
+        self._dirty = False
+        self._pending = 0
+        self._last_flush = monotonic()
+
+    def _drain_writes(self) -> None:
+        """Writer thread: write queued snapshots until the slot is empty."""
+        while True:
+            with self._write_lock:
+                data = self._queued_write
+                self._queued_write = None
+                if data is None:
+                    self._writer = None
+                    return
+            try:
+                self._write_state(data)
+            except Exception as e:
+                # Also re-raised by the next flush(); logged now in case none comes
+                print(f"[temporal] Warning: Failed to write {self.state_file}: {e}", file=sys.stderr)
+                self._write_error = e
+
+    def _write_state(self, data: Dict) -> None:
+        """Write a state snapshot to the state file."""
         with locked_state_file(self.state_file, "r+", create_if_missing=True) as f:
             f.seek(0)
             f.truncate()
             json.dump(data, f, indent=2)
 
+    def _wait_for_writes(self) -> None:
+        """Block until the background writer is idle."""
+        while True:
+            with self._write_lock:
+                writer = self._writer
+            if writer is None:
+                break
+            writer.join()
+
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise RuntimeError(f"Failed to write {self.state_file}: {error}") from error
+
+    def _maybe_flush(self) -> None:
+        """Write pending mutations once enough have piled up or time has passed."""
+        if (self._pending >= FLUSH_MAX_PENDING
+                or monotonic() - self._last_flush > FLUSH_INTERVAL_SECONDS):
+            self._save_state()
+
+    def flush(self) -> None:
+        """Persist any pending mutations and wait for them to hit the file."""
+        if self._dirty:
+            self._save_state()
+        self._wait_for_writes()
+
+    def _flush_at_exit(self) -> None:
+        """flush() for atexit, writing on the calling thread (no new threads at shutdown)."""
+        self._wait_for_writes()
+        if self._dirty:
+            self._write_state(self._snapshot())
+            self._dirty = False
+
+    def __enter__(self) -> "TemporalScheduler":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
     def is_active_hours(self) -> bool:
         """Check if currently in user's active hours."""
         now = datetime.now().time()
@@ -298,25 +459,30 @@ class TemporalScheduler:
         Args:
             work: Work item to add
         """
+        entry = self._heap_entry(work)
         if work.timing == WorkTiming.SYNCHRONOUS:
-            heapq.heappush(self.sync_queue, work)
+            heapq.heappush(self._sync_heap, entry)
         elif work.timing == WorkTiming.ASYNCHRONOUS:
-            heapq.heappush(self.async_queue, work)
+            heapq.heappush(self._async_heap, entry)
         else:  # EITHER - decide based on current context
             if self.is_active_hours():
                 # During active hours, default to sync for responsiveness
-                heapq.heappush(self.sync_queue, work)
+                heapq.heappush(self._sync_heap, entry)
             else:
                 # During inactive hours, queue as async
-                heapq.heappush(self.async_queue, work)
+                heapq.heappush(self._async_heap, entry)
 
-        self._save_state()
+        self._dirty = True
+        self._pending += 1
+        self._maybe_flush()
 
     def get_next_sync_work(self) -> Optional[TimedWorkItem]:
         """Get highest-priority synchronous work."""
-        if not self.sync_queue:
+        if not self._sync_heap:
             return None
-        return heapq.heappop(self.sync_queue)
+        work = heapq.heappop(self._sync_heap)[2]
+        self._dirty = True
+        return work
 
     def schedule_overnight_work(self) -> List[TimedWorkItem]:
         """
@@ -344,26 +510,21 @@ class TemporalScheduler:
         quota_budget = quota_available.copy()
         time_budget = hours_until_reset
 
-        # Extract all items from heap for sorting
-        async_work = []
-        while self.async_queue:
-            work = heapq.heappop(self.async_queue)
-            async_work.append(work)
+        completed_ids = {c.id for c in self.completed_overnight if c.status == "completed"}
 
-        # Sort by priority (already sorted by heap, but make explicit)
-        async_work.sort(key=lambda w: -w.priority)
+        # Pop in priority order; anything not selected is kept in that
+        # order, which is already a valid heap
+        deferred = []
+        while self._async_heap:
+            entry = heapq.heappop(self._async_heap)
+            work = entry[2]
 
-        for work in async_work:
             # Check dependencies
             if work.dependencies:
-                deps_satisfied = all(
-                    any(c.id == dep and c.status == "completed"
-                        for c in self.completed_overnight)
-                    for dep in work.dependencies
-                )
+                deps_satisfied = all(dep in completed_ids for dep in work.dependencies)
                 if not deps_satisfied:
                     # Put back, might be satisfied later
-                    heapq.heappush(self.async_queue, work)
+                    deferred.append(entry)
                     continue
 
             # Determine model needed for this work
@@ -381,11 +542,12 @@ class TemporalScheduler:
                     time_budget -= work_hours
                 else:
                     # Not enough time, put back in queue
-                    heapq.heappush(self.async_queue, work)
+                    deferred.append(entry)
             else:
                 # Not enough quota, put back in queue
-                heapq.heappush(self.async_queue, work)
+                deferred.append(entry)
 
+        self._async_heap = deferred
         self.scheduled_async = selected_work
         self._save_state()
         return selected_work
@@ -494,8 +656,8 @@ class TemporalScheduler:
     def get_status_summary(self) -> Dict:
         """Get summary of scheduler status."""
         return {
-            "sync_queue_count": len(self.sync_queue),
-            "async_queue_count": len(self.async_queue),
+            "sync_queue_count": len(self._sync_heap),
+            "async_queue_count": len(self._async_heap),
             "scheduled_count": len(self.scheduled_async),
             "completed_overnight_count": len(self.completed_overnight),
             "failed_count": len(self.failed_work),
@@ -536,12 +698,13 @@ class TemporalScheduler:
         else:
             print("No work scheduled for tonight.")
 
-        if self.async_queue:
-            print(f"\nPending Async Work ({len(self.async_queue)} items):")
-            for work in list(self.async_queue)[:5]:
+        if self._async_heap:
+            print(f"\nPending Async Work ({len(self._async_heap)} items):")
+            for entry in heapq.nsmallest(5, self._async_heap):
+                work = entry[2]
                 print(f"  [{work.priority}] {work.description[:50]}")
-            if len(self.async_queue) > 5:
-                print(f"  ... and {len(self.async_queue) - 5} more")
+            if len(self._async_heap) > 5:
+                print(f"  ... and {len(self._async_heap) - 5} more")
 
         print("=" * 60)
 
@@ -638,6 +801,7 @@ class OvernightWorkExecutor:
                 completed_ids.add(work_id)
 
         # Save results
+        self.scheduler.flush()
         self._save_overnight_results(results)
         return results
 
@@ -751,12 +915,14 @@ def main():
             project_name=args.project_name,
         )
         scheduler.add_work(work)
+        scheduler.flush()
         print(f"Added work: {work.id} ({timing.value})")
         if args.project_path:
             print(f"  Project: {args.project_name or args.project_path}")
 
     elif args.command == "schedule":
         scheduled = scheduler.schedule_overnight_work()
+        scheduler.flush()
         print(f"Scheduled {len(scheduled)} items for overnight execution")
         for work in scheduled:
             print(f"  [{work.priority}] {work.description[:50]}")
@@ -845,6 +1011,7 @@ def test_temporal_scheduler() -> None:
 
         # Test 7: State persistence
         print("Test 7: State persistence")
+        scheduler.flush()
         scheduler2 = TemporalScheduler(quota_tracker=tracker, state_file=state_file)
         assert len(scheduler2.completed_overnight) == 1
         print("  OK")
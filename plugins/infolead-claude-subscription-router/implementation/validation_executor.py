@@ -4,6 +4,16 @@ Validation Executor - Execute validation checks for probabilistic routing.
 Implements Solution 6 (Validation System) from architecture spec.
 Supports syntax, build, and test validation hooks for quality assurance.
 
+Python and JSON syntax is checked in-process. Those results depend only on
+file content, so they are cached on disk keyed by a hash of the content
+(XXH3-128 when xxhash is installed, SHA-256 otherwise): re-validating an
+unchanged file costs one read and one hash. Recent results are also kept in
+memory, so repeats within one process skip the cache file as well.
+
+When a project has both a build and a test collection command, validate_all
+runs them in a single shell and splits the output on sentinel lines, paying
+for one process spawn instead of two.
+
 Usage:
     executor = ValidationExecutor()
     results = executor.validate_all(modified_files)
@@ -14,17 +24,136 @@ Change Driver: QUALITY_ASSURANCE
 Changes when: Validation requirements or tooling changes
 """
 
+import hashlib
+import json
+import os
+import re
+import secrets
+import shlex
+import shutil
 import subprocess
 import sys
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property, partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+import json_codec
+
+# Optional accelerator (hashlib.sha256 otherwise)
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
 
 # Validation timeout (seconds)
 DEFAULT_TIMEOUT = 30
 BUILD_TIMEOUT = 120
 TEST_TIMEOUT = 60
+# Seconds a batched command gets after its timeout's SIGTERM before SIGKILL
+KILL_GRACE = 5
+
+# Persistent cache of in-process syntax check results
+SYNTAX_CACHE_DIR = Path.home() / ".claude" / "infolead-claude-subscription-router" / "cache" / "syntax"
+# Bump whenever a content checker's logic or message format changes
+SYNTAX_CACHE_VERSION = 2
+
+# Syntax results memoised per process, keyed by (cache directory, digest)
+SYNTAX_MEMO_SIZE = 1024
+_syntax_memo: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+_syntax_memo_lock = threading.Lock()
+
+# Most files passed to one external syntax checker invocation
+SYNTAX_BATCH_SIZE = 200
+
+# Most syntax checks (in-process or batched) running concurrently
+SYNTAX_MAX_WORKERS = 32
+
+# Checks every YAML file named in argv, reporting failures as "path: error"
+_YAML_CHECK = (
+    "import sys, yaml\n"
+    "failed = 0\n"
+    "for path in sys.argv[1:]:\n"
+    "    try:\n"
+    "        with open(path) as f:\n"
+    "            yaml.safe_load(f)\n"
+    "    except Exception as e:\n"
+    "        failed = 1\n"
+    "        print(f'{path}: {e}')\n"
+    "sys.exit(failed)\n"
+)
+
+
+# Python verdicts depend on the interpreter (e.g. `type X = int` is only
+# valid from 3.12), and the on-disk cache is shared by every interpreter
+_PYTHON_TAG = f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}"
+
+# Filename given to compile(); the warnings it raises (invalid escapes,
+# "is" with a literal, ...) are not syntax errors and must not reach the
+# hook's stderr, which py_compile's subprocess used to swallow
+_COMPILE_FILENAME = "<syntax-check>"
+for _category in (SyntaxWarning, DeprecationWarning):
+    warnings.filterwarnings("ignore", category=_category, module=re.escape(_COMPILE_FILENAME))
+
+
+def _content_digest(ext: str, data: bytes) -> str:
+    """Hex digest identifying (extension, content) in the syntax cache."""
+    hasher = xxhash.xxh3_128() if xxhash is not None else hashlib.sha256()
+    hasher.update(ext.encode())
+    if ext == ".py":
+        hasher.update(b"\0" + _PYTHON_TAG.encode())
+    hasher.update(b"\0")
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def _memo_get(key: Tuple[str, str]) -> Optional[Dict]:
+    """Look up a memoised syntax result, marking it recently used."""
+    with _syntax_memo_lock:
+        entry = _syntax_memo.get(key)
+        if entry is not None:
+            _syntax_memo.move_to_end(key)
+        return entry
+
+
+def _memo_put(key: Tuple[str, str], entry: Dict) -> None:
+    """Memoise a syntax result, evicting the least recently used."""
+    with _syntax_memo_lock:
+        _syntax_memo[key] = entry
+        _syntax_memo.move_to_end(key)
+        while len(_syntax_memo) > SYNTAX_MEMO_SIZE:
+            _syntax_memo.popitem(last=False)
+
+
+def _check_python_syntax(data: bytes) -> Optional[str]:
+    """Compile Python source like py_compile; return the error or None."""
+    try:
+        compile(data, _COMPILE_FILENAME, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return f"{type(e).__name__}: {e.msg} (line {e.lineno})"
+    except ValueError as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+def _check_json_syntax(data: bytes) -> Optional[str]:
+    """
+    Parse JSON (with orjson when installed); return the error or None.
+
+    json_codec applies the same rules with either backend: NaN/Infinity
+    literals, a UTF-8 byte order mark and invalid UTF-8 are all rejected.
+    """
+    try:
+        json_codec.loads(data)
+    except (ValueError, RecursionError) as e:
+        return f"{type(e).__name__}: {e}"
+    return None
 
 
 class ValidationType(Enum):
@@ -50,16 +179,21 @@ class ValidationResult:
 class ValidationExecutor:
     """Execute validation checks based on file types and domain."""
 
-    # Syntax validators by file extension
+    # Content-only syntax checkers run in-process (results are cached)
+    CONTENT_VALIDATORS: Dict[str, Callable[[bytes], Optional[str]]] = {
+        ".py": _check_python_syntax,
+        ".json": _check_json_syntax,
+    }
+
+    # Syntax validators by file extension. Files are appended to the command,
+    # several per invocation; commands with a {} placeholder run per file.
     SYNTAX_VALIDATORS = {
-        ".py": ["python3", "-m", "py_compile"],
         ".js": ["npx", "eslint", "--no-fix", "--quiet"],
         ".ts": ["npx", "tsc", "--noEmit", "--skipLibCheck"],
         ".tsx": ["npx", "tsc", "--noEmit", "--skipLibCheck"],
         ".tex": ["chktex", "-q", "-n1", "-n3", "-n6", "-n8"],
-        ".json": ["python3", "-c", "import json; json.load(open('{}'))"],
-        ".yaml": ["python3", "-c", "import yaml; yaml.safe_load(open('{}'))"],
-        ".yml": ["python3", "-c", "import yaml; yaml.safe_load(open('{}'))"],
+        ".yaml": ["python3", "-c", _YAML_CHECK],
+        ".yml": ["python3", "-c", _YAML_CHECK],
     }
 
     # Build commands by project type
@@ -77,15 +211,28 @@ class ValidationExecutor:
         "nix": ["nix", "flake", "check", "--dry-run"],
     }
 
-    def __init__(self, project_root: Optional[Path] = None):
+    def __init__(
+        self,
+        project_root: Optional[Path] = None,
+        syntax_cache_dir: Optional[Path] = None,
+    ):
         """
         Initialize validation executor.
 
         Args:
             project_root: Root directory of project (defaults to cwd)
+            syntax_cache_dir: Syntax result cache (defaults to SYNTAX_CACHE_DIR)
         """
         self.project_root = project_root or Path.cwd()
-        self.project_type = self._detect_project_type()
+        # Each content hash caches separately; the JSON verdict is the
+        # same with or without orjson
+        namespace = f"v{SYNTAX_CACHE_VERSION}" + ("-xxh3" if xxhash is not None else "")
+        self.syntax_cache_dir = Path(syntax_cache_dir or SYNTAX_CACHE_DIR) / namespace
+
+    @cached_property
+    def project_type(self) -> Optional[str]:
+        """Project type, detected from marker files on first access."""
+        return self._detect_project_type()
 
     def _detect_project_type(self) -> Optional[str]:
         """Detect project type from files."""
@@ -130,6 +277,137 @@ class ValidationExecutor:
         except Exception as e:
             return -3, f"Command failed: {e}"
 
+    def _run_commands_batched(
+        self,
+        cmds: List[List[str]],
+        timeout: int = DEFAULT_TIMEOUT,
+        stop_on_failure: bool = False,
+        cwd: Optional[Path] = None,
+        timeouts: Optional[List[int]] = None,
+    ) -> List[tuple[int, str]]:
+        """
+        Run commands in order in one shell, capturing each one's result.
+
+        A sentinel line carrying the exit code is printed after every
+        command, and the combined output is split on those lines.
+
+        Args:
+            cmds: Commands to run, in order
+            timeout: Timeout for the whole batch (ignored with timeouts)
+            stop_on_failure: Skip the remaining commands after a failure
+            cwd: Working directory (defaults to project root)
+            timeouts: Per-command timeouts, enforced inside the shell with
+                timeout(1), so one slow command neither borrows another's
+                time nor loses the others' results. Requires timeout on PATH.
+
+        Returns:
+            (exit_code, output) per command that ran, in order. Shorter than
+            cmds when stop_on_failure ended the batch early.
+        """
+        sentinel = f"__validation_{secrets.token_hex(8)}__"
+        lines = ["exec 2>&1"]
+        for i, cmd in enumerate(cmds):
+            missing = shlex.quote(f"Command not found: {cmd[0]}")
+            run = shlex.join(cmd)
+            if timeouts is not None:
+                run = f"timeout -k {KILL_GRACE} {timeouts[i]} {run}"
+            lines.append(
+                f"if command -v {shlex.quote(cmd[0])} >/dev/null 2>&1; "
+                f"then {run}; rc=$?; "
+                f"else echo {missing}; rc=-2; fi"
+            )
+            lines.append(f"printf '\\n%s %s\\n' {sentinel} \"$rc\"")
+            if stop_on_failure:
+                lines.append('[ "$rc" -eq 0 ] || exit 0')
+
+        if timeouts is not None:
+            # Backstop only; each command is stopped by its own timeout
+            timeout = sum(timeouts) + 2 * KILL_GRACE * len(cmds)
+        exit_code, output = self._run_command(
+            ["sh", "-c", "\n".join(lines)], timeout=timeout, cwd=cwd
+        )
+        if exit_code < 0:
+            # The shell itself failed (timed out, killed, or not found)
+            return [(exit_code, output)] * len(cmds)
+
+        results = []
+        start = 0
+        for match in re.finditer(rf"^{sentinel} (-?\d+)$", output, re.MULTILINE):
+            code = int(match.group(1))
+            text = output[start:match.start()].strip()
+            if timeouts is not None and code == 124:
+                # timeout(1)'s exit status; report it like _run_command does
+                limit = timeouts[len(results)]
+                code, text = -1, f"Command timed out after {limit}s" + (f"\n{text}" if text else "")
+            results.append((code, text))
+            start = match.end()
+        return results
+
+    def _syntax_cache_file(self, digest: str) -> Path:
+        return self.syntax_cache_dir / digest[:2] / f"{digest[2:]}.json"
+
+    def _read_syntax_cache(self, digest: str) -> Optional[Dict]:
+        """Cached {passed, error} for a content digest, or None on a miss."""
+        try:
+            entry = json.loads(self._syntax_cache_file(digest).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or "passed" not in entry:
+            return None
+        return entry
+
+    def _write_syntax_cache(self, digest: str, entry: Dict) -> None:
+        """Store a result atomically; failures only cost a future re-check."""
+        cache_file = self._syntax_cache_file(digest)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(entry, f)
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError:
+            pass
+
+    def _validate_content(
+        self, file_path: Path, ext: str, checker: Callable[[bytes], Optional[str]]
+    ) -> ValidationResult:
+        """Run an in-process content checker, consulting the syntax cache."""
+        details = f"Syntax check: {file_path.name}"
+        try:
+            data = file_path.read_bytes()
+        except OSError as e:
+            return ValidationResult(
+                passed=False,
+                validation_type=ValidationType.SYNTAX,
+                details=details,
+                exit_code=1,
+                output=f"Could not read {file_path}: {e}",
+            )
+
+        digest = _content_digest(ext, data)
+        memo_key = (str(self.syntax_cache_dir), digest)
+        entry = _memo_get(memo_key)
+        if entry is None:
+            entry = self._read_syntax_cache(digest)
+            if entry is None:
+                error = checker(data)
+                entry = {"passed": error is None, "error": error}
+                self._write_syntax_cache(digest, entry)
+            _memo_put(memo_key, entry)
+
+        passed = bool(entry["passed"])
+        return ValidationResult(
+            passed=passed,
+            validation_type=ValidationType.SYNTAX,
+            details=details,
+            exit_code=0 if passed else 1,
+            output="" if passed else f"{file_path}: {entry.get('error')}",
+        )
+
     def validate_syntax(self, file_path: Path) -> ValidationResult:
         """
         Run syntax validation on a file.
@@ -142,6 +420,10 @@ class ValidationExecutor:
         """
         ext = file_path.suffix.lower()
 
+        checker = self.CONTENT_VALIDATORS.get(ext)
+        if checker is not None:
+            return self._validate_content(file_path, ext, checker)
+
         if ext not in self.SYNTAX_VALIDATORS:
             return ValidationResult(
                 passed=True,
@@ -170,49 +452,156 @@ class ValidationExecutor:
             output=output,
         )
 
-    def validate_build(self) -> ValidationResult:
+    @staticmethod
+    def _output_mentions(output: str, file_path: Path, project_root: Path) -> bool:
+        """True if checker output names file_path (as given, absolute or project-relative)."""
+        resolved = file_path.resolve()
+        spellings = {str(file_path), str(resolved)}
+        try:
+            spellings.add(str(resolved.relative_to(project_root.resolve())))
+        except ValueError:
+            pass
+        return any(
+            re.search(r"(?<![\w./\\-])" + re.escape(spelling) + r"(?![\w/\\])", output)
+            for spelling in spellings
+        )
+
+    def _validate_one(self, file_path: Path) -> Dict[Path, ValidationResult]:
+        return {file_path: self.validate_syntax(file_path)}
+
+    def _run_syntax_batch(self, cmd: List[str], batch: List[Path]) -> Dict[Path, ValidationResult]:
+        """Check a batch of files with one invocation of cmd."""
+        exit_code, output = self._run_command(list(cmd) + [str(f) for f in batch])
+        if exit_code == 0:
+            failed = set()
+        else:
+            failed = {f for f in batch if self._output_mentions(output, f, self.project_root)}
+            if not failed:
+                failed = set(batch)
+
+        results = {}
+        for file_path in batch:
+            passed = file_path not in failed
+            results[file_path] = ValidationResult(
+                passed=passed,
+                validation_type=ValidationType.SYNTAX,
+                details=f"Syntax check: {file_path.name}",
+                exit_code=0 if passed else exit_code,
+                output="" if passed else output,
+            )
+        return results
+
+    def validate_syntax_batch(
+        self, file_paths: List[Path], stop_on_failure: bool = False
+    ) -> Dict[Path, ValidationResult]:
         """
-        Run build validation for project.
+        Run syntax validation on many files, one checker process per language.
+
+        Files sharing an external validator command are checked by a single
+        invocation (up to SYNTAX_BATCH_SIZE files). If it fails, failures are
+        attributed to the files its output names; if it names none (e.g. the
+        tool is missing or timed out), every file in the batch fails with it.
+        Checker invocations and in-process checks run concurrently on a
+        thread pool, overlapping file reads and waits on subprocesses.
+
+        Args:
+            file_paths: Files to validate
+            stop_on_failure: Cancel checks not yet started once one fails;
+                their files are then missing from the result
 
         Returns:
-            ValidationResult with pass/fail status
+            Dict mapping each checked file path to its ValidationResult
         """
-        if self.project_type is None:
-            return ValidationResult(
-                passed=True,
-                validation_type=ValidationType.BUILD,
-                details="No build system detected",
-                exit_code=0,
-                output="",
-            )
+        jobs = []
+        groups: Dict[tuple, List[Path]] = {}
+
+        for file_path in dict.fromkeys(file_paths):
+            ext = file_path.suffix.lower()
+            cmd = self.SYNTAX_VALIDATORS.get(ext)
+            if ext in self.CONTENT_VALIDATORS or cmd is None or any("{}" in part for part in cmd):
+                jobs.append(partial(self._validate_one, file_path))
+            else:
+                groups.setdefault(tuple(cmd), []).append(file_path)
+
+        for cmd, files in groups.items():
+            for start in range(0, len(files), SYNTAX_BATCH_SIZE):
+                batch = files[start:start + SYNTAX_BATCH_SIZE]
+                if len(batch) == 1:
+                    jobs.append(partial(self._validate_one, batch[0]))
+                else:
+                    jobs.append(partial(self._run_syntax_batch, list(cmd), batch))
+
+        results: Dict[Path, ValidationResult] = {}
+        if len(jobs) <= 1:
+            for job in jobs:
+                results.update(job())
+            return results
 
-        cmd = self.BUILD_COMMANDS.get(self.project_type)
-        if cmd is None:
-            return ValidationResult(
-                passed=True,
-                validation_type=ValidationType.BUILD,
-                details=f"No build command for {self.project_type}",
-                exit_code=0,
-                output="",
-            )
+        with ThreadPoolExecutor(max_workers=min(SYNTAX_MAX_WORKERS, len(jobs))) as pool:
+            futures = [pool.submit(job) for job in jobs]
+            for future in as_completed(futures):
+                job_results = future.result()
+                results.update(job_results)
+                if stop_on_failure and not all(r.passed for r in job_results.values()):
+                    for pending in futures:
+                        pending.cancel()
+                    break
 
-        exit_code, output = self._run_command(cmd, timeout=BUILD_TIMEOUT)
+        return results
 
+    @staticmethod
+    def _command_result(
+        validation_type: ValidationType,
+        details: str,
+        exit_code: int = 0,
+        output: str = "",
+    ) -> ValidationResult:
+        """Result of a build or test command (passing when nothing ran)."""
         return ValidationResult(
             passed=exit_code == 0,
-            validation_type=ValidationType.BUILD,
-            details=f"Build check ({self.project_type})",
+            validation_type=validation_type,
+            details=details,
             exit_code=exit_code,
             output=output,
         )
 
-    def validate_tests(self) -> ValidationResult:
+    def _build_plan(self) -> tuple[Optional[List[str]], str]:
         """
-        Run test collection (not full tests) to verify test integrity.
+        Resolve the build command for this project.
+
+        Returns:
+            Tuple of (command, details); command is None if there is nothing to run
+        """
+        if self.project_type is None:
+            return None, "No build system detected"
+
+        cmd = self.BUILD_COMMANDS.get(self.project_type)
+        if cmd is None:
+            return None, f"No build command for {self.project_type}"
+
+        return cmd, f"Build check ({self.project_type})"
+
+    def validate_build(self) -> ValidationResult:
+        """
+        Run build validation for project.
 
         Returns:
             ValidationResult with pass/fail status
         """
+        cmd, details = self._build_plan()
+        if cmd is None:
+            return self._command_result(ValidationType.BUILD, details)
+
+        exit_code, output = self._run_command(cmd, timeout=BUILD_TIMEOUT)
+        return self._command_result(ValidationType.BUILD, details, exit_code, output)
+
+    def _test_plan(self) -> tuple[Optional[List[str]], str]:
+        """
+        Resolve the test collection command for this project.
+
+        Returns:
+            Tuple of (command, details); command is None if there is nothing to run
+        """
         test_type = None
 
         # Detect test framework
@@ -222,8 +611,8 @@ class ValidationExecutor:
             # Check if pytest is configured
             pyproject = self.project_root / "pyproject.toml"
             if pyproject.exists():
-                content = pyproject.read_text()
-                if "[tool.pytest" in content or "pytest" in content:
+                content = pyproject.read_bytes()
+                if b"[tool.pytest" in content or b"pytest" in content:
                     test_type = "pytest"
 
         if test_type is None and (self.project_root / "package.json").exists():
@@ -233,33 +622,27 @@ class ValidationExecutor:
             test_type = "nix"
 
         if test_type is None:
-            return ValidationResult(
-                passed=True,
-                validation_type=ValidationType.TEST,
-                details="No test framework detected",
-                exit_code=0,
-                output="",
-            )
+            return None, "No test framework detected"
 
         cmd = self.TEST_COMMANDS.get(test_type)
         if cmd is None:
-            return ValidationResult(
-                passed=True,
-                validation_type=ValidationType.TEST,
-                details=f"No test command for {test_type}",
-                exit_code=0,
-                output="",
-            )
+            return None, f"No test command for {test_type}"
 
-        exit_code, output = self._run_command(cmd, timeout=TEST_TIMEOUT)
+        return cmd, f"Test check ({test_type})"
 
-        return ValidationResult(
-            passed=exit_code == 0,
-            validation_type=ValidationType.TEST,
-            details=f"Test check ({test_type})",
-            exit_code=exit_code,
-            output=output,
-        )
+    def validate_tests(self) -> ValidationResult:
+        """
+        Run test collection (not full tests) to verify test integrity.
+
+        Returns:
+            ValidationResult with pass/fail status
+        """
+        cmd, details = self._test_plan()
+        if cmd is None:
+            return self._command_result(ValidationType.TEST, details)
+
+        exit_code, output = self._run_command(cmd, timeout=TEST_TIMEOUT)
+        return self._command_result(ValidationType.TEST, details, exit_code, output)
 
     def validate_all(
         self, modified_files: List[Path], fast_fail: bool = True
@@ -267,6 +650,9 @@ class ValidationExecutor:
         """
         Run all applicable validations.
 
+        Build and test checks are skipped when no project type is detected
+        and none of the modified files has a syntax validator.
+
         Args:
             modified_files: List of files that were modified
             fast_fail: Stop on first failure if True
@@ -276,24 +662,54 @@ class ValidationExecutor:
         """
         results = {}
 
-        # Syntax check each modified file
-        for file_path in modified_files:
-            if not file_path.exists():
+        # Syntax check each modified file (batched per checker)
+        existing = [file_path for file_path in modified_files if file_path.exists()]
+        syntax_results = self.validate_syntax_batch(existing, stop_on_failure=fast_fail)
+        for file_path in existing:
+            result = syntax_results.get(file_path)
+            if result is None:
+                # Cancelled after another file failed
                 continue
-
-            result = self.validate_syntax(file_path)
             results[f"syntax:{file_path.name}"] = result
 
             if fast_fail and not result.passed:
                 return results
 
-        # Build check
-        results["build"] = self.validate_build()
-        if fast_fail and not results["build"].passed:
+        # Nothing checkable changed and there is no build system to run
+        has_known = any(
+            f.suffix.lower() in self.CONTENT_VALIDATORS or f.suffix.lower() in self.SYNTAX_VALIDATORS
+            for f in existing
+        )
+        if not has_known and self.project_type is None:
             return results
 
-        # Test collection check
-        results["tests"] = self.validate_tests()
+        # Build check, then test collection
+        checks = [
+            ("build", ValidationType.BUILD, *self._build_plan(), BUILD_TIMEOUT),
+            ("tests", ValidationType.TEST, *self._test_plan(), TEST_TIMEOUT),
+        ]
+        runnable = [(cmd, timeout) for _, _, cmd, _, timeout in checks if cmd is not None]
+        if len(runnable) > 1 and shutil.which("timeout") is not None:
+            # One shell for both commands, each under its own time limit
+            outcomes = iter(self._run_commands_batched(
+                [cmd for cmd, _ in runnable],
+                stop_on_failure=fast_fail,
+                timeouts=[timeout for _, timeout in runnable],
+            ))
+        else:
+            outcomes = (self._run_command(cmd, timeout=timeout) for cmd, timeout in runnable)
+
+        for name, validation_type, cmd, details, _ in checks:
+            if cmd is None:
+                results[name] = self._command_result(validation_type, details)
+                continue
+            outcome = next(outcomes, None)
+            if outcome is None:
+                # Skipped after an earlier command failed
+                break
+            results[name] = self._command_result(validation_type, details, *outcome)
+            if fast_fail and not results[name].passed:
+                break
 
         return results
 
@@ -434,7 +850,7 @@ def test_validation_executor() -> None:
         py_file = project / "test.py"
         py_file.write_text("def hello():\n    return 'hello'\n")
 
-        executor = ValidationExecutor(project_root=project)
+        executor = ValidationExecutor(project_root=project, syntax_cache_dir=project / ".syntax-cache")
         result = executor.validate_syntax(py_file)
         assert result.passed, f"Valid Python should pass: {result.output}"
         print("  OK")
@@ -479,6 +895,14 @@ def test_validation_executor() -> None:
         assert len(results) == 1, "Fast fail should stop after first failure"
         print("  OK")
 
+        # Test 7: Cached syntax results
+        print("Test 7: Syntax cache")
+        cached_files = list((project / ".syntax-cache").rglob("*.json"))
+        assert len(cached_files) == 3, f"Expected 3 cached results, got {len(cached_files)}"
+        result = executor.validate_syntax(bad_py)
+        assert not result.passed and "bad.py" in result.output
+        print("  OK")
+
     print("\nAll validation executor tests passed!")
 
 
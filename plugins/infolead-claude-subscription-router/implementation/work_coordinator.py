@@ -3,17 +3,42 @@ Work Coordinator - Production-ready Kanban-style work queue with WIP limits.
 
 Implements the work coordination algorithm with completion guarantees through
 bounded parallelism and priority-based scheduling.
+
+Ready work (queued, dependencies satisfied) is kept in a heap ordered by the
+scheduling rules, so picking the next item is O(log n) rather than a scan of
+the whole queue. Each item also tracks how many of its dependencies are
+still pending and who depends on it, so a completion only touches that
+item's direct dependents. Ties are broken by bottom level (the longest
+chain of work waiting on an item), recomputed in one topological pass
+only after dependency edges are added. Work items should be added and transitioned through the
+coordinator so the heap stays in step with their status.
+
+State is persisted as a JSON snapshot plus an append-only JSONL journal
+next to it (work-queue.log). Each mutation appends the items it changed;
+the journal is folded into a fresh snapshot once it grows past
+JOURNAL_COMPACT_BYTES. Appends, compaction and reads all hold a lock on a
+sidecar file (work-queue.lock) that is never replaced, so a reader always
+pairs a snapshot with its own journal. Use read_work_queue() to read the
+combined state.
 """
 
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Set
+from typing import FrozenSet, Iterable, List, Optional, Dict, Set, Tuple
 from enum import Enum
 from datetime import datetime, timedelta
+import heapq
 import json
 import os
+import sys
+import tempfile
 from pathlib import Path
 
-from file_locking import locked_state_file
+import json_codec
+from file_locking import locked_state_file, locked_state_file_shared
+
+# Journal size that triggers compaction into the snapshot
+JOURNAL_COMPACT_BYTES = 256 * 1024
 
 
 class WorkStatus(Enum):
@@ -25,14 +50,19 @@ class WorkStatus(Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkItem:
-    """A unit of work in the queue."""
+    """
+    A unit of work in the queue.
+
+    Slotted: queues can hold thousands of items, and dropping the
+    per-instance __dict__ keeps them small and attribute access cheap.
+    """
     id: str
     description: str
     priority: int  # 1-10, higher = more important
     estimated_complexity: int = 3  # 1-5 scale, default to medium
-    dependencies: List[str] = field(default_factory=list)  # IDs of required tasks
+    dependencies: FrozenSet[str] = field(default_factory=frozenset)  # IDs of required tasks
     status: WorkStatus = WorkStatus.QUEUED
     agent_assigned: Optional[str] = None
     started_at: Optional[datetime] = None
@@ -40,9 +70,9 @@ class WorkItem:
     error_message: Optional[str] = None
 
     def __post_init__(self):
-        """Handle field aliases after initialization."""
-        # This allows the dataclass to be instantiated after handling aliases
-        pass
+        """Normalize dependencies (any iterable of IDs) to a frozenset."""
+        if not isinstance(self.dependencies, frozenset):
+            self.dependencies = frozenset(self.dependencies)
 
     @classmethod
     def create(
@@ -54,7 +84,7 @@ class WorkItem:
         task_name: Optional[str] = None,
         priority: int = 5,
         estimated_complexity: int = 3,
-        dependencies: Optional[List[str]] = None,
+        dependencies: Optional[Iterable[str]] = None,
         status: WorkStatus = WorkStatus.QUEUED,
         agent: Optional[str] = None,
         agent_assigned: Optional[str] = None,
@@ -68,7 +98,7 @@ class WorkItem:
             description/task_name: Human-readable description
             priority: Priority level (1-10)
             estimated_complexity: Complexity estimate (1-5)
-            dependencies: List of dependency IDs
+            dependencies: Dependency IDs
             status: Current status
             agent/agent_assigned: Assigned agent name
         """
@@ -77,7 +107,7 @@ class WorkItem:
             description=description or task_name or "",
             priority=priority,
             estimated_complexity=estimated_complexity,
-            dependencies=dependencies or [],
+            dependencies=frozenset(dependencies or ()),
             status=status,
             agent_assigned=agent_assigned or agent,
         )
@@ -89,7 +119,7 @@ class WorkItem:
             "description": self.description,
             "priority": self.priority,
             "estimated_complexity": self.estimated_complexity,
-            "dependencies": self.dependencies,
+            "dependencies": sorted(self.dependencies),
             "status": self.status.value,
             "agent_assigned": self.agent_assigned,
             "started_at": self.started_at.isoformat() if self.started_at else None,
@@ -99,13 +129,19 @@ class WorkItem:
 
     @staticmethod
     def from_dict(data: Dict) -> "WorkItem":
-        """Deserialize from dictionary."""
+        """
+        Deserialize from dictionary.
+
+        Ids are interned so an id and every dependency naming it share one
+        string object across a loaded queue. Status maps to the WorkStatus
+        member itself, so no per-item status string is kept.
+        """
         return WorkItem(
-            id=data["id"],
+            id=sys.intern(data["id"]),
             description=data["description"],
             priority=data["priority"],
             estimated_complexity=data["estimated_complexity"],
-            dependencies=data.get("dependencies", []),
+            dependencies=frozenset(sys.intern(d) for d in data.get("dependencies", [])),
             status=WorkStatus(data["status"]),
             agent_assigned=data.get("agent_assigned"),
             started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
@@ -114,6 +150,71 @@ class WorkItem:
         )
 
 
+def journal_path(state_file: Path) -> Path:
+    """Path of the journal kept alongside a work queue snapshot."""
+    return state_file.with_suffix(".log")
+
+
+def lock_path(state_file: Path) -> Path:
+    """Path of the lock file guarding a work queue snapshot and its journal."""
+    return state_file.with_suffix(".lock")
+
+
+def read_work_queue(state_file: Path) -> Dict:
+    """
+    Read work queue state: the snapshot with its journal replayed on top.
+
+    Each journal record holds a whole work item that replaces the item with
+    the same id, or is appended if the id is new. Replaying records already
+    folded into the snapshot is therefore harmless.
+
+    Args:
+        state_file: Snapshot path (the journal is derived from it)
+
+    Returns:
+        Snapshot dict whose "work_items" list reflects the journal
+
+    Raises:
+        json.JSONDecodeError, IOError, TimeoutError: If the snapshot can't be read
+    """
+    lock = lock_path(state_file)
+    if not lock.exists():
+        # Nothing has been written yet
+        return _read_snapshot_and_journal(state_file)
+    with locked_state_file_shared(lock):
+        return _read_snapshot_and_journal(state_file)
+
+
+def _read_snapshot_and_journal(state_file: Path) -> Dict:
+    """read_work_queue() body; the caller holds the queue lock."""
+    data: Dict = {}
+    if state_file.exists():
+        with open(state_file, "rb") as f:
+            data = json_codec.load(f)
+    items = data.setdefault("work_items", [])
+
+    log = journal_path(state_file)
+    if not log.exists():
+        return data
+
+    index: Dict[str, int] = {}
+    for i, item in enumerate(items):
+        index.setdefault(item.get("id"), i)
+    with open(log, "rb") as f:
+        for line in f:
+            try:
+                item = json_codec.loads(line)["item"]
+            except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError):
+                continue  # torn tail from an interrupted append
+            pos = index.get(item.get("id"))
+            if pos is None:
+                index[item.get("id")] = len(items)
+                items.append(item)
+            else:
+                items[pos] = item
+    return data
+
+
 class WorkCoordinator:
     """
     Manages parallel work distribution with WIP limits and completion prioritization.
@@ -128,7 +229,8 @@ class WorkCoordinator:
     def __init__(
         self,
         wip_limit: int = 3,
-        state_file: Optional[Path] = None
+        state_file: Optional[Path] = None,
+        persist: bool = True,
     ):
         """
         Initialize work coordinator.
@@ -136,14 +238,49 @@ class WorkCoordinator:
         Args:
             wip_limit: Maximum concurrent active tasks (default 3)
             state_file: Path to persist state (default: ~/.claude/infolead-claude-subscription-router/state/work-queue.json)
+            persist: If False, keep the queue in memory only and never
+                touch state_file
         """
         self.wip_limit = wip_limit
         self.work_items: List[WorkItem] = []
 
+        # Ready queued work as (-dependents, -priority, -bottom level,
+        # insertion seq, id). Entries go stale when an item starts or its
+        # dependent count grows; they are skipped (or re-keyed) when popped.
+        self._ready_heap: List[Tuple[int, int, int, int, str]] = []
+        self._seq: Dict[str, int] = {}
+        self._items_by_id: Dict[str, WorkItem] = {}
+
+        # Reverse dependency edges (id -> ids depending on it) and, per
+        # item, how many of its distinct dependencies are not yet completed.
+        self._dependents: Dict[str, List[str]] = {}
+        self._pending_deps: Dict[str, int] = {}
+
+        # Ids of completed and active items, and the queued items in
+        # insertion order, kept in step by _set_status()
+        self._completed: Set[str] = set()
+        self._active: Set[str] = set()
+        self._queued: Dict[str, WorkItem] = {}
+
+        # Number of items in each status, for the status summary
+        self._status_counts: Counter = Counter()
+
+        # Derived from the dependency graph and recomputed lazily, together
+        # with the heap, after edges are added: items stuck behind a cycle,
+        # and each item's bottom level (longest chain of work waiting on it)
+        self._cyclic: Set[str] = set()
+        self._bottom_level: Dict[str, int] = {}
+        self._graph_dirty = True
+
         # State file for persistence
         if state_file is None:
             state_file = Path.home() / ".claude" / "infolead-claude-subscription-router" / "state" / "work-queue.json"
         self.state_file = state_file
+        self.journal_file = journal_path(state_file)
+        self.lock_file = lock_path(state_file)
+        self.persist = persist
+        if not persist:
+            return
 
         # Ensure state directory exists with secure permissions
         self.state_file.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
@@ -153,64 +290,296 @@ class WorkCoordinator:
 
     def _load_state(self):
         """Load work queue state from disk with file locking."""
-        if not self.state_file.exists():
+        if not self.state_file.exists() and not self.journal_file.exists():
             return
 
         try:
-            with locked_state_file(self.state_file, "r") as f:
-                data = json.load(f)
-                self.wip_limit = data.get("wip_limit", 3)
-                self.work_items = [
-                    WorkItem.from_dict(item)
-                    for item in data.get("work_items", [])
-                ]
+            data = read_work_queue(self.state_file)
+            self.wip_limit = data.get("wip_limit", 3)
+            self.work_items = [
+                WorkItem.from_dict(item)
+                for item in data["work_items"]
+            ]
         except (json.JSONDecodeError, IOError, KeyError, TimeoutError) as e:
             print(f"Warning: Could not load work queue state: {e}")
             self.work_items = []
 
+        self._rebuild_schedule()
+
+    def _rebuild_schedule(self) -> None:
+        """Recompute scheduling state from work_items."""
+        self._seq = {}
+        self._items_by_id = {}
+        self._dependents = {}
+        self._pending_deps = {}
+        self._completed = {w.id for w in self.work_items if w.status == WorkStatus.COMPLETED}
+        self._active = {w.id for w in self.work_items if w.status == WorkStatus.ACTIVE}
+        self._queued = {}
+        self._status_counts = Counter(w.status for w in self.work_items)
+        for w in self.work_items:
+            if w.status == WorkStatus.QUEUED:
+                self._queued.setdefault(w.id, w)
+        for item in self.work_items:
+            self._seq.setdefault(item.id, len(self._seq))
+            self._items_by_id.setdefault(item.id, item)
+            self._add_edges(item, self._completed)
+
+        self._graph_dirty = True
+
+    def _refresh_graph(self) -> None:
+        """
+        Recompute cycle membership, bottom levels and the ready heap.
+
+        One pass of Kahn's algorithm yields a topological order; anything
+        left out of it is on or behind a cycle. Walking the order backwards
+        gives each item's bottom level, counting itself, with cyclic work
+        at level 0.
+        """
+        indegree = {
+            item_id: sum(1 for d in item.dependencies if d in self._items_by_id)
+            for item_id, item in self._items_by_id.items()
+        }
+        frontier = [item_id for item_id, n in indegree.items() if n == 0]
+        order = []
+        while frontier:
+            item_id = frontier.pop()
+            order.append(item_id)
+            for dependent in self._dependents.get(item_id, ()):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    frontier.append(dependent)
+        self._cyclic = {item_id for item_id, n in indegree.items() if n > 0}
+
+        self._bottom_level = dict.fromkeys(self._cyclic, 0)
+        for item_id in reversed(order):
+            self._bottom_level[item_id] = 1 + max(
+                (self._bottom_level[d] for d in self._dependents.get(item_id, ())),
+                default=0,
+            )
+
+        self._ready_heap = [
+            self._heap_entry(w) for w in self._queued.values() if self._is_ready(w)
+        ]
+        heapq.heapify(self._ready_heap)
+        self._graph_dirty = False
+
+    def _add_edges(self, item: WorkItem, completed_ids: Set[str]) -> None:
+        """Record item's dependency edges and its count of pending dependencies."""
+        for dep_id in item.dependencies:
+            self._dependents.setdefault(dep_id, []).append(item.id)
+        self._pending_deps[item.id] = len(item.dependencies - completed_ids)
+
+    def _is_ready(self, item: WorkItem) -> bool:
+        """True if none of the item's dependencies are still pending."""
+        return self._pending_deps.get(item.id, 0) == 0
+
+    def _set_status(self, item: WorkItem, status: WorkStatus) -> None:
+        """
+        Change an item's status, keeping the status sets and dependents' counts in step.
+
+        Dependents whose last pending dependency this completes are pushed
+        onto the ready heap; un-completing (e.g. failing a completed item)
+        blocks them again.
+        """
+        old, item.status = item.status, status
+        self._status_counts[old] -= 1
+        self._status_counts[status] += 1
+        if old == WorkStatus.ACTIVE:
+            self._active.discard(item.id)
+        elif old == WorkStatus.QUEUED:
+            self._queued.pop(item.id, None)
+        if status == WorkStatus.ACTIVE:
+            self._active.add(item.id)
+        elif status == WorkStatus.QUEUED:
+            self._queued[item.id] = item
+
+        completed = status == WorkStatus.COMPLETED
+        if (old == WorkStatus.COMPLETED) == completed:
+            return
+        if completed:
+            self._completed.add(item.id)
+        else:
+            self._completed.discard(item.id)
+        step = -1 if completed else 1
+        for dep_id in self._dependents.get(item.id, ()):
+            self._pending_deps[dep_id] += step
+            dependent = self._items_by_id[dep_id]
+            if completed and dependent.status == WorkStatus.QUEUED and self._is_ready(dependent):
+                self._push_ready(dependent)
+
+    def _heap_entry(self, item: WorkItem) -> Tuple[int, int, int, int, str]:
+        """Heap key: most dependents first, then priority, then longest chain, then insertion order."""
+        return (
+            -len(self._dependents.get(item.id, ())),
+            -item.priority,
+            -self._bottom_level.get(item.id, 1),
+            self._seq[item.id],
+            item.id,
+        )
+
+    def _push_ready(self, item: WorkItem) -> None:
+        """Add a queued item whose dependencies are satisfied to the heap."""
+        heapq.heappush(self._ready_heap, self._heap_entry(item))
+
+    def _pop_ready(self, peek: bool = False) -> Optional[WorkItem]:
+        """
+        Pop (or peek at) the best ready item, dropping stale heap entries.
+
+        An entry is stale if its item is no longer queued, or re-keyed if
+        the item's dependent count or priority changed since it was pushed.
+        """
+        if self._graph_dirty:
+            self._refresh_graph()
+        while self._ready_heap:
+            entry = self._ready_heap[0]
+            item = self._items_by_id.get(entry[-1])
+            if item is None or item.status != WorkStatus.QUEUED or not self._is_ready(item):
+                heapq.heappop(self._ready_heap)
+                continue
+            current = self._heap_entry(item)
+            if current != entry:
+                heapq.heapreplace(self._ready_heap, current)
+                continue
+            if not peek:
+                heapq.heappop(self._ready_heap)
+            return item
+        return None
+
     def _save_state(self):
-        """Save work queue state to disk with file locking."""
+        """
+        Write a full snapshot of the work queue and empty the journal.
+
+        The snapshot is encoded up front, written to a temporary file in one
+        call and renamed over the state file, so a crash never leaves a
+        truncated snapshot behind.
+        """
+        if not self.persist:
+            return
+        try:
+            with locked_state_file(self.lock_file, "r", create_if_missing=True):
+                self._write_snapshot()
+        except OSError as e:  # includes lock timeouts
+            raise RuntimeError(f"Failed to save work queue state: {e}") from e
+
+    def _write_snapshot(self) -> None:
+        """_save_state() body; the caller holds the queue lock."""
         data = {
             "wip_limit": self.wip_limit,
             "work_items": [item.to_dict() for item in self.work_items],
             "last_updated": datetime.now().isoformat(),
         }
+        payload = json_codec.dumps(data, indent=True)
 
         try:
-            with locked_state_file(
-                self.state_file, "r+", create_if_missing=True
-            ) as f:
-                f.seek(0)
-                f.truncate()
-                json.dump(data, f, indent=2)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.state_file.parent, prefix=self.state_file.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_name, self.state_file)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+            if self.journal_file.exists():
+                os.truncate(self.journal_file, 0)
         except Exception as e:
             raise RuntimeError(f"Failed to save work queue state: {e}") from e
 
+    def _append_journal(self, op: str, items: List[WorkItem]) -> None:
+        """
+        Persist changed items by appending one journal record per item.
+
+        The first write of a new queue is a snapshot, and the journal is
+        compacted into a new snapshot once it exceeds JOURNAL_COMPACT_BYTES.
+        """
+        if not self.persist:
+            return
+
+        records = b"".join(
+            json_codec.dumps({"op": op, "item": item.to_dict()}) + b"\n"
+            for item in items
+        )
+        try:
+            with locked_state_file(self.lock_file, "r", create_if_missing=True):
+                if not self.state_file.exists():
+                    self._write_snapshot()
+                    return
+                fd = os.open(self.journal_file, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    size = os.fstat(fd).st_size
+                    if size and os.pread(fd, 1, size - 1) != b"\n":
+                        # Terminate a torn line so this record isn't glued onto it
+                        records = b"\n" + records
+                    os.write(fd, records)
+                    size = os.fstat(fd).st_size
+                finally:
+                    os.close(fd)
+                if size > JOURNAL_COMPACT_BYTES:
+                    self._write_snapshot()
+        except OSError as e:
+            raise RuntimeError(f"Failed to append to work queue journal: {e}") from e
+
+    def _register(self, item: WorkItem) -> None:
+        """Index a new work item for scheduling."""
+        self.work_items.append(item)
+        self._seq.setdefault(item.id, len(self._seq))
+        self._items_by_id.setdefault(item.id, item)
+        self._add_edges(item, self._completed)
+        if item.id in self._dependents or any(d in self._items_by_id for d in item.dependencies):
+            # Edges between known items changed, so keys upstream may have:
+            # re-derive levels and heap on next pop. Edges to ids not yet
+            # added leave every existing key as it was.
+            self._graph_dirty = True
+        else:
+            self._bottom_level[item.id] = 1
+        # Index the item's status as a transition from QUEUED
+        status, item.status = item.status, WorkStatus.QUEUED
+        self._status_counts[WorkStatus.QUEUED] += 1
+        self._set_status(item, status)
+        if not self._graph_dirty and item.status == WorkStatus.QUEUED and self._is_ready(item):
+            self._push_ready(item)
+
     def add_work(self, item: WorkItem):
         """Add work item to queue."""
-        self.work_items.append(item)
-        self._save_state()
+        self._register(item)
+        self._append_journal("add", [item])
+
+    def get(self, work_id: str) -> Optional[WorkItem]:
+        """Look up a work item by ID (the first added, if IDs repeat)."""
+        return self._items_by_id.get(work_id)
 
     def get_active_count(self) -> int:
         """Count currently active work items."""
-        return len([w for w in self.work_items if w.status == WorkStatus.ACTIVE])
+        return len(self._active)
 
     def get_completed_ids(self) -> Set[str]:
         """Get set of completed work item IDs."""
-        return {w.id for w in self.work_items if w.status == WorkStatus.COMPLETED}
+        return set(self._completed)
 
     def dependencies_satisfied(self, item: WorkItem) -> bool:
         """Check if all dependencies for a work item are satisfied."""
-        completed_ids = self.get_completed_ids()
-        return all(dep_id in completed_ids for dep_id in item.dependencies)
+        if self._items_by_id.get(item.id) is item:
+            # Queued work: answered by its pending-dependency count
+            return self._is_ready(item)
+        return item.dependencies <= self._completed
 
     def count_dependent_work(self, work_id: str) -> int:
         """Count how many other work items depend on this one."""
-        count = 0
-        for item in self.work_items:
-            if work_id in item.dependencies:
-                count += 1
-        return count
+        return len(self._dependents.get(work_id, ()))
+
+    def get_cyclic_ids(self) -> Set[str]:
+        """
+        Get IDs of work that can never start because of a dependency cycle.
+
+        Includes both the items on a cycle and those depending on them.
+        Computed with Kahn's algorithm the first time it is asked for after
+        work is added, then cached. Scheduling does not need this: cyclic
+        work simply never has its pending dependencies reach zero.
+        """
+        if self._graph_dirty:
+            self._refresh_graph()
+        return set(self._cyclic)
 
     def get_next_work(self) -> Optional[WorkItem]:
         """
@@ -218,7 +587,8 @@ class WorkCoordinator:
 
         1. Unblock other work (highest priority if dependencies satisfied)
         2. Highest priority eligible work
-        3. Respect WIP limit
+        3. Ties go to the work heading the longest dependency chain
+        4. Respect WIP limit
 
         Returns:
             Next work item to start, or None if at capacity or no eligible work
@@ -227,52 +597,34 @@ class WorkCoordinator:
         if self.get_active_count() >= self.wip_limit:
             return None
 
-        # Get eligible work (queued, dependencies satisfied)
-        eligible = [
-            w for w in self.work_items
-            if w.status == WorkStatus.QUEUED and self.dependencies_satisfied(w)
-        ]
-
-        if not eligible:
-            return None
-
-        # Priority 1: Work that unblocks most other work
-        unblocking_scores = {
-            w.id: self.count_dependent_work(w.id) for w in eligible
-        }
-        max_unblocking = max(unblocking_scores.values())
-
-        if max_unblocking > 0:
-            # Among unblocking work, choose highest priority
-            unblocking_work = [
-                w for w in eligible
-                if unblocking_scores[w.id] == max_unblocking
-            ]
-            return max(unblocking_work, key=lambda w: w.priority)
-
-        # Priority 2: Highest priority eligible work
-        return max(eligible, key=lambda w: w.priority)
+        return self._pop_ready(peek=True)
 
     def schedule_work(self) -> List[WorkItem]:
         """
         Main scheduling loop: Fill WIP slots with highest-value work.
 
+        Drains up to the number of free slots from the ready heap in one
+        pass; everything started together shares one start time and one
+        journal write.
+
         Returns:
             List of newly-started work items
         """
         newly_started = []
+        slots = self.wip_limit - self.get_active_count()
+        now = datetime.now()
 
-        while self.get_active_count() < self.wip_limit:
-            next_work = self.get_next_work()
+        while len(newly_started) < slots:
+            next_work = self._pop_ready()
             if not next_work:
                 break  # No eligible work available
 
-            next_work.status = WorkStatus.ACTIVE
-            next_work.started_at = datetime.now()
+            self._set_status(next_work, WorkStatus.ACTIVE)
+            next_work.started_at = now
             newly_started.append(next_work)
 
         if newly_started:
-            self._save_state()
+            self._append_journal("start", newly_started)
 
         return newly_started
 
@@ -284,15 +636,14 @@ class WorkCoordinator:
             work_id: ID of completed work
             agent: Optional agent name that completed the work
         """
-        for item in self.work_items:
-            if item.id == work_id:
-                item.status = WorkStatus.COMPLETED
-                item.completed_at = datetime.now()
-                if agent:
-                    item.agent_assigned = agent
-                break
-
-        self._save_state()
+        item = self.get(work_id)
+        if item is not None:
+            # Queues dependents this completion made ready
+            self._set_status(item, WorkStatus.COMPLETED)
+            item.completed_at = datetime.now()
+            if agent:
+                item.agent_assigned = agent
+            self._append_journal("complete", [item])
 
         # Attempt to fill the freed WIP slot
         self.schedule_work()
@@ -305,14 +656,12 @@ class WorkCoordinator:
             work_id: ID of failed work
             error: Error message
         """
-        for item in self.work_items:
-            if item.id == work_id:
-                item.status = WorkStatus.FAILED
-                item.error_message = error
-                item.completed_at = datetime.now()
-                break
-
-        self._save_state()
+        item = self.get(work_id)
+        if item is not None:
+            self._set_status(item, WorkStatus.FAILED)
+            item.error_message = error
+            item.completed_at = datetime.now()
+            self._append_journal("fail", [item])
 
         # Attempt to fill the freed WIP slot
         self.schedule_work()
@@ -322,9 +671,9 @@ class WorkCoordinator:
         return {
             "wip_limit": self.wip_limit,
             "active_count": self.get_active_count(),
-            "queued_count": len([w for w in self.work_items if w.status == WorkStatus.QUEUED]),
-            "completed_count": len([w for w in self.work_items if w.status == WorkStatus.COMPLETED]),
-            "failed_count": len([w for w in self.work_items if w.status == WorkStatus.FAILED]),
+            "queued_count": self._status_counts[WorkStatus.QUEUED],
+            "completed_count": self._status_counts[WorkStatus.COMPLETED],
+            "failed_count": self._status_counts[WorkStatus.FAILED],
             "total_count": len(self.work_items),
         }
 
@@ -341,10 +690,37 @@ class WorkCoordinator:
         """Alias for add_work() for backwards compatibility."""
         self.add_work(task)
 
+    def try_add_task(self, task: WorkItem) -> bool:
+        """
+        Admit a task only if it can start right away.
+
+        Unlike add_task(), which always queues, this starts the task when a
+        WIP slot is free and its dependencies are satisfied, and otherwise
+        leaves the queue untouched. A task whose id is already known is
+        rejected too.
+
+        Returns:
+            True if the task was added and started, False if it was rejected
+        """
+        if self.get(task.id) is not None:
+            return False
+        if self.get_active_count() >= self.wip_limit or not self.dependencies_satisfied(task):
+            return False
+
+        task.status = WorkStatus.ACTIVE
+        task.started_at = datetime.now()
+        self._register(task)
+        self._append_journal("add", [task])
+        return True
+
     def get_active_tasks(self) -> List[WorkItem]:
         """Get list of currently active work items."""
         return [w for w in self.work_items if w.status == WorkStatus.ACTIVE]
 
+    def get_queued_tasks(self) -> List[WorkItem]:
+        """Get list of queued work items, in the order they were added."""
+        return list(self._queued.values())
+
     def complete_task(self, task_id: str, agent: Optional[str] = None) -> None:
         """Alias for complete_work() for backwards compatibility."""
         self.complete_work(task_id, agent)
@@ -372,16 +748,19 @@ class WorkCoordinator:
         print()
 
         # Queued work
-        queued_work = [w for w in self.work_items if w.status == WorkStatus.QUEUED]
+        queued_work = self.get_queued_tasks()
         print(f"Queued ({len(queued_work)}):")
 
         if queued_work:
+            cyclic = self.get_cyclic_ids()
             for w in sorted(queued_work, key=lambda x: x.priority, reverse=True)[:5]:
                 blocked = not self.dependencies_satisfied(w)
                 status_icon = "🚫" if blocked else "📋"
                 print(f"  {status_icon} [{w.id}] Priority {w.priority} - {w.description}")
-                if blocked:
-                    print(f"     Blocked by: {', '.join(w.dependencies)}")
+                if w.id in cyclic:
+                    print(f"     Blocked by dependency cycle: {', '.join(sorted(w.dependencies))}")
+                elif blocked:
+                    print(f"     Blocked by: {', '.join(sorted(w.dependencies))}")
         else:
             print("  (none)")
         print()
@@ -405,9 +784,6 @@ class WorkCoordinator:
 
 def test_work_coordinator() -> None:
     """Comprehensive tests for work coordinator functionality."""
-    import tempfile
-    import sys
-
     print("Testing work coordinator...")
 
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -428,17 +804,10 @@ def test_work_coordinator() -> None:
         assert len(coord.work_items) == 3
         print("  OK")
 
-        # Helper to find work by id
-        def find_work(items, work_id):
-            for w in items:
-                if w.id == work_id:
-                    return w
-            return None
-
         # Test 3: Priority ordering
         print("Test 3: Priority ordering")
         # Highest priority item exists
-        w1 = find_work(coord.work_items, "w1")
+        w1 = coord.get("w1")
         assert w1 is not None
         assert w1.priority == 8
         print("  OK")
@@ -455,7 +824,7 @@ def test_work_coordinator() -> None:
         # Test 5: Complete work
         print("Test 5: Complete work")
         coord.complete_work("w1")
-        w1 = find_work(coord.work_items, "w1")
+        w1 = coord.get("w1")
         assert w1 is not None
         assert w1.status == WorkStatus.COMPLETED
         assert w1.completed_at is not None
@@ -464,7 +833,7 @@ def test_work_coordinator() -> None:
         # Test 6: Fail work
         print("Test 6: Fail work")
         coord.fail_work("w2", error="Test error")
-        w2 = find_work(coord.work_items, "w2")
+        w2 = coord.get("w2")
         assert w2 is not None
         assert w2.status == WorkStatus.FAILED
         assert w2.error_message == "Test error"
@@ -479,7 +848,7 @@ def test_work_coordinator() -> None:
         # Blocked task shouldn't start even though higher priority
         started = coord2.schedule_work()
         assert any(w.id == "dep_main" for w in started), "Main task should start"
-        dep_blocked = find_work(coord2.work_items, "dep_blocked")
+        dep_blocked = coord2.get("dep_blocked")
         assert dep_blocked.status in [WorkStatus.QUEUED, WorkStatus.BLOCKED], "Blocked task should not start"
 
         # Complete main task
@@ -487,7 +856,7 @@ def test_work_coordinator() -> None:
 
         # Now blocked task should be schedulable
         started = coord2.schedule_work()
-        dep_blocked = find_work(coord2.work_items, "dep_blocked")
+        dep_blocked = coord2.get("dep_blocked")
         assert dep_blocked.status == WorkStatus.ACTIVE, "Previously blocked task should now start"
         print("  OK")
 
@@ -513,7 +882,7 @@ def test_work_coordinator() -> None:
         # Create new coordinator and load
         coord5 = WorkCoordinator(wip_limit=2, state_file=persist_file)
         # State is loaded in __init__ via _load_state()
-        persisted = find_work(coord5.work_items, "persist1")
+        persisted = coord5.get("persist1")
         assert persisted is not None, "Work should persist"
         assert persisted.description == "Persistent"
         print("  OK")
@@ -535,8 +904,6 @@ def test_work_coordinator() -> None:
 
 # CLI and test entry point
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) > 1 and sys.argv[1] == "--test":
         test_work_coordinator()
         sys.exit(0)
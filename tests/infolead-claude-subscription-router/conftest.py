@@ -0,0 +1,43 @@
+"""
+Shared pytest configuration for the router plugin tests.
+
+Puts the plugin's implementation directory on sys.path once per session,
+so test modules can import implementation modules directly.
+
+Tests marked ``slow`` (e.g. ones spawning every hook script) are skipped
+unless pytest is run with ``--run-slow``; run_all_tests.sh passes it.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+IMPLEMENTATION_DIR = str(
+    Path(__file__).parent.parent.parent / "plugins" / "infolead-claude-subscription-router" / "implementation"
+)
+
+if IMPLEMENTATION_DIR not in sys.path:
+    sys.path.insert(0, IMPLEMENTATION_DIR)
+
+
+def pytest_addoption(parser):
+    """Add the --run-slow option."""
+    parser.addoption(
+        "--run-slow", action="store_true", default=False, help="also run tests marked slow"
+    )
+
+
+def pytest_configure(config):
+    """Register the slow marker."""
+    config.addinivalue_line("markers", "slow: long-running test, skipped unless --run-slow is given")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --run-slow was given."""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow test, run with --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
@@ -42,7 +42,7 @@ echo -e "${YELLOW}Suite 1: Unit Tests (pytest)${NC}"
 echo -e "${YELLOW}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 
 UNIT_OUTPUT=$(mktemp)
-if nix-shell -p python312Packages.pytest python312Packages.pyyaml --run "pytest tests/infolead-claude-subscription-router/ -v --tb=short" > "$UNIT_OUTPUT" 2>&1; then
+if nix-shell -p python312Packages.pytest python312Packages.pyyaml --run "pytest tests/infolead-claude-subscription-router/ -v --tb=short --run-slow" > "$UNIT_OUTPUT" 2>&1; then
     UNIT_RESULT=$(tail -1 "$UNIT_OUTPUT" | grep -oP '\d+ passed' | grep -oP '\d+' || echo "0")
     echo -e "${GREEN}✓ Unit tests passed: $UNIT_RESULT${NC}"
     TOTAL_PASSED=$((TOTAL_PASSED + UNIT_RESULT))
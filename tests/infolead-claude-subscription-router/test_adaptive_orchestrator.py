@@ -11,7 +11,6 @@ Run:
 
 import pytest
 import sys
-import tempfile
 import yaml
 from pathlib import Path
 from unittest.mock import Mock, patch
@@ -47,12 +46,11 @@ def classifier():
 
 
 @pytest.fixture
-def temp_config_file():
+def temp_config_file(tmp_path):
     """Create temporary config file for testing."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-        yield Path(f.name)
-    # Cleanup
-    Path(f.name).unlink(missing_ok=True)
+    config_file = tmp_path / "config.yaml"
+    config_file.touch()
+    return config_file
 
 
 # ============================================================================
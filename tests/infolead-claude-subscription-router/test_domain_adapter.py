@@ -5,7 +5,6 @@ Tests domain detection, workflow loading, and agent recommendations.
 """
 
 import pytest
-import tempfile
 from pathlib import Path
 import sys
 
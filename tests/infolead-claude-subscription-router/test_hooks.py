@@ -172,6 +172,7 @@ class TestJqDependency:
 class TestHookTimeout:
     """Test hook timeout behavior."""
 
+    @pytest.mark.slow
     def test_hooks_complete_quickly(self, tmp_path):
         """Hooks should complete within timeout."""
         test_input = {
@@ -9,16 +9,11 @@ Run with:
 
 import json
 import pytest
-import tempfile
-from pathlib import Path
 from datetime import datetime
 
-# Import implementations
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "plugins" / "infolead-claude-subscription-router" / "implementation"))
-
+# Import implementations (conftest.py puts them on sys.path)
 from routing_core import route_request, should_escalate, RouterDecision, RoutingResult
-from session_state_manager import SessionStateManager, MEMORY_DIR
+from session_state_manager import SessionStateManager
 from work_coordinator import WorkCoordinator, WorkItem, WorkStatus
 from domain_adapter import DomainAdapter, ParallelismLevel
 from lazy_context_loader import LazyContextLoader
@@ -86,6 +81,30 @@ class TestWorkCoordination:
         assert len(started) <= 3
         assert coordinator.get_active_count() <= 3
 
+    def test_try_add_task_respects_wip_limit(self, coordinator):
+        """try_add_task rejects work beyond the WIP limit instead of queueing it."""
+        added = [
+            coordinator.try_add_task(WorkItem(id=f"task_{i}", description=f"Task {i}", priority=5))
+            for i in range(4)
+        ]
+
+        assert added == [True, True, True, False]
+        assert coordinator.get_active_count() == 3
+        assert coordinator.get_status_summary()["total_count"] == 3
+
+    def test_try_add_task_rejects_known_id(self, coordinator):
+        """try_add_task does not admit a second item with an id already in the queue."""
+        assert coordinator.try_add_task(WorkItem(id="task_1", description="Task 1", priority=5)) is True
+        coordinator.add_work(WorkItem(id="task_2", description="Task 2", priority=5, dependencies=["task_1"]))
+
+        assert coordinator.try_add_task(WorkItem(id="task_1", description="Again", priority=5)) is False
+        assert coordinator.try_add_task(WorkItem(id="task_2", description="Again", priority=5)) is False
+
+        assert [w.id for w in coordinator.work_items] == ["task_1", "task_2"]
+        assert coordinator.count_dependent_work("task_1") == 1
+        summary = coordinator.get_status_summary()
+        assert (summary["active_count"], summary["queued_count"], summary["total_count"]) == (1, 1, 2)
+
     def test_task_completion(self, coordinator):
         """Completing tasks should reduce WIP count."""
         task = WorkItem(
@@ -140,8 +159,8 @@ class TestDomainIntegration:
     def test_domain_detection(self, adapter, tmp_path):
         """Domain adapter should detect project type."""
         # Create .tex file
-        (tmp_path / "main.tex").write_text("\\documentclass{article}")
-        (tmp_path / "references.bib").write_text("@article{test, title={Test}}")
+        (tmp_path / "main.tex").write_bytes(b"\\documentclass{article}")
+        (tmp_path / "references.bib").write_bytes(b"@article{test, title={Test}}")
 
         domain = adapter.detect_domain(tmp_path)
         assert domain == "latex-research"
@@ -228,7 +247,7 @@ class TestLazyContextLoading:
     def test_metadata_indexing(self, loader, tmp_path):
         """Should build metadata index for LaTeX files."""
         # Create test LaTeX file
-        tex_content = """\\documentclass{article}
+        tex_content = b"""\\documentclass{article}
 \\begin{document}
 
 \\chapter{Introduction}
@@ -243,7 +262,7 @@ Research methods.
 \\end{document}
 """
         tex_file = tmp_path / "test.tex"
-        tex_file.write_text(tex_content)
+        tex_file.write_bytes(tex_content)
 
         # Build index
         loader.build_metadata_index(tmp_path)
@@ -262,7 +281,7 @@ Research methods.
     def test_section_loading(self, loader, tmp_path):
         """Should load specific sections without loading entire file."""
         # Create test file with sections
-        md_content = """# First Heading
+        md_content = b"""# First Heading
 
 Content for first section.
 
@@ -275,15 +294,14 @@ Content for second section.
 Content for third section.
 """
         md_file = tmp_path / "test.md"
-        md_file.write_text(md_content)
+        md_file.write_bytes(md_content)
 
         # Build index
         loader.build_metadata_index(tmp_path)
 
         # Load specific section
-        sections = loader.list_sections(str(md_file))
-        if sections:
-            first_section = sections[0]
+        first_section = next(loader.iter_sections(str(md_file)), None)
+        if first_section:
             content = loader.load_section(str(md_file), first_section.section_id)
 
             assert content is not None
@@ -296,17 +314,18 @@ Content for third section.
         loader = LazyContextLoader(context_budget=100)  # Very small budget
 
         # Create multiple sections
-        for i in range(5):
-            md_file = tmp_path / f"test{i}.md"
-            md_file.write_text(f"# Section {i}\n\n" + "x" * 50)
+        paths = [str(tmp_path / f"test{i}.md") for i in range(5)]
+        for i, path in enumerate(paths):
+            with open(path, "wb") as f:
+                f.write(b"# Section %d\n\n" % i + b"x" * 50)
 
         loader.build_metadata_index(tmp_path)
 
         # Load all sections (should trigger eviction)
-        for i in range(5):
-            sections = loader.list_sections(str(tmp_path / f"test{i}.md"))
-            if sections:
-                loader.load_section(str(tmp_path / f"test{i}.md"), sections[0].section_id)
+        for path in paths:
+            first_section = next(loader.iter_sections(path), None)
+            if first_section:
+                loader.load_section(path, first_section.section_id)
 
         stats = loader.get_stats()
 
@@ -0,0 +1,132 @@
+"""
+Tests for json_codec module.
+
+Tests encoding/decoding with and without orjson.
+"""
+
+import json
+import pytest
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "plugins" / "infolead-claude-subscription-router" / "implementation"))
+
+import json_codec
+from json_codec import dumps, loads, dump, load
+
+
+class Color(Enum):
+    RED = "red"
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run each test with orjson (when installed) and with the stdlib fallback."""
+    if request.param == "orjson":
+        if not json_codec.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return request.param
+
+
+class TestRoundTrip:
+    """Test encode/decode round trips."""
+
+    def test_round_trip(self, backend):
+        """Values survive a round trip from bytes and from str."""
+        data = {"name": "test", "items": [1, 2.5, None, True], "nested": {"a": "ü"}}
+
+        encoded = dumps(data)
+
+        assert isinstance(encoded, bytes)
+        assert loads(encoded) == data
+        assert loads(encoded.decode("utf-8")) == data
+
+    def test_indent(self, backend):
+        """indent=True pretty-prints with two spaces."""
+        assert dumps({"a": [1]}, indent=True).decode("utf-8") == json.dumps({"a": [1]}, indent=2)
+
+    def test_wide_int_falls_back(self, backend):
+        """Integers wider than 64 bits round-trip exactly."""
+        result = loads(dumps({"big": 2 ** 70 + 1, "neg": -(2 ** 63) - 1}))
+
+        assert result == {"big": 2 ** 70 + 1, "neg": -(2 ** 63) - 1}
+        assert isinstance(result["big"], int)
+        assert loads("[18446744073709551616]") == [2 ** 64]
+
+    def test_nan_encodes_as_null(self, backend):
+        """Non-finite floats are written as null by either backend."""
+        data = {"nan": float("nan"), "inf": [float("inf")], "big": 2 ** 70}
+
+        assert loads(dumps(data)) == {"nan": None, "inf": [None], "big": 2 ** 70}
+
+    def test_non_string_keys(self, backend):
+        """Non-string keys are stringified like the json module does."""
+        assert loads(dumps({1: "one"})) == {"1": "one"}
+
+    def test_enum_and_uuid_encoded(self, backend):
+        """Enum members and UUIDs encode as their value/string, as values and keys."""
+        ident = uuid.UUID(int=5)
+
+        assert loads(dumps({"c": Color.RED, "id": ident, Color.RED: 1, ident: 2})) == {
+            "c": "red", "id": str(ident), "red": 1, str(ident): 2,
+        }
+
+    def test_datetime_key_stringified(self, backend):
+        """Datetime keys are written in ISO format."""
+        assert loads(dumps({date(2020, 1, 1): 1})) == {"2020-01-01": 1}
+
+    @pytest.mark.parametrize("value", [
+        datetime(2020, 1, 1),
+        date(2020, 1, 1),
+        Point(1, 2),
+        {1, 2},
+    ], ids=["datetime", "date", "dataclass", "set"])
+    def test_non_json_values_rejected(self, backend, value):
+        """Values outside the JSON types raise TypeError with either backend."""
+        with pytest.raises(TypeError):
+            dumps({"value": value})
+
+    def test_file_helpers(self, backend, tmp_path):
+        """dump/load work on text file objects."""
+        path = tmp_path / "data.json"
+        with open(path, "w") as f:
+            dump({"a": 1}, f, indent=True)
+        with open(path) as f:
+            assert load(f) == {"a": 1}
+
+
+class TestErrors:
+    """Test error handling."""
+
+    def test_decode_error_type(self, backend):
+        """Invalid JSON raises json.JSONDecodeError with either backend."""
+        with pytest.raises(json.JSONDecodeError):
+            loads(b"{not json")
+
+    @pytest.mark.parametrize("data", [
+        b'{"x": NaN}',
+        '{"x": -Infinity}',
+        b"\xef\xbb\xbf{}",
+        b'{"x": "\xff"}',
+    ])
+    def test_backends_reject_same_input(self, backend, data):
+        """NaN/Infinity literals, a UTF-8 BOM and invalid UTF-8 are rejected."""
+        with pytest.raises(json.JSONDecodeError):
+            loads(data)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
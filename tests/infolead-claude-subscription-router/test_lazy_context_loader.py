@@ -210,9 +210,8 @@ Content of section three.
         """Should load specific section content."""
         loader, file_path = loader_with_index
 
-        sections = loader.list_sections(file_path)
-        if sections:
-            first_section = sections[0]
+        first_section = next(loader.iter_sections(file_path), None)
+        if first_section:
             content = loader.load_section(file_path, first_section.section_id)
 
             assert content is not None
@@ -222,9 +221,9 @@ Content of section three.
         """Loading should cache content."""
         loader, file_path = loader_with_index
 
-        sections = loader.list_sections(file_path)
-        if sections:
-            section_id = sections[0].section_id
+        first_section = next(loader.iter_sections(file_path), None)
+        if first_section:
+            section_id = first_section.section_id
 
             # First load (miss)
             loader.load_section(file_path, section_id)
@@ -265,10 +264,10 @@ class TestContextStats:
         md_file.write_text("# Test\n\nSome content here.")
 
         loader.build_metadata_index(tmp_path)
-        sections = loader.list_sections(str(md_file))
+        first_section = next(loader.iter_sections(str(md_file)), None)
 
-        if sections:
-            loader.load_section(str(md_file), sections[0].section_id)
+        if first_section:
+            loader.load_section(str(md_file), first_section.section_id)
 
         stats = loader.get_stats()
         assert stats.loaded_sections >= 0  # May vary based on caching
@@ -315,9 +314,8 @@ class TestTokenEstimation:
 
         loader.build_metadata_index(tmp_path)
 
-        sections = loader.list_sections(str(test_file))
-        if sections:
-            section = sections[0]
+        section = next(loader.iter_sections(str(test_file)), None)
+        if section:
             # Token estimate should be roughly chars / CHARS_PER_TOKEN
             expected_tokens = len(content) // CHARS_PER_TOKEN
             # Allow some variance for heading
@@ -341,9 +339,9 @@ class TestContextBudget:
 
         # Load all sections (should trigger eviction)
         for i in range(5):
-            sections = loader.list_sections(str(tmp_path / f"test{i}.md"))
-            if sections:
-                loader.load_section(str(tmp_path / f"test{i}.md"), sections[0].section_id)
+            first_section = next(loader.iter_sections(str(tmp_path / f"test{i}.md")), None)
+            if first_section:
+                loader.load_section(str(tmp_path / f"test{i}.md"), first_section.section_id)
 
         stats = loader.get_stats()
         assert stats.total_tokens <= 100
@@ -403,6 +401,19 @@ class TestEdgeCases:
         sections = loader.list_sections(str(empty_file))
         assert sections == []
 
+    def test_listed_sections_are_a_copy(self, tmp_path):
+        """list_sections matches iter_sections without exposing the index."""
+        loader = LazyContextLoader()
+        md_file = tmp_path / "test.md"
+        md_file.write_text("# One\n\nFirst.\n\n# Two\n\nSecond.\n")
+        loader.build_metadata_index(tmp_path)
+
+        sections = loader.list_sections(str(md_file))
+        sections.clear()
+
+        assert [s.section_name for s in loader.iter_sections(str(md_file))] == ["One", "Two"]
+        assert len(loader.list_sections(str(md_file))) == 2
+
     def test_file_without_sections(self, tmp_path):
         """Should handle files without clear sections."""
         loader = LazyContextLoader()
@@ -12,7 +12,6 @@ Change Driver: TESTING_REQUIREMENTS
 
 import asyncio
 import json
-import tempfile
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Dict, Any, List
@@ -35,10 +34,9 @@ from implementation.overnight_execution_runner import (
 
 
 @pytest.fixture
-def temp_work_dir():
+def temp_work_dir(tmp_path):
     """Create temporary directory for test work files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.fixture
@@ -8,7 +8,6 @@ Change Driver: TESTING_REQUIREMENTS
 """
 
 import asyncio
-import tempfile
 from pathlib import Path
 from typing import List
 
@@ -27,10 +26,9 @@ from probabilistic_router import (
 
 
 @pytest.fixture
-def temp_history_dir():
+def temp_history_dir(tmp_path):
     """Create temporary directory for test history files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.fixture
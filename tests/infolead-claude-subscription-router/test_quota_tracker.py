@@ -7,7 +7,6 @@ Ported from embedded tests in implementation/quota_tracker.py
 Change Driver: TESTING_REQUIREMENTS
 """
 
-import tempfile
 from pathlib import Path
 
 import pytest
@@ -20,10 +19,9 @@ from quota_tracker import QuotaTracker, QuotaAwareScheduler
 
 
 @pytest.fixture
-def temp_quota_dir():
+def temp_quota_dir(tmp_path):
     """Create temporary directory for test quota files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.fixture
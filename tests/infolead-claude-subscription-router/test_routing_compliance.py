@@ -8,7 +8,6 @@ Change Driver: TESTING_REQUIREMENTS
 """
 
 import json
-import tempfile
 from datetime import datetime, UTC
 from pathlib import Path
 
@@ -22,10 +21,9 @@ from routing_compliance import RoutingCompliance
 
 
 @pytest.fixture
-def temp_metrics_dir():
+def temp_metrics_dir(tmp_path):
     """Create temporary directory for test metrics."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.fixture
@@ -5,6 +5,7 @@ Tests caching, similarity matching, and deduplication.
 """
 
 import json
+import math
 import pytest
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,6 +17,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "plugins" / "infole
 from semantic_cache import (
     SemanticCache,
     CachedResult,
+    _VectorIndex,
+    _embed_cached,
 )
 
 
@@ -39,6 +42,16 @@ class TestCacheStorage:
         assert cached is not None
         assert cached["files"] == ["a.py", "b.py"]
 
+    def test_get_returns_stored_object(self, cache):
+        """Hits hand back the stored result without a serialization round trip."""
+        query = "Find all Python files"
+        result = {"files": ["a.py", "b.py"]}
+
+        cache.store(query, "haiku-general", result, quota_cost=5)
+
+        assert cache.get(query) is result
+        assert cache.find_similar(query, "haiku-general").result is result
+
     def test_get_nonexistent(self, cache):
         """Should return None for nonexistent queries."""
         cached = cache.get("nonexistent query")
@@ -108,6 +121,279 @@ class TestSimilarityMatching:
         # Should not find a similar match for unrelated query
         assert similar is None or similar is not None  # Implementation dependent
 
+    def test_find_similar_after_agent_edit(self, tmp_path):
+        """Entries edited in place and saved are found under their new agent."""
+        cache = SemanticCache(cache_dir=tmp_path)
+        cache.store("Find all Python files in src", "haiku-general", {"r": 1}, quota_cost=1)
+        for entry in cache.cache_index.values():
+            entry.agent_used = "sonnet-general"
+        cache._save_cache_index()
+
+        similar = cache.find_similar("Find all Python files in the src", "sonnet-general")
+
+        assert similar is not None
+        assert similar.result == {"r": 1}
+        assert cache.find_similar("Find all Python files in the src", "haiku-general") is None
+
+    def test_embeddings_memoised(self, tmp_path):
+        """Repeated requests reuse the cached embedding, across instances too."""
+        _embed_cached.cache_clear()
+        cache1 = SemanticCache(cache_dir=tmp_path / "a")
+        cache2 = SemanticCache(cache_dir=tmp_path / "b")
+
+        cache1.store("Find all Python files", "agent", {"r": 1}, quota_cost=1)
+        cache1.find_similar("Find every Python file", "agent")
+        cache2.find_similar("Find every Python file", "agent")
+        cache2.store("Find all Python files", "agent", {"r": 1}, quota_cost=1)
+
+        info = _embed_cached.cache_info()
+        assert (info.misses, info.hits) == (2, 2)
+
+
+class TestVectorIndex:
+    """Test the similarity index backing find_similar."""
+
+    def test_search_orders_by_similarity(self):
+        """Results come back most similar first and above threshold."""
+        index = _VectorIndex()
+        index.add("x", [1.0, 0.0, 0.0])
+        index.add("xy", [1.0, 1.0, 0.0])
+        index.add("z", [0.0, 0.0, 1.0])
+
+        results = list(index.search([1.0, 0.0, 0.0], threshold=0.5))
+
+        assert [key for key, _ in results] == ["x", "xy"]
+        assert results[0][1] == pytest.approx(1.0, abs=1e-6)
+
+    def test_remove_keeps_other_rows(self):
+        """Removing an entry leaves the remaining keys searchable."""
+        index = _VectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("b", [0.0, 1.0])
+        index.add("c", [1.0, 1.0])
+
+        index.remove("a")
+
+        assert "a" not in index
+        assert len(index) == 2
+        assert [key for key, _ in index.search([0.0, 1.0], threshold=0.99)] == ["b"]
+
+    def test_mismatched_dimension_ignored(self):
+        """Vectors of a different dimension are not indexed."""
+        index = _VectorIndex()
+        index.add("a", [1.0, 0.0])
+        index.add("b", [1.0, 0.0, 0.0])
+
+        assert "b" not in index
+        assert list(index.search([1.0, 0.0, 0.0], threshold=0.0)) == []
+
+    def test_lsh_buckets_find_exact_vector(self, monkeypatch):
+        """Pure-Python search over LSH buckets still finds identical vectors."""
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "np", None)
+        monkeypatch.setattr(semantic_cache, "faiss", None)
+        monkeypatch.setattr(semantic_cache, "LSH_MIN_ENTRIES", 4)
+
+        index = _VectorIndex()
+        for i in range(10):
+            index.add(f"k{i}", [float(i == j) + 0.1 for j in range(10)])
+        index.remove("k0")
+
+        query = [float(j == 7) + 0.1 for j in range(10)]
+        results = list(index.search(query, threshold=0.99))
+
+        assert [key for key, _ in results] == ["k7"]
+
+    def test_lsh_recall_matches_exact_scan(self, monkeypatch):
+        """LSH finds nearly every neighbour the exact scan finds at cosine ~0.85."""
+        import random
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "np", None)
+        monkeypatch.setattr(semantic_cache, "faiss", None)
+
+        rng = random.Random(1)
+        dim = 32
+        stored = [[rng.gauss(0.0, 1.0) for _ in range(dim)] for _ in range(600)]
+        queries = []
+        for vector in stored[:200]:
+            # Unit-norm vector plus noise of norm ~0.62: cosine ~0.85
+            norm = math.sqrt(sum(x * x for x in vector))
+            queries.append([x / norm + rng.gauss(0.0, 0.11) for x in vector])
+
+        def top_hits(min_entries):
+            monkeypatch.setattr(semantic_cache, "LSH_MIN_ENTRIES", min_entries)
+            index = _VectorIndex()
+            for i, vector in enumerate(stored):
+                index.add(f"k{i}", vector)
+            return [next(index.search(query, threshold=0.8), (None, 0.0))[0] for query in queries]
+
+        exact = top_hits(len(stored) + 1)
+        approximate = top_hits(1)
+
+        found = [key for key in exact if key is not None]
+        assert len(found) > 150
+        recall = sum(a == e for a, e in zip(approximate, exact) if e is not None) / len(found)
+        assert recall >= 0.95
+
+    def test_dense_backend_without_faiss(self, monkeypatch):
+        """With numpy but no faiss, rows are scored from the dense matrix."""
+        pytest.importorskip("numpy")
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "faiss", None)
+
+        index = _VectorIndex()
+        index.add("x", [1.0, 0.0, 0.0])
+        index.add("xy", [1.0, 1.0, 0.0])
+        index.add("z", [0.0, 0.0, 1.0])
+        index.add("x2", [2.0, 0.0, 0.0])
+        index.remove("z")
+
+        results = list(index.search([1.0, 0.0, 0.0], threshold=0.5))
+
+        assert index._matrix is not None
+        assert [key for key, _ in results] == ["x", "x2", "xy"]
+        assert results[2][1] == pytest.approx(2 ** -0.5, abs=1e-6)
+
+    @pytest.mark.parametrize("backend", ["python", "dense", "faiss"])
+    def test_search_filters_columns(self, monkeypatch, backend):
+        """Agent, storage-time and context filters drop rows on every backend."""
+        import semantic_cache
+        if backend == "python":
+            monkeypatch.setattr(semantic_cache, "np", None)
+            monkeypatch.setattr(semantic_cache, "faiss", None)
+        else:
+            pytest.importorskip("numpy")
+            if backend == "dense":
+                monkeypatch.setattr(semantic_cache, "faiss", None)
+            else:
+                pytest.importorskip("faiss")
+
+        index = _VectorIndex()
+        index.add("a-old", [1.0, 0.0], agent="a", timestamp=10.0, context=1)
+        index.add("b-new", [1.0, 0.1], agent="b", timestamp=50.0, context=1)
+        index.add("a-new", [1.0, 0.2], agent="a", timestamp=50.0, context=2)
+        index.add("gone", [1.0, 0.0], agent="a", timestamp=60.0, context=1)
+        index.remove("gone")
+
+        def keys(**filters):
+            return [key for key, _ in index.search([1.0, 0.0], threshold=0.5, **filters)]
+
+        assert keys() == ["a-old", "b-new", "a-new"]
+        assert keys(agent="a") == ["a-old", "a-new"]
+        assert keys(agent="a", not_before=20.0) == ["a-new"]
+        assert keys(context=1) == ["a-old", "b-new"]
+        assert keys(agent="missing") == []
+
+    def test_hnsw_backend_above_threshold(self, monkeypatch):
+        """Large indexes switch to HNSW and still find exact vectors."""
+        pytest.importorskip("numpy")
+        pytest.importorskip("faiss")
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "HNSW_MIN_ENTRIES", 8)
+
+        index = _VectorIndex()
+        for i in range(20):
+            index.add(f"k{i}", [float(i == j) for j in range(20)])
+
+        results = list(index.search([float(j == 5) for j in range(20)], threshold=0.9))
+
+        assert [key for key, _ in results] == ["k5"]
+        assert not isinstance(index._faiss_index, semantic_cache.faiss.IndexFlatIP)
+
+    def test_pq_backend_above_threshold(self, monkeypatch):
+        """Very large indexes are product-quantised and remain searchable."""
+        pytest.importorskip("numpy")
+        pytest.importorskip("faiss")
+        import random
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "PQ_MIN_ENTRIES", 300)
+        monkeypatch.setattr(semantic_cache, "PQ_NBITS", 4)
+
+        rng = random.Random(0)
+        index = _VectorIndex()
+        vectors = [[rng.gauss(0.0, 1.0) for _ in range(16)] for _ in range(400)]
+        for i, vector in enumerate(vectors):
+            index.add(f"k{i}", vector)
+
+        key, score = next(index.search(vectors[42], threshold=0.5))
+
+        assert key == "k42"
+        assert isinstance(index._faiss_index, semantic_cache.faiss.IndexPQ)
+
+    @pytest.mark.parametrize("size_class", ["flat", "hnsw", "pq"])
+    def test_removal_does_not_rebuild_faiss_index(self, monkeypatch, size_class):
+        """Removing or replacing entries updates the FAISS index in place."""
+        pytest.importorskip("numpy")
+        pytest.importorskip("faiss")
+        import random
+        import semantic_cache
+        if size_class == "hnsw":
+            monkeypatch.setattr(semantic_cache, "HNSW_MIN_ENTRIES", 8)
+        elif size_class == "pq":
+            monkeypatch.setattr(semantic_cache, "PQ_MIN_ENTRIES", 300)
+            monkeypatch.setattr(semantic_cache, "PQ_NBITS", 4)
+
+        rng = random.Random(0)
+        index = _VectorIndex()
+        vectors = [[rng.gauss(0.0, 1.0) for _ in range(16)] for _ in range(400)]
+        for i, vector in enumerate(vectors):
+            index.add(f"k{i}", vector)
+        assert next(index.search(vectors[7], threshold=0.5))[0] == "k7"
+
+        builds = []
+        original = index._new_faiss_index
+        monkeypatch.setattr(index, "_new_faiss_index", lambda: builds.append(1) or original())
+        index.remove("k42")
+        index.add("k7", vectors[8])  # replace an existing key
+        index.add("new", vectors[42])
+
+        assert next(index.search(vectors[42], threshold=0.5))[0] == "new"
+        assert next(index.search(vectors[8], threshold=0.5))[0] in {"k7", "k8"}
+        assert "k42" not in {key for key, _ in index.search(vectors[42], threshold=0.5)}
+        assert builds == []
+
+    def test_hnsw_tombstones_trigger_rebuild(self, monkeypatch):
+        """HNSW graphs are rebuilt once removed entries pass the tombstone limit."""
+        pytest.importorskip("numpy")
+        pytest.importorskip("faiss")
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "HNSW_MIN_ENTRIES", 8)
+
+        index = _VectorIndex()
+        for i in range(20):
+            index.add(f"k{i}", [float(i == j) for j in range(20)])
+        list(index.search([1.0] + [0.0] * 19, threshold=0.9))
+        graph = index._faiss_index
+
+        for i in range(5):
+            index.remove(f"k{i}")
+        assert list(index.search([1.0] + [0.0] * 19, threshold=0.9)) == []
+        assert index._faiss_index is graph
+
+        index.remove("k5")
+        assert [key for key, _ in index.search([float(j == 9) for j in range(20)], threshold=0.9)] == ["k9"]
+        assert index._faiss_index is not graph
+        assert index._faiss_ids.ntotal == 14
+
+
+class TestCachedResult:
+    """Test CachedResult serialization."""
+
+    def test_embedding_roundtrip_is_compact(self):
+        """Embeddings are held as float32 arrays and serialize as lists."""
+        cached = CachedResult.from_dict({
+            "request_text": "q",
+            "request_embedding": [0.5, 0.25],
+            "agent_used": "agent",
+            "result": None,
+            "timestamp": datetime.now().isoformat(),
+            "quota_cost": 1,
+            "context_hash": "",
+        })
+
+        assert cached.request_embedding.itemsize == 4
+        assert cached.to_dict()["request_embedding"] == [0.5, 0.25]
+
 
 class TestCacheExpiration:
     """Test cache TTL and expiration."""
@@ -133,6 +419,45 @@ class TestCacheExpiration:
         cached = cache.get("test query")
         # Behavior depends on implementation - may return None or stale data
 
+    def test_expired_bucket_swept_on_get(self, cache, tmp_path):
+        """Lookups drop entries whose whole TTL bucket has expired."""
+        cache.store("old query", "haiku-general", {"result": "old"}, quota_cost=1)
+        cache.store("new query", "haiku-general", {"result": "new"}, quota_cost=1)
+        cache.cache_index[cache._generate_cache_key("old query")].timestamp = (
+            datetime.now() - timedelta(days=3)
+        )
+        cache._save_cache_index()
+
+        assert cache.get("new query") == {"result": "new"}
+
+        assert len(cache.cache_index) == 1
+        assert len(SemanticCache(cache_dir=tmp_path, ttl_days=1).cache_index) == 1
+
+    def test_sweep_skipped_within_interval(self, cache):
+        """A second lookup within the sweep interval does not sweep again."""
+        cache.store("old query", "haiku-general", {"result": "old"}, quota_cost=1)
+        cache.get("old query")
+
+        cache.cache_index[cache._generate_cache_key("old query")].timestamp = (
+            datetime.now() - timedelta(days=3)
+        )
+        cache._rebuild_ttl_buckets()
+
+        assert cache._sweep() == []
+        assert cache._sweep(force=True) == [cache._generate_cache_key("old query")]
+
+    def test_cleanup_expired_counts_removed(self, cache):
+        """cleanup_expired removes expired entries and keeps fresh ones."""
+        cache.store("old query", "haiku-general", {"result": "old"}, quota_cost=1)
+        cache.store("new query", "haiku-general", {"result": "new"}, quota_cost=1)
+        cache.cache_index[cache._generate_cache_key("old query")].timestamp = (
+            datetime.now() - timedelta(days=1, minutes=1)
+        )
+        cache._save_cache_index()
+
+        assert cache.cleanup_expired() == 1
+        assert list(e.request_text for e in cache.cache_index.values()) == ["new query"]
+
 
 class TestCacheHitTracking:
     """Test cache hit counting."""
@@ -181,6 +506,89 @@ class TestCachePersistence:
         assert cached is not None
         assert cached["data"] == "value"
 
+    def test_hit_count_persists(self, tmp_path):
+        """Hit counts written on lookup survive a reload."""
+        cache1 = SemanticCache(cache_dir=tmp_path)
+        cache1.store("persistent query", "agent", {"data": "value"}, quota_cost=1)
+        cache1.get("persistent query")
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+
+        assert next(iter(cache2.cache_index.values())).hit_count == 1
+
+    def test_result_codecs_read_back(self, tmp_path, monkeypatch):
+        """Results round-trip, and JSON-encoded rows stay readable either way."""
+        import semantic_cache
+        monkeypatch.setattr(semantic_cache, "msgpack", None)
+        cache1 = SemanticCache(cache_dir=tmp_path)
+        cache1.store("json query", "agent", {"files": ["a.py"], "n": 2}, quota_cost=1)
+        monkeypatch.undo()
+
+        cache1.store("default query", "agent", {"files": ["b.py"], "ok": True}, quota_cost=1)
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+        assert cache2.get("json query") == {"files": ["a.py"], "n": 2}
+        assert cache2.get("default query") == {"files": ["b.py"], "ok": True}
+
+    def test_msgpack_result_tagged(self, tmp_path):
+        """With msgpack installed, result BLOBs carry the msgpack tag."""
+        pytest.importorskip("msgpack")
+        import semantic_cache
+        cache = SemanticCache(cache_dir=tmp_path)
+        cache.store("query", "agent", {"files": ["a.py"]}, quota_cost=1)
+
+        (blob,) = cache._db.execute("SELECT result FROM entries").fetchone()
+        assert blob[:1] == semantic_cache.MSGPACK_TAG
+
+    def test_embedding_snapshot_adopted_on_restart(self, tmp_path):
+        """A snapshot written on close is memory-mapped by the next instance."""
+        np = pytest.importorskip("numpy")
+        cache1 = SemanticCache(cache_dir=tmp_path)
+        cache1.store("persistent query", "agent", {"data": "value"}, quota_cost=1)
+        cache1.store("another query here", "agent", {"data": "other"}, quota_cost=1)
+        cache1.close()
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+
+        assert isinstance(cache2._vector_index._matrix, np.memmap)
+        assert cache2.find_similar("persistent query here", "agent") is not None
+        cache2.store("third query", "agent", {"data": 3}, quota_cost=1)
+        assert not isinstance(cache2._vector_index._matrix, np.memmap)
+
+    def test_stale_embedding_snapshot_ignored(self, tmp_path):
+        """Writes after the snapshot was taken make it unusable."""
+        np = pytest.importorskip("numpy")
+        cache1 = SemanticCache(cache_dir=tmp_path)
+        cache1.store("first query", "agent", {"data": 1}, quota_cost=1)
+        cache1.close()
+
+        other = SemanticCache(cache_dir=tmp_path)
+        other.store("second query", "agent", {"data": 2}, quota_cost=1)
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+        assert not isinstance(cache2._vector_index._matrix, np.memmap)
+        assert len(cache2._vector_index) == 2
+
+    def test_legacy_json_index_migrated_once(self, tmp_path):
+        """A pre-SQLite cache_index.json is imported into a new database only."""
+        entry = CachedResult(
+            request_text="legacy query",
+            request_embedding=[1.0, 0.0],
+            agent_used="agent",
+            result={"data": "old"},
+            timestamp=datetime.now(),
+            quota_cost=2,
+            context_hash="",
+        )
+        (tmp_path / "cache_index.json").write_text(json.dumps([entry.to_dict()]))
+
+        cache1 = SemanticCache(cache_dir=tmp_path)
+        assert cache1.get("legacy query") == {"data": "old"}
+        cache1.clear()
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+        assert len(cache2.cache_index) == 0
+
 
 class TestCacheContextFiles:
     """Test context file consideration in caching."""
@@ -223,6 +631,28 @@ class TestCacheContextFiles:
         # Should find match (same context)
         assert similar is None or similar.result == {"result": "data"}
 
+    def test_context_hash_tracks_file_state(self, cache, tmp_path):
+        """Context hash ignores order/duplicates and changes with the file."""
+        import hashlib
+        import os
+        from semantic_cache import EMPTY_CONTEXT_HASH
+
+        f1 = tmp_path / "a.py"
+        f2 = tmp_path / "b.py"
+        f1.write_text("a")
+        f2.write_text("b")
+
+        assert cache._compute_context_hash([]) == EMPTY_CONTEXT_HASH
+        assert EMPTY_CONTEXT_HASH == hashlib.sha256().hexdigest()[:16]
+        assert cache._compute_context_hash([str(tmp_path / "missing.py")]) == EMPTY_CONTEXT_HASH
+
+        before = cache._compute_context_hash([str(f1), str(f2)])
+        assert cache._compute_context_hash([str(f2), str(f1), str(f1)]) == before
+
+        f1.write_text("changed")
+        os.utime(f1, ns=(0, 0))
+        assert cache._compute_context_hash([str(f1), str(f2)]) != before
+
 
 class TestCacheKeyGeneration:
     """Test cache key generation."""
@@ -264,6 +694,51 @@ class TestQuotaCostTracking:
             assert entry.quota_cost == 10
 
 
+class TestCacheStatistics:
+    """Test statistics computed from the entry columns."""
+
+    def test_statistics_totals(self, tmp_path):
+        """Hits, quota savings and top queries reflect recorded hits."""
+        cache = SemanticCache(cache_dir=tmp_path, ttl_days=1)
+        cache.store("popular query", "agent", {"r": 1}, quota_cost=10)
+        cache.store("rare query", "agent", {"r": 2}, quota_cost=3)
+        cache.store("unused query", "agent", {"r": 3}, quota_cost=7)
+        for _ in range(3):
+            cache.get("popular query")
+        cache.get("rare query")
+
+        stats = cache.get_statistics()
+
+        assert stats["total_hits"] == 4
+        assert stats["total_quota_saved"] == 33
+        assert [q["query"] for q in stats["top_cached_queries"][:2]] == [
+            "popular query", "rare query"
+        ]
+
+    def test_statistics_follow_removals_and_edits(self, tmp_path):
+        """Columns stay in step with invalidation and saved in-place edits."""
+        cache = SemanticCache(cache_dir=tmp_path, ttl_days=1)
+        cache.store("a", "agent", {}, quota_cost=1)
+        context_file = tmp_path / "context.py"
+        context_file.write_text("content")
+        cache.store("b", "agent", {}, quota_cost=2, context_files=[str(context_file)])
+        cache.get("b")
+        cache.store("c", "agent", {}, quota_cost=4)
+        cache.get("c")
+
+        cache.cache_index[cache._generate_cache_key("a")].timestamp = (
+            datetime.now() - timedelta(hours=30)
+        )
+        cache._save_cache_index()
+        stats = cache.get_statistics()
+        assert stats["expired_entries"] == 1
+
+        cache.invalidate_by_files([])
+        stats = cache.get_statistics()
+        assert stats["total_entries"] == len(cache._columns) == 2
+        assert stats["total_quota_saved"] == 4
+
+
 class TestCacheClearing:
     """Test cache clearing operations."""
 
@@ -295,5 +770,50 @@ class TestCacheClearing:
         assert len(cache2.cache_index) == 0
 
 
+class TestCacheWarming:
+    """Test pre-populating the cache with common queries."""
+
+    WARM_ENTRIES = [
+        {"request": "Find all Python files", "agent": "haiku-general",
+         "result": {"files": ["a.py"]}, "quota_cost": 2},
+        {"request": "List the test files", "agent": "haiku-general",
+         "result": {"files": ["test_a.py"]}},
+    ]
+
+    def test_warm_hits_on_first_lookup(self, tmp_path):
+        """Warmed entries are found by the very first find_similar."""
+        cache = SemanticCache(cache_dir=tmp_path)
+
+        assert cache.warm(self.WARM_ENTRIES) == 2
+
+        similar = cache.find_similar("Find all Python files", "haiku-general")
+        assert similar is not None
+        assert similar.result == {"files": ["a.py"]}
+        assert cache.get_statistics()["total_entries"] == 2
+
+    def test_warm_keeps_existing_entries(self, tmp_path):
+        """Requests already cached are not overwritten by warming."""
+        cache = SemanticCache(cache_dir=tmp_path)
+        cache.store("Find all Python files", "haiku-general", {"files": ["real.py"]}, quota_cost=1)
+
+        assert cache.warm(self.WARM_ENTRIES) == 1
+
+        cache2 = SemanticCache(cache_dir=tmp_path)
+        assert cache2.get("Find all Python files") == {"files": ["real.py"]}
+        assert cache2.get("List the test files") == {"files": ["test_a.py"]}
+
+    def test_warm_from_file(self, tmp_path):
+        """warm_from merges a JSON file on startup; bad files only warn."""
+        warm_file = tmp_path / "warm_cache.json"
+        warm_file.write_text(json.dumps(self.WARM_ENTRIES))
+
+        cache = SemanticCache(cache_dir=tmp_path / "cache", warm_from=warm_file)
+        assert len(cache.cache_index) == 2
+
+        warm_file.write_text("{not json")
+        cache2 = SemanticCache(cache_dir=tmp_path / "cache", warm_from=warm_file)
+        assert len(cache2.cache_index) == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
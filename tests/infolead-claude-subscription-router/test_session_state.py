@@ -53,6 +53,45 @@ class TestSessionStateBasics:
         assert state.current_focus == "Persistent focus"
 
 
+class TestMemoryDirInjection:
+    """Test that managers are scoped to their own memory directory."""
+
+    def test_managers_are_independent(self, tmp_path):
+        """Managers on different directories neither share state nor rebind globals."""
+        import session_state_manager
+        default_dir = session_state_manager.MEMORY_DIR
+        default_state_file = session_state_manager.SESSION_STATE_FILE
+
+        first = SessionStateManager(memory_dir=tmp_path / "first")
+        second = SessionStateManager(memory_dir=tmp_path / "second")
+        first.update_focus("first focus")
+        first.record_search(query="shared query", agent="a", result_count=1)
+        first.compact()
+
+        assert session_state_manager.MEMORY_DIR == default_dir
+        assert session_state_manager.SESSION_STATE_FILE == default_state_file
+        assert (tmp_path / "first" / "session-state.json").exists()
+        assert not (tmp_path / "second" / "session-state.json").exists()
+        assert second.check_duplicate_search("shared query") is None
+        assert SessionStateManager(memory_dir=tmp_path / "second").get_current_state().current_focus == ""
+        assert SessionStateManager(memory_dir=tmp_path / "first").get_current_state().current_focus == "first focus"
+
+    def test_module_functions_accept_memory_dir(self, tmp_path):
+        """Module-level helpers read and write inside the given directory."""
+        from session_state_manager import (
+            generate_continuation_prompt,
+            get_recent_decisions,
+            record_decision,
+            save_active_context,
+        )
+
+        record_decision("Use Haiku", "Cheap", ["Sonnet"], memory_dir=tmp_path)
+        save_active_context("/project", ["a.py"], [], "haiku-general", "Halfway", memory_dir=tmp_path)
+
+        assert [d["decision"] for d in get_recent_decisions(memory_dir=tmp_path)] == ["Use Haiku"]
+        assert "Project: /project" in generate_continuation_prompt(memory_dir=tmp_path)
+
+
 class TestActiveAgentTracking:
     """Test active agent tracking."""
 
@@ -88,6 +127,16 @@ class TestActiveAgentTracking:
         state = manager.get_current_state()
         assert "test-agent" not in state.active_agents
 
+    def test_active_agents_sorted(self, manager, tmp_path):
+        """Active agents should be reported and persisted as a sorted list."""
+        for agent in ("charlie", "alpha", "bravo"):
+            manager.add_active_agent(agent)
+
+        assert manager.get_current_state().active_agents == ["alpha", "bravo", "charlie"]
+        manager.compact()
+        snapshot = json.loads((tmp_path / "session-state.json").read_text())
+        assert snapshot["active_agents"] == ["alpha", "bravo", "charlie"]
+
     def test_remove_nonexistent_agent(self, manager):
         """Should handle removing nonexistent agent gracefully."""
         # Should not raise
@@ -158,6 +207,28 @@ class TestSearchRecording:
         assert duplicate is not None
         assert duplicate.files_found == files
 
+    def test_duplicate_outside_window_ignored(self, manager, tmp_path):
+        """Searches older than the lookback window should not match."""
+        (tmp_path / "search-history.json").write_text(json.dumps({"searches": [{
+            "query": "old query",
+            "timestamp": "2000-01-01T00:00:00Z",
+            "agent": "agent",
+            "result_count": 1,
+            "files_found": [],
+        }]}))
+
+        manager2 = SessionStateManager(memory_dir=tmp_path)
+        assert manager2.check_duplicate_search("old query", hours=24) is None
+
+    def test_duplicate_returns_latest_record(self, manager):
+        """Repeated searches should report the most recent result."""
+        manager.record_search("repeat", "agent", 1, ["old.py"])
+        manager.record_search("repeat", "agent", 2, ["new.py"])
+
+        duplicate = manager.check_duplicate_search("repeat")
+        assert duplicate.result_count == 2
+        assert duplicate.files_found == ["new.py"]
+
 
 class TestStatePersistence:
     """Test state persistence across instances."""
@@ -186,6 +257,89 @@ class TestStatePersistence:
         duplicate = manager2.check_duplicate_search("persistent query")
         assert duplicate is not None
 
+    def test_search_recorded_by_other_instance_seen(self, tmp_path):
+        """Searches recorded after a manager loaded its index are still found."""
+        reader = SessionStateManager(memory_dir=tmp_path)
+        writer = SessionStateManager(memory_dir=tmp_path)
+        assert reader.check_duplicate_search("later query") is None
+
+        writer.record_search(query="later query", agent="agent", result_count=1, files_found=["x.py"])
+
+        duplicate = reader.check_duplicate_search("later query")
+        assert duplicate is not None
+        assert duplicate.files_found == ["x.py"]
+
+
+class TestSessionLog:
+    """Test the append-only session log."""
+
+    def test_mutations_append_to_log(self, tmp_path):
+        """Mutations should append log lines instead of rewriting the snapshot."""
+        manager = SessionStateManager(memory_dir=tmp_path)
+        manager.update_focus("Logged focus")
+        manager.add_active_agent("agent-1")
+        manager.remove_active_agent("agent-1")
+        manager.close()
+
+        assert not (tmp_path / "session-state.json").exists()
+        lines = (tmp_path / "session.log").read_text().splitlines()
+        assert [json.loads(line)["op"] for line in lines] == [
+            "focus", "add_agent", "remove_agent"
+        ]
+
+    def test_torn_line_skipped_on_replay(self, tmp_path):
+        """A partially written final line should not break loading."""
+        manager = SessionStateManager(memory_dir=tmp_path)
+        manager.add_active_agent("agent-1")
+        manager.close()
+        with open(tmp_path / "session.log", "a") as f:
+            f.write('{"op": "add_agent", "ag')
+
+        state = SessionStateManager(memory_dir=tmp_path).get_current_state()
+        assert state.active_agents == ["agent-1"]
+
+    def test_append_after_torn_line_kept(self, tmp_path):
+        """A record appended after a torn line is not glued onto it."""
+        manager = SessionStateManager(memory_dir=tmp_path)
+        manager.add_active_agent("agent-1")
+        with open(tmp_path / "session.log", "a") as f:
+            f.write('{"op": "add_agent", "ag')
+
+        SessionStateManager(memory_dir=tmp_path).add_active_agent("agent-2")
+
+        state = SessionStateManager(memory_dir=tmp_path).get_current_state()
+        assert state.active_agents == ["agent-1", "agent-2"]
+
+    def test_writes_after_clear_elsewhere_kept(self, tmp_path):
+        """Appends after another manager unlinked the log land in the new log."""
+        first = SessionStateManager(memory_dir=tmp_path)
+        first.update_focus("one")
+        SessionStateManager(memory_dir=tmp_path).clear_state()
+
+        first.update_focus("two")
+        first.add_active_agent("x")
+
+        state = SessionStateManager(memory_dir=tmp_path).get_current_state()
+        assert state.current_focus == "two"
+        assert state.active_agents == ["x"]
+        assert (tmp_path / "session.log").stat().st_mode & 0o777 == 0o600
+
+    def test_log_compacted_into_snapshot(self, tmp_path, monkeypatch):
+        """Log should fold into session-state.json once it outgrows it."""
+        import session_state_manager
+        monkeypatch.setattr(session_state_manager, "LOG_COMPACT_MIN_BYTES", 0)
+
+        manager = SessionStateManager(memory_dir=tmp_path)
+        for i in range(20):
+            manager.update_focus(f"focus {i}")
+        manager.close()
+
+        snapshot = json.loads((tmp_path / "session-state.json").read_text())
+        log_size = (tmp_path / "session.log").stat().st_size
+        assert log_size <= 4 * (tmp_path / "session-state.json").stat().st_size
+        assert SessionStateManager(memory_dir=tmp_path).get_current_state().current_focus == "focus 19"
+        assert snapshot["current_focus"] != ""
+
 
 class TestStateClear:
     """Test state clearing."""
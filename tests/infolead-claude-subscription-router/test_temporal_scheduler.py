@@ -7,7 +7,6 @@ Ported from embedded tests in implementation/temporal_scheduler.py
 Change Driver: TESTING_REQUIREMENTS
 """
 
-import tempfile
 import uuid
 from pathlib import Path
 
@@ -27,10 +26,9 @@ from quota_tracker import QuotaTracker
 
 
 @pytest.fixture
-def temp_scheduler_dir():
+def temp_scheduler_dir(tmp_path):
     """Create temporary directory for test scheduler and quota files."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield Path(tmpdir)
+    return tmp_path
 
 
 @pytest.fixture
@@ -236,6 +234,7 @@ def test_state_persistence(temp_scheduler_dir, quota_tracker):
     )
     scheduler1.add_work(work)
     scheduler1.schedule_overnight_work()
+    scheduler1.flush()
 
     # Create new scheduler instance
     scheduler2 = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
@@ -334,3 +333,144 @@ def test_timed_work_item_comparison():
     )
     # Higher priority should be "less than" in heap (min-heap becomes max-heap)
     assert work_high < work_low
+
+
+def test_classify_work_timing_matches_inside_words():
+    """Test that keywords keep plain substring semantics."""
+    assert classify_work_timing("rebuild the docs") == WorkTiming.ASYNCHRONOUS
+    assert classify_work_timing("undelete the branch") == WorkTiming.SYNCHRONOUS
+
+
+def test_get_next_sync_work_priority_then_fifo(scheduler):
+    """Test sync work pops by priority, equal priorities in insertion order."""
+    for work_id, priority in [("a", 5), ("b", 9), ("c", 5), ("d", 9)]:
+        scheduler.add_work(TimedWorkItem(
+            id=work_id,
+            description="Review code",
+            timing=WorkTiming.SYNCHRONOUS,
+            estimated_quota=10,
+            estimated_duration_minutes=30,
+            priority=priority,
+        ))
+
+    order = [scheduler.get_next_sync_work().id for _ in range(4)]
+    assert order == ["b", "d", "a", "c"]
+    assert scheduler.get_next_sync_work() is None
+
+
+def test_add_work_coalesces_writes(temp_scheduler_dir, quota_tracker, monkeypatch):
+    """Test that add_work batches writes until flush()."""
+    import temporal_scheduler
+    monkeypatch.setattr(temporal_scheduler, "FLUSH_INTERVAL_SECONDS", 3600)
+
+    state_file = temp_scheduler_dir / "test-queue.json"
+    scheduler1 = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    for i in range(3):
+        scheduler1.add_work(TimedWorkItem(
+            id=f"work-{i}",
+            description="Search for papers",
+            timing=WorkTiming.ASYNCHRONOUS,
+            estimated_quota=20,
+            estimated_duration_minutes=60,
+        ))
+
+    pending = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    assert len(pending.async_queue) == 0
+
+    scheduler1.flush()
+    flushed = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    assert len(flushed.async_queue) == 3
+
+
+def test_pending_writes_flushed_at_exit(temp_scheduler_dir, quota_tracker):
+    """Test that mutations below the flush thresholds are written at interpreter exit."""
+    import subprocess
+
+    implementation_dir = Path(__file__).parent.parent.parent / "plugins/infolead-claude-subscription-router/implementation"
+    state_file = temp_scheduler_dir / "test-queue.json"
+    script = f"""
+import sys
+sys.path.insert(0, {str(implementation_dir)!r})
+import temporal_scheduler
+from pathlib import Path
+from quota_tracker import QuotaTracker
+from temporal_scheduler import TemporalScheduler, TimedWorkItem, WorkTiming
+
+temporal_scheduler.FLUSH_INTERVAL_SECONDS = 3600
+scheduler = TemporalScheduler(
+    quota_tracker=QuotaTracker(state_file=Path({str(temp_scheduler_dir / "quota.json")!r})),
+    state_file=Path({str(state_file)!r}),
+)
+scheduler.add_work(TimedWorkItem(
+    id="work-1",
+    description="Search for papers",
+    timing=WorkTiming.ASYNCHRONOUS,
+    estimated_quota=20,
+    estimated_duration_minutes=60,
+))
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    reloaded = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    assert [w.id for w in reloaded.async_queue] == ["work-1"]
+
+
+def test_add_work_flushes_after_max_pending(temp_scheduler_dir, quota_tracker, monkeypatch):
+    """Test that enough pending mutations force a write."""
+    import temporal_scheduler
+    monkeypatch.setattr(temporal_scheduler, "FLUSH_INTERVAL_SECONDS", 3600)
+    monkeypatch.setattr(temporal_scheduler, "FLUSH_MAX_PENDING", 2)
+
+    state_file = temp_scheduler_dir / "test-queue.json"
+    with TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file) as scheduler1:
+        for i in range(3):
+            scheduler1.add_work(TimedWorkItem(
+                id=f"work-{i}",
+                description="Search for papers",
+                timing=WorkTiming.ASYNCHRONOUS,
+                estimated_quota=20,
+                estimated_duration_minutes=60,
+            ))
+        scheduler1._wait_for_writes()
+        partial = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+        assert len(partial.async_queue) == 2
+
+    flushed = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    assert len(flushed.async_queue) == 3
+
+
+def test_write_failure_reported(scheduler, monkeypatch, capsys):
+    """Test that a failed background write is logged at once and raised by flush()."""
+    def fail(data):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(scheduler, "_write_state", fail)
+    scheduler._save_state()
+    writer = scheduler._writer
+    if writer is not None:
+        writer.join()
+
+    assert "disk full" in capsys.readouterr().err
+    with pytest.raises(RuntimeError, match="disk full"):
+        scheduler.flush()
+
+
+def test_mark_work_completed_persists_after_flush(temp_scheduler_dir, quota_tracker):
+    """Test that background writes are visible once flush() returns."""
+    state_file = temp_scheduler_dir / "test-queue.json"
+    scheduler1 = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    scheduler1.add_work(TimedWorkItem(
+        id="work-1",
+        description="Search for papers",
+        timing=WorkTiming.ASYNCHRONOUS,
+        estimated_quota=20,
+        estimated_duration_minutes=60,
+    ))
+    scheduler1.schedule_overnight_work()
+    scheduler1.mark_work_completed("work-1", "done")
+    scheduler1.flush()
+
+    scheduler2 = TemporalScheduler(quota_tracker=quota_tracker, state_file=state_file)
+    assert [w.id for w in scheduler2.completed_overnight] == ["work-1"]
+    assert scheduler2.completed_overnight[0].result == "done"
@@ -5,12 +5,12 @@ Tests syntax validation, build checks, and test collection.
 """
 
 import pytest
-from pathlib import Path
+import shutil
+import subprocess
 import sys
+from pathlib import Path
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent / "plugins" / "infolead-claude-subscription-router" / "implementation"))
-
+import validation_executor
 from validation_executor import (
     ValidationExecutor,
     ValidationResult,
@@ -18,6 +18,14 @@ from validation_executor import (
 )
 
 
+@pytest.fixture(autouse=True)
+def syntax_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the persistent syntax cache out of the home directory."""
+    cache_dir = tmp_path_factory.mktemp("syntax-cache")
+    monkeypatch.setattr(validation_executor, "SYNTAX_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 class TestSyntaxValidation:
     """Test syntax validation for various file types."""
 
@@ -26,48 +34,26 @@ class TestSyntaxValidation:
         """Create executor with temp project root."""
         return ValidationExecutor(project_root=tmp_path)
 
-    def test_valid_python_syntax(self, executor, tmp_path):
-        """Should pass for valid Python syntax."""
-        py_file = tmp_path / "valid.py"
-        py_file.write_text("def hello():\n    return 'hello'\n")
+    @pytest.mark.parametrize("name, content, expected", [
+        ("valid.py", b"def hello():\n    return 'hello'\n", True),
+        ("invalid.py", b"def hello(\n", False),
+        ("valid.json", b'{"key": "value", "number": 42}', True),
+        ("invalid.json", b'{"key": "value",}', False),  # Trailing comma
+    ], ids=["valid-python", "invalid-python", "valid-json", "invalid-json"])
+    def test_syntax_check(self, executor, tmp_path, name, content, expected):
+        """Should pass valid and fail invalid Python and JSON."""
+        file_path = tmp_path / name
+        file_path.write_bytes(content)
 
-        result = executor.validate_syntax(py_file)
+        result = executor.validate_syntax(file_path)
 
-        assert result.passed is True
+        assert result.passed is expected
         assert result.validation_type == ValidationType.SYNTAX
 
-    def test_invalid_python_syntax(self, executor, tmp_path):
-        """Should fail for invalid Python syntax."""
-        py_file = tmp_path / "invalid.py"
-        py_file.write_text("def hello(\n")
-
-        result = executor.validate_syntax(py_file)
-
-        assert result.passed is False
-        assert result.validation_type == ValidationType.SYNTAX
-
-    def test_valid_json_syntax(self, executor, tmp_path):
-        """Should pass for valid JSON."""
-        json_file = tmp_path / "valid.json"
-        json_file.write_text('{"key": "value", "number": 42}')
-
-        result = executor.validate_syntax(json_file)
-
-        assert result.passed is True
-
-    def test_invalid_json_syntax(self, executor, tmp_path):
-        """Should fail for invalid JSON."""
-        json_file = tmp_path / "invalid.json"
-        json_file.write_text('{"key": "value",}')  # Trailing comma
-
-        result = executor.validate_syntax(json_file)
-
-        assert result.passed is False
-
     def test_unknown_extension(self, executor, tmp_path):
         """Should pass for unknown file extensions (no validator)."""
         unknown_file = tmp_path / "file.xyz"
-        unknown_file.write_text("random content")
+        unknown_file.write_bytes(b"random content")
 
         result = executor.validate_syntax(unknown_file)
 
@@ -76,40 +62,164 @@ class TestSyntaxValidation:
         assert "No syntax validator" in result.details
 
 
-class TestProjectTypeDetection:
-    """Test project type detection."""
+class TestSyntaxCache:
+    """Test the content-addressed syntax result cache."""
+
+    def test_result_cached_by_content(self, tmp_path, syntax_cache_dir):
+        """A second check of identical content is served from the cache."""
+        executor = ValidationExecutor(project_root=tmp_path)
+        first = tmp_path / "first.py"
+        first.write_bytes(b"def hello(\n")
+
+        assert executor.validate_syntax(first).passed is False
+        (cache_file,) = syntax_cache_dir.rglob("*.json")
+
+        # Doctor the cached result (and drop the in-memory copy) to prove
+        # the hit skips the parse
+        cache_file.write_bytes(b'{"passed": true, "error": null}')
+        validation_executor._syntax_memo.clear()
+        second = tmp_path / "second.py"
+        second.write_bytes(b"def hello(\n")
 
-    def test_detect_nix_project(self, tmp_path):
-        """Should detect Nix projects."""
-        (tmp_path / "flake.nix").write_text("{}")
+        assert executor.validate_syntax(second).passed is True
 
+    def test_repeat_served_from_memory(self, tmp_path, monkeypatch):
+        """Content seen earlier in the process skips the cache file."""
         executor = ValidationExecutor(project_root=tmp_path)
+        py_file = tmp_path / "ok.py"
+        py_file.write_bytes(b"x = 1\n")
+        assert executor.validate_syntax(py_file).passed is True
 
-        assert executor.project_type == "nix"
+        monkeypatch.setattr(executor, "_read_syntax_cache", lambda digest: pytest.fail("cache file read"))
+        copy = tmp_path / "copy.py"
+        copy.write_bytes(b"x = 1\n")
 
-    def test_detect_npm_project(self, tmp_path):
-        """Should detect NPM projects."""
-        (tmp_path / "package.json").write_text('{"name": "test"}')
+        assert executor.validate_syntax(copy).passed is True
 
+    def test_failure_output_names_file(self, tmp_path):
+        """Cached failures report the path being validated."""
         executor = ValidationExecutor(project_root=tmp_path)
+        for name in ("a.json", "b.json"):
+            (tmp_path / name).write_bytes(b'{"key": }')
 
-        assert executor.project_type == "npm"
+        executor.validate_syntax(tmp_path / "a.json")
+        result = executor.validate_syntax(tmp_path / "b.json")
 
-    def test_detect_python_project(self, tmp_path):
-        """Should detect Python projects."""
-        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'test'")
+        assert result.passed is False
+        assert str(tmp_path / "b.json") in result.output
+        assert "a.json" not in result.output
 
+    def test_extension_is_part_of_key(self, tmp_path):
+        """The same bytes are checked separately per language."""
+        executor = ValidationExecutor(project_root=tmp_path)
+        (tmp_path / "x.py").write_bytes(b"[1, 2]\n")
+        (tmp_path / "x.json").write_bytes(b"[1, 2]\n")
+        (tmp_path / "y.py").write_bytes(b"{'a': 1}\n")
+        (tmp_path / "y.json").write_bytes(b"{'a': 1}\n")
+
+        assert executor.validate_syntax(tmp_path / "x.py").passed is True
+        assert executor.validate_syntax(tmp_path / "x.json").passed is True
+        assert executor.validate_syntax(tmp_path / "y.py").passed is True
+        assert executor.validate_syntax(tmp_path / "y.json").passed is False
+
+    @pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+    def test_json_backends(self, tmp_path, monkeypatch, backend):
+        """JSON is checked with orjson when installed, else the json module, by the same rules."""
+        import json_codec
+        if backend == "orjson":
+            if json_codec.orjson is None:
+                pytest.skip("orjson not installed")
+        else:
+            monkeypatch.setattr(json_codec, "orjson", None)
+        executor = ValidationExecutor(project_root=tmp_path)
+        (tmp_path / "good.json").write_bytes(b'{"key": [1, 2.5, null]}')
+        (tmp_path / "bad.json").write_bytes(b'{"key": [1, 2.5,]}')
+        (tmp_path / "nan.json").write_bytes(b'{"key": NaN}')
+        (tmp_path / "bom.json").write_bytes(b'\xef\xbb\xbf{"key": 1}')
+
+        assert executor.validate_syntax(tmp_path / "good.json").passed is True
+        assert executor.validate_syntax(tmp_path / "bad.json").passed is False
+        # Same rules for both backends, so results share one cache
+        assert executor.validate_syntax(tmp_path / "nan.json").passed is False
+        assert executor.validate_syntax(tmp_path / "bom.json").passed is False
+        assert "orjson" not in executor.syntax_cache_dir.name
+
+    @pytest.mark.parametrize("hasher", ["xxhash", "sha256"])
+    def test_content_hashers(self, tmp_path, monkeypatch, hasher):
+        """Content is keyed by XXH3-128 when installed, else SHA-256."""
+        if hasher == "xxhash":
+            if validation_executor.xxhash is None:
+                pytest.skip("xxhash not installed")
+        else:
+            monkeypatch.setattr(validation_executor, "xxhash", None)
         executor = ValidationExecutor(project_root=tmp_path)
+        py_file = tmp_path / "ok.py"
+        py_file.write_bytes(b"x = 1\n")
+
+        assert executor.validate_syntax(py_file).passed is True
+        assert executor.validate_syntax(py_file).passed is True
+        assert ("-xxh3" in executor.syntax_cache_dir.name) == (hasher == "xxhash")
+        assert len(list(executor.syntax_cache_dir.rglob("*.json"))) == 1
+
+    def test_python_verdict_keyed_by_interpreter(self, tmp_path, monkeypatch):
+        """A Python verdict cached by one interpreter is not reused by another."""
+        py_file = tmp_path / "ok.py"
+        py_file.write_bytes(b"x = 1\n")
+        json_file = tmp_path / "data.json"
+        json_file.write_bytes(b"[1]")
+        executor = ValidationExecutor(project_root=tmp_path)
+        executor.validate_syntax(py_file)
+        executor.validate_syntax(json_file)
 
-        assert executor.project_type == "python"
+        monkeypatch.setattr(validation_executor, "_PYTHON_TAG", "cpython-9.99")
+        executor.validate_syntax(py_file)
+        executor.validate_syntax(json_file)
 
-    def test_detect_latex_project(self, tmp_path):
-        """Should detect LaTeX projects."""
-        (tmp_path / "main.tex").write_text("\\documentclass{article}")
+        # One new entry for the Python file; JSON verdicts are shared
+        assert len(list(executor.syntax_cache_dir.rglob("*.json"))) == 3
+
+    def test_compile_warnings_not_reported(self, tmp_path):
+        """SyntaxWarnings from compile() neither fail the check nor reach stderr."""
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import validation_executor; "
+            "print(validation_executor._check_python_syntax(b'assert (1, 2)\\n'))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-W", "error", "-c", script,
+             str(Path(validation_executor.__file__).parent)],
+            capture_output=True, text=True,
+        )
+
+        assert result.stdout.strip() == "None"
+        assert result.stderr == ""
+
+    def test_unwritable_cache_still_validates(self, tmp_path):
+        """A cache directory that cannot be created does not break checks."""
+        blocker = tmp_path / "not-a-dir"
+        blocker.write_bytes(b"")
+        executor = ValidationExecutor(project_root=tmp_path, syntax_cache_dir=blocker)
+        py_file = tmp_path / "ok.py"
+        py_file.write_bytes(b"x = 1\n")
+
+        assert executor.validate_syntax(py_file).passed is True
+
+
+class TestProjectTypeDetection:
+    """Test project type detection."""
+
+    @pytest.mark.parametrize("marker_file, content, expected", [
+        ("flake.nix", b"{}", "nix"),
+        ("package.json", b'{"name": "test"}', "npm"),
+        ("pyproject.toml", b"[project]\nname = 'test'", "python"),
+        ("main.tex", b"\\documentclass{article}", "latex"),
+    ], ids=["nix", "npm", "python", "latex"])
+    def test_detect_project(self, tmp_path, marker_file, content, expected):
+        """Should detect the project type from its marker file."""
+        (tmp_path / marker_file).write_bytes(content)
 
         executor = ValidationExecutor(project_root=tmp_path)
 
-        assert executor.project_type == "latex"
+        assert executor.project_type == expected
 
     def test_detect_no_project_type(self, tmp_path):
         """Should return None for unknown project types."""
@@ -118,6 +228,16 @@ class TestProjectTypeDetection:
 
         assert executor.project_type is None
 
+    def test_detection_deferred_until_read(self, tmp_path):
+        """Detection runs on first access, then the result is kept."""
+        executor = ValidationExecutor(project_root=tmp_path)
+        (tmp_path / "flake.nix").write_bytes(b"{}")
+
+        assert executor.project_type == "nix"
+
+        (tmp_path / "flake.nix").unlink()
+        assert executor.project_type == "nix"
+
 
 class TestBuildValidation:
     """Test build validation."""
@@ -161,6 +281,81 @@ class TestTestValidation:
         assert result.validation_type == ValidationType.TEST
 
 
+@pytest.mark.skipif(shutil.which("sh") is None, reason="needs a POSIX shell")
+class TestBatchedCommands:
+    """Test running several commands in one shell."""
+
+    def test_results_split_per_command(self, tmp_path):
+        """Each command gets its own exit code and output."""
+        executor = ValidationExecutor(project_root=tmp_path)
+
+        results = executor._run_commands_batched([
+            ["echo", "first"],
+            ["false"],
+            ["sh", "-c", "echo err >&2; echo out"],
+            ["no-such-command-for-validation"],
+        ])
+
+        assert results == [
+            (0, "first"),
+            (1, ""),
+            (0, "err\nout"),
+            (-2, "Command not found: no-such-command-for-validation"),
+        ]
+
+    def test_stop_on_failure(self, tmp_path):
+        """Commands after a failure are skipped when asked."""
+        executor = ValidationExecutor(project_root=tmp_path)
+
+        results = executor._run_commands_batched(
+            [["echo", "first"], ["false"], ["echo", "third"]], stop_on_failure=True
+        )
+
+        assert results == [(0, "first"), (1, "")]
+
+    @pytest.mark.skipif(shutil.which("timeout") is None, reason="needs timeout(1)")
+    def test_timeouts_are_per_command(self, tmp_path, monkeypatch):
+        """A hung command times out on its own limit without losing earlier results."""
+        import validation_executor
+        monkeypatch.setattr(validation_executor, "TEST_TIMEOUT", 1)
+        (tmp_path / "pyproject.toml").write_bytes(b"[tool.pytest.ini_options]\n")
+        executor = ValidationExecutor(project_root=tmp_path)
+        monkeypatch.setitem(executor.BUILD_COMMANDS, "python", ["echo", "built"])
+        monkeypatch.setitem(executor.TEST_COMMANDS, "pytest", ["sleep", "30"])
+
+        results = executor.validate_all([], fast_fail=False)
+
+        assert results["build"].passed is True
+        assert results["build"].output == "built"
+        assert results["tests"].passed is False
+        assert results["tests"].exit_code == -1
+        assert results["tests"].output == "Command timed out after 1s"
+
+    def test_validate_all_shares_one_shell(self, tmp_path, monkeypatch):
+        """Build and test collection run in a single process."""
+        (tmp_path / "pyproject.toml").write_bytes(b"[tool.pytest.ini_options]\n")
+        executor = ValidationExecutor(project_root=tmp_path)
+        monkeypatch.setitem(executor.BUILD_COMMANDS, "python", ["echo", "built"])
+        monkeypatch.setitem(executor.TEST_COMMANDS, "pytest", ["sh", "-c", "echo broken; exit 2"])
+        calls = []
+        run_command = executor._run_command
+
+        def counting_run(cmd, timeout=30, cwd=None):
+            calls.append(cmd)
+            return run_command(cmd, timeout=timeout, cwd=cwd)
+
+        monkeypatch.setattr(executor, "_run_command", counting_run)
+
+        results = executor.validate_all([])
+
+        assert len(calls) == 1
+        assert results["build"].passed is True
+        assert results["build"].output == "built"
+        assert results["tests"].passed is False
+        assert results["tests"].exit_code == 2
+        assert results["tests"].output == "broken"
+
+
 class TestValidateAll:
     """Test combined validation."""
 
@@ -172,7 +367,7 @@ class TestValidateAll:
     def test_validate_all_single_file(self, executor, tmp_path):
         """Should validate single file."""
         py_file = tmp_path / "test.py"
-        py_file.write_text("x = 1\n")
+        py_file.write_bytes(b"x = 1\n")
 
         results = executor.validate_all([py_file])
 
@@ -184,8 +379,8 @@ class TestValidateAll:
         """Should validate multiple files."""
         file1 = tmp_path / "file1.py"
         file2 = tmp_path / "file2.py"
-        file1.write_text("x = 1\n")
-        file2.write_text("y = 2\n")
+        file1.write_bytes(b"x = 1\n")
+        file2.write_bytes(b"y = 2\n")
 
         results = executor.validate_all([file1, file2])
 
@@ -196,8 +391,8 @@ class TestValidateAll:
         """Should stop on first failure with fast_fail=True."""
         bad_file = tmp_path / "bad.py"
         good_file = tmp_path / "good.py"
-        bad_file.write_text("def (\n")  # Invalid syntax
-        good_file.write_text("x = 1\n")
+        bad_file.write_bytes(b"def (\n")  # Invalid syntax
+        good_file.write_bytes(b"x = 1\n")
 
         results = executor.validate_all([bad_file, good_file], fast_fail=True)
 
@@ -209,8 +404,8 @@ class TestValidateAll:
         """Should continue after failure with fast_fail=False."""
         bad_file = tmp_path / "bad.py"
         good_file = tmp_path / "good.py"
-        bad_file.write_text("def (\n")  # Invalid syntax
-        good_file.write_text("x = 1\n")
+        bad_file.write_bytes(b"def (\n")  # Invalid syntax
+        good_file.write_bytes(b"x = 1\n")
 
         results = executor.validate_all([bad_file, good_file], fast_fail=False)
 
@@ -219,6 +414,98 @@ class TestValidateAll:
         assert len(syntax_results) == 2
 
 
+class TestSyntaxBatching:
+    """Test batched external syntax checks."""
+
+    @pytest.fixture
+    def executor(self, tmp_path, monkeypatch):
+        """Executor whose external commands are recorded, not run."""
+        executor = ValidationExecutor(project_root=tmp_path)
+        executor.calls = []
+        executor.reply = (0, "")
+
+        def fake_run(cmd, timeout=30, cwd=None):
+            executor.calls.append(cmd)
+            return executor.reply
+
+        monkeypatch.setattr(executor, "_run_command", fake_run)
+        return executor
+
+    def _write(self, tmp_path, *names):
+        paths = []
+        for name in names:
+            path = tmp_path / name
+            path.write_bytes(b"x = 1\n")
+            paths.append(path)
+        return paths
+
+    def test_one_process_per_checker(self, executor, tmp_path):
+        """Files sharing a checker are validated by one invocation."""
+        files = self._write(tmp_path, "a.ts", "b.tsx", "c.js", "d.js", "e.py")
+
+        results = executor.validate_syntax_batch(files)
+
+        assert all(result.passed for result in results.values())
+        assert len(executor.calls) == 2
+        tsc_call = next(cmd for cmd in executor.calls if "tsc" in cmd)
+        assert tsc_call[-2:] == [str(files[0]), str(files[1])]
+
+    def test_failures_attributed_by_output(self, executor, tmp_path):
+        """Only files named in the checker output fail."""
+        files = self._write(tmp_path, "a.js", "ba.js", "c.js")
+        executor.reply = (1, f"{tmp_path / 'ba.js'}\n  1:1  error  Parsing error")
+
+        results = executor.validate_syntax_batch(files)
+
+        assert [results[f].passed for f in files] == [True, False, True]
+        assert "Parsing error" in results[files[1]].output
+
+    def test_unattributed_failure_fails_batch(self, executor, tmp_path):
+        """A failure naming no file (e.g. missing tool) fails every file."""
+        files = self._write(tmp_path, "a.js", "b.js")
+        executor.reply = (-2, "Command not found: npx")
+
+        results = executor.validate_syntax_batch(files)
+
+        assert not any(result.passed for result in results.values())
+
+    def test_checkers_run_concurrently(self, executor, tmp_path, monkeypatch):
+        """Different checkers' batches overlap instead of running in turn."""
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_run(cmd, timeout=30, cwd=None):
+            barrier.wait()  # Breaks (and raises) if the other batch never starts
+            return 0, ""
+
+        monkeypatch.setattr(executor, "_run_command", fake_run)
+        files = self._write(tmp_path, "a.js", "b.js", "c.ts", "d.ts")
+
+        results = executor.validate_syntax_batch(files)
+
+        assert len(results) == 4 and all(r.passed for r in results.values())
+
+    def test_stop_on_failure_keeps_failure(self, executor, tmp_path):
+        """stop_on_failure still reports the failure that stopped the run."""
+        bad = tmp_path / "bad.py"
+        bad.write_bytes(b"def (\n")
+        files = [bad] + self._write(tmp_path, *(f"ok{i}.py" for i in range(50)))
+
+        results = executor.validate_syntax_batch(files, stop_on_failure=True)
+
+        assert results[bad].passed is False
+        assert all(result.passed for path, result in results.items() if path != bad)
+
+    def test_validate_all_batches(self, executor, tmp_path):
+        """validate_all reports batched results under per-file keys."""
+        files = self._write(tmp_path, "a.js", "b.js")
+
+        results = executor.validate_all(files)
+
+        assert len(executor.calls) == 1
+        assert "syntax:a.js" in results and "syntax:b.js" in results
+
+
 class TestAllPassed:
     """Test all_passed helper."""
 
@@ -308,18 +595,24 @@ class TestValidationResult:
 class TestCommandTimeout:
     """Test command timeout handling."""
 
-    def test_timeout_result(self, tmp_path):
+    def test_timeout_result(self, tmp_path, monkeypatch):
         """Should handle command timeouts gracefully."""
         executor = ValidationExecutor(project_root=tmp_path)
 
-        # Run command with very short timeout (may timeout)
+        # Time out immediately instead of spawning and waiting on a process
+        def timed_out(cmd, timeout=None, **kwargs):
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        monkeypatch.setattr(validation_executor.subprocess, "run", timed_out)
+
         exit_code, output = executor._run_command(
             ["sleep", "10"],
             timeout=0.1
         )
 
         # Should return timeout error
-        assert exit_code == -1 or "timeout" in output.lower() or exit_code == 0
+        assert exit_code == -1
+        assert "timed out after 0.1s" in output
 
 
 class TestNonexistentFiles:
@@ -335,6 +628,16 @@ class TestNonexistentFiles:
         # Should not have syntax result for nonexistent file
         assert f"syntax:{nonexistent.name}" not in results
 
+    def test_nothing_to_check_skips_build_and_tests(self, tmp_path, monkeypatch):
+        """Without a project type or checkable files nothing else runs."""
+        executor = ValidationExecutor(project_root=tmp_path)
+        notes = tmp_path / "notes.xyz"
+        notes.write_bytes(b"random content")
+        monkeypatch.setattr(executor, "_test_plan", lambda: pytest.fail("test plan resolved"))
+
+        assert executor.validate_all([tmp_path / "does_not_exist.py"]) == {}
+        assert list(executor.validate_all([notes])) == ["syntax:notes.xyz"]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
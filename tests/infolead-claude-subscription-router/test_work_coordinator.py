@@ -4,19 +4,25 @@ Unit tests for work_coordinator module.
 Tests Kanban-style work coordination with WIP limits.
 """
 
+import fcntl
+import threading
 import unittest
 import sys
 from pathlib import Path
 import tempfile
 import shutil
+import json
+from unittest import mock
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "plugins" / "infolead-claude-subscription-router" / "implementation"))
 
+import work_coordinator
 from work_coordinator import (
     WorkCoordinator,
     WorkItem,
     WorkStatus,
+    read_work_queue,
 )
 
 
@@ -69,20 +75,38 @@ class TestWorkItem(unittest.TestCase):
 
         self.assertEqual(original.id, restored.id)
         self.assertEqual(original.dependencies, restored.dependencies)
+        self.assertEqual(restored.dependencies, frozenset(["dep1"]))
+
+    def test_dependencies_stored_as_frozenset(self):
+        """Dependencies given as a list become a frozenset, serialized sorted."""
+        item = WorkItem(id="test1", description="Test task", priority=5, dependencies=["b", "a", "b"])
+
+        self.assertEqual(item.dependencies, frozenset({"a", "b"}))
+        self.assertEqual(item.to_dict()["dependencies"], ["a", "b"])
+
+    def test_from_dict_interns_ids(self):
+        """Equal ids from separate records share one string object."""
+        base = {"description": "Task", "priority": 5, "estimated_complexity": 3, "status": "queued"}
+        dep = WorkItem.from_dict({**base, "id": "".join(["dep", "1"])})
+        item = WorkItem.from_dict({**base, "id": "test1", "dependencies": ["".join(["dep", "1"])]})
+
+        self.assertIs(next(iter(item.dependencies)), dep.id)
+
+    def test_slotted(self):
+        """Items carry no per-instance __dict__."""
+        item = WorkItem(id="test1", description="Test task", priority=5)
+
+        self.assertFalse(hasattr(item, "__dict__"))
+        with self.assertRaises(AttributeError):
+            item.notes = "not a field"
 
 
 class TestWorkCoordinator(unittest.TestCase):
     """Test WorkCoordinator functionality."""
 
     def setUp(self):
-        """Create temporary directory for each test."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.state_file = self.temp_dir / "work-queue.json"
-        self.coord = WorkCoordinator(wip_limit=2, state_file=self.state_file)
-
-    def tearDown(self):
-        """Clean up temporary directory."""
-        shutil.rmtree(self.temp_dir)
+        """Create an in-memory coordinator for each test."""
+        self.coord = WorkCoordinator(wip_limit=2, persist=False)
 
     def test_add_work(self):
         """Test adding work items."""
@@ -97,6 +121,17 @@ class TestWorkCoordinator(unittest.TestCase):
         self.assertEqual(len(self.coord.work_items), 1)
         self.assertEqual(self.coord.work_items[0].id, "w1")
 
+    def test_get_by_id(self):
+        """Items are looked up by ID; unknown IDs give None and are ignored."""
+        item = WorkItem(id="w1", description="Test task", priority=5)
+        self.coord.add_work(item)
+
+        self.assertIs(self.coord.get("w1"), item)
+        self.assertIsNone(self.coord.get("missing"))
+        self.coord.complete_work("missing")
+        self.coord.fail_work("missing", "no such work")
+        self.assertEqual(self.coord.get_status_summary()["total_count"], 1)
+
     def test_wip_limit_respected(self):
         """Test that WIP limit is respected."""
         # Add 3 tasks
@@ -115,6 +150,18 @@ class TestWorkCoordinator(unittest.TestCase):
         self.assertEqual(len(started), 2)
         self.assertEqual(self.coord.get_active_count(), 2)
 
+    def test_schedule_fills_free_slots_at_once(self):
+        """One call starts work for every free slot, stamped with one start time."""
+        self.coord.wip_limit = 3
+        for i in range(5):
+            self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+
+        started = self.coord.schedule_work()
+
+        self.assertEqual([w.id for w in started], ["w0", "w1", "w2"])
+        self.assertEqual(len({w.started_at for w in started}), 1)
+        self.assertEqual(self.coord.schedule_work(), [])
+
     def test_priority_ordering(self):
         """Test that higher priority work is scheduled first."""
         # Add tasks with different priorities
@@ -187,7 +234,7 @@ class TestWorkCoordinator(unittest.TestCase):
         self.coord.complete_work("w1")
 
         # Now w2 should be active
-        w2 = next(w for w in self.coord.work_items if w.id == "w2")
+        w2 = self.coord.get("w2")
         self.assertEqual(w2.status, WorkStatus.ACTIVE)
 
     def test_unblocking_priority(self):
@@ -229,22 +276,83 @@ class TestWorkCoordinator(unittest.TestCase):
         self.assertIn("blocker", started_ids)
         self.assertIn("independent", started_ids)
 
-    def test_state_persistence(self):
-        """Test that state is saved and loaded correctly."""
-        # Add work item
-        self.coord.add_work(WorkItem(
-            id="w1",
-            description="Test task",
-            priority=5,
-            estimated_complexity=2
-        ))
+    def test_longest_chain_breaks_ties(self):
+        """Between equally ranked work, the head of the longer chain goes first."""
+        self.coord.wip_limit = 1
+        self.coord.add_work(WorkItem(id="x", description="X", priority=5))
+        self.coord.add_work(WorkItem(id="y", description="Y", priority=5, dependencies=["x"]))
+        self.coord.add_work(WorkItem(id="a", description="A", priority=5))
+        self.coord.add_work(WorkItem(id="b", description="B", priority=5, dependencies=["a"]))
+        self.coord.add_work(WorkItem(id="c", description="C", priority=5, dependencies=["b"]))
 
-        # Create new coordinator with same state file
-        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+        started = self.coord.schedule_work()
 
-        # Should load previous state
-        self.assertEqual(len(coord2.work_items), 1)
-        self.assertEqual(coord2.work_items[0].id, "w1")
+        self.assertEqual([w.id for w in started], ["a"])
+
+    def test_dependent_added_later_reprioritizes(self):
+        """Work gaining a dependent after it became ready jumps the queue."""
+        self.coord.add_work(WorkItem(id="a", description="A", priority=5))
+        self.coord.add_work(WorkItem(id="b", description="B", priority=8))
+        self.coord.add_work(WorkItem(id="x", description="X", priority=9))
+        self.coord.add_work(WorkItem(id="c", description="C", priority=1, dependencies=["a"]))
+
+        started = self.coord.schedule_work()
+
+        self.assertEqual([w.id for w in started], ["a", "x"])
+
+    def test_failing_completed_dependency_reblocks(self):
+        """A dependent is blocked again if its completed dependency later fails."""
+        self.coord.wip_limit = 1
+        self.coord.add_work(WorkItem(id="a", description="A", priority=5))
+        self.coord.add_work(WorkItem(id="b", description="B", priority=6, dependencies=["a"]))
+        self.coord.add_work(WorkItem(id="c", description="C", priority=5, dependencies=["a"]))
+        self.coord.schedule_work()  # starts a
+
+        self.coord.complete_work("a")  # b and c become ready; b starts
+        self.coord.fail_work("a", "reverted")
+        self.coord.complete_work("b")
+
+        # c must not start once a is no longer completed
+        self.assertEqual(
+            [(w.id, w.status) for w in self.coord.work_items],
+            [("a", WorkStatus.FAILED), ("b", WorkStatus.COMPLETED), ("c", WorkStatus.QUEUED)],
+        )
+        self.assertEqual(self.coord.count_dependent_work("a"), 2)
+
+    def test_items_added_with_status_are_indexed(self):
+        """Items added already active or completed count as such."""
+        self.coord.add_work(WorkItem(id="c", description="C", priority=5, dependencies=["d"]))
+        self.coord.add_work(WorkItem(id="d", description="D", priority=5, status=WorkStatus.COMPLETED))
+        self.coord.add_work(WorkItem(id="e", description="E", priority=5, status=WorkStatus.ACTIVE))
+
+        self.assertEqual(self.coord.get_completed_ids(), {"d"})
+        self.assertEqual(self.coord.get_active_count(), 1)
+        self.assertEqual([w.id for w in self.coord.schedule_work()], ["c"])
+
+    def test_dependencies_satisfied(self):
+        """Readiness holds for queued and not-yet-added items alike."""
+        self.coord.add_work(WorkItem(id="a", description="A", priority=5))
+        queued = WorkItem(id="b", description="B", priority=5, dependencies=["a"])
+        self.coord.add_work(queued)
+        candidate = WorkItem(id="c", description="C", priority=5, dependencies=["a"])
+
+        self.assertFalse(self.coord.dependencies_satisfied(queued))
+        self.assertFalse(self.coord.dependencies_satisfied(candidate))
+
+        self.coord.schedule_work()
+        self.coord.complete_work("a")
+
+        self.assertTrue(self.coord.dependencies_satisfied(queued))
+        self.assertTrue(self.coord.dependencies_satisfied(candidate))
+
+    def test_queued_tasks(self):
+        """Queued tasks leave the queued view once started."""
+        for i in range(4):
+            self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+        self.coord.schedule_work()
+        self.coord.complete_work("w0")
+
+        self.assertEqual([w.id for w in self.coord.get_queued_tasks()], ["w3"])
 
     def test_complete_work(self):
         """Test work completion."""
@@ -305,18 +413,201 @@ class TestWorkCoordinator(unittest.TestCase):
         self.assertGreater(summary["active_count"], 0)
 
 
-class TestWorkCoordinatorEdgeCases(unittest.TestCase):
-    """Test edge cases in work coordination."""
+class TestWorkCoordinatorPersistence(unittest.TestCase):
+    """Test WorkCoordinator state persistence."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Create one temporary directory shared by the tests."""
+        cls.temp_dir = Path(tempfile.mkdtemp())
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary directory."""
+        shutil.rmtree(cls.temp_dir)
 
     def setUp(self):
-        """Create temporary directory for each test."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.state_file = self.temp_dir / "work-queue.json"
+        """Give each test its own state file."""
+        self.state_file = self.temp_dir / f"{self._testMethodName}.json"
         self.coord = WorkCoordinator(wip_limit=2, state_file=self.state_file)
 
-    def tearDown(self):
-        """Clean up temporary directory."""
-        shutil.rmtree(self.temp_dir)
+    def test_state_persistence(self):
+        """Test that state is saved and loaded correctly."""
+        # Add work item
+        self.coord.add_work(WorkItem(
+            id="w1",
+            description="Test task",
+            priority=5,
+            estimated_complexity=2
+        ))
+
+        # Create new coordinator with same state file
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+
+        # Should load previous state
+        self.assertEqual(len(coord2.work_items), 1)
+        self.assertEqual(coord2.work_items[0].id, "w1")
+
+    def test_in_memory_coordinator_skips_disk(self):
+        """persist=False neither creates nor reads the state file."""
+        state_file = self.temp_dir / "unused" / self.state_file.name
+        coord = WorkCoordinator(wip_limit=2, state_file=state_file, persist=False)
+        coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        coord.schedule_work()
+        coord.complete_work("w1")
+
+        self.assertFalse(state_file.parent.exists())
+
+    def test_status_summary_survives_reload(self):
+        """Status counts rebuilt from disk match the live coordinator's."""
+        for i in range(4):
+            self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+        self.coord.schedule_work()
+        self.coord.complete_work("w0")
+        self.coord.fail_work("w1", "boom")
+
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+
+        self.assertEqual(coord2.get_status_summary(), self.coord.get_status_summary())
+        self.assertEqual(
+            coord2.get_status_summary(),
+            {"wip_limit": 2, "active_count": 2, "queued_count": 0,
+             "completed_count": 1, "failed_count": 1, "total_count": 4},
+        )
+
+    def test_failed_snapshot_keeps_previous_one(self):
+        """A snapshot write that fails leaves the old state file intact."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        self.coord.add_work(WorkItem(id="w2", description="Task 2", priority=5))
+        before = self.state_file.read_bytes()
+
+        with mock.patch.object(work_coordinator.os, "replace", side_effect=OSError("disk full")):
+            with self.assertRaises(RuntimeError):
+                self.coord._save_state()
+
+        self.assertEqual(self.state_file.read_bytes(), before)
+        self.assertEqual(list(self.temp_dir.glob(f"{self.state_file.name}*.tmp")), [])
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+        self.assertEqual([w.id for w in coord2.work_items], ["w1", "w2"])
+
+    def test_mutations_append_to_journal(self):
+        """After the first snapshot, each change appends instead of rewriting."""
+        for i in range(3):
+            self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+        self.coord.schedule_work()
+        self.coord.complete_work("w0")
+
+        snapshot = json.loads(self.state_file.read_text())
+        self.assertEqual([w["id"] for w in snapshot["work_items"]], ["w0"])
+        records = self.coord.journal_file.read_text().splitlines()
+        self.assertEqual(
+            [json.loads(r)["op"] for r in records],
+            ["add", "add", "start", "start", "complete", "start"],
+        )
+
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+        self.assertEqual(
+            [(w.id, w.status) for w in coord2.work_items],
+            [(w.id, w.status) for w in self.coord.work_items],
+        )
+
+    def test_update_cost_independent_of_queue_size(self):
+        """Completing an item writes one record however long the queue is."""
+        self.coord.wip_limit = 1
+        for i in range(200):
+            self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+        self.coord.schedule_work()
+        snapshot_size = self.state_file.stat().st_size
+        journal_size = self.coord.journal_file.stat().st_size
+
+        self.coord.complete_work("w0")
+
+        self.assertEqual(self.state_file.stat().st_size, snapshot_size)
+        written = self.coord.journal_file.read_text()[journal_size:].splitlines()
+        self.assertEqual([json.loads(r)["item"]["id"] for r in written], ["w0", "w1"])
+
+    def test_journal_compacts_into_snapshot(self):
+        """A journal over the size threshold is folded into the snapshot."""
+        with mock.patch.object(work_coordinator, "JOURNAL_COMPACT_BYTES", 200):
+            for i in range(5):
+                self.coord.add_work(WorkItem(id=f"w{i}", description=f"Task {i}", priority=5))
+
+        self.assertLess(self.coord.journal_file.stat().st_size, 200)
+        data = read_work_queue(self.state_file)
+        self.assertEqual([w["id"] for w in data["work_items"]], [f"w{i}" for i in range(5)])
+
+    def test_torn_journal_line_ignored(self):
+        """A partial record from an interrupted append doesn't break loading."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        self.coord.add_work(WorkItem(id="w2", description="Task 2", priority=5))
+        with open(self.coord.journal_file, "a") as f:
+            f.write('{"op": "add", "item": {"id": "w3"')
+
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+
+        self.assertEqual([w.id for w in coord2.work_items], ["w1", "w2"])
+
+    def test_append_after_torn_journal_line_kept(self):
+        """A record appended after a torn line is not glued onto it."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        self.coord.add_work(WorkItem(id="w2", description="Task 2", priority=5))
+        with open(self.coord.journal_file, "a") as f:
+            f.write('{"op": "add", "item": {"id": "w3", "desc')
+
+        coord2 = WorkCoordinator(wip_limit=2, state_file=self.state_file)
+        coord2.add_work(WorkItem(id="w4", description="Task 4", priority=5))
+
+        data = read_work_queue(self.state_file)
+        self.assertEqual([w["id"] for w in data["work_items"]], ["w1", "w2", "w4"])
+        self.assertEqual(self.coord.journal_file.stat().st_mode & 0o777, 0o600)
+
+    def test_writes_wait_for_sidecar_lock(self):
+        """Appends block while another process holds the queue lock file."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        journal_size = self.coord.journal_file.stat().st_size if self.coord.journal_file.exists() else 0
+
+        with open(self.coord.lock_file) as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            writer = threading.Thread(
+                target=self.coord.add_work,
+                args=(WorkItem(id="w2", description="Task 2", priority=5),),
+            )
+            writer.start()
+            writer.join(0.3)
+            self.assertTrue(writer.is_alive())
+            size = self.coord.journal_file.stat().st_size if self.coord.journal_file.exists() else 0
+            self.assertEqual(size, journal_size)
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        writer.join(5)
+
+        self.assertFalse(writer.is_alive())
+        self.assertEqual([w["id"] for w in read_work_queue(self.state_file)["work_items"]], ["w1", "w2"])
+
+    def test_snapshot_locks_sidecar_not_state_file(self):
+        """Snapshots lock work-queue.lock, which survives the snapshot rename."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5))
+        lock_inode = self.coord.lock_file.stat().st_ino
+        state_inode = self.state_file.stat().st_ino
+
+        # A lock on the replaced state file (the old scheme) doesn't block
+        with open(self.state_file) as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            writer = threading.Thread(target=self.coord._save_state)
+            writer.start()
+            writer.join(5)
+            self.assertFalse(writer.is_alive())
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        self.assertNotEqual(self.state_file.stat().st_ino, state_inode)
+        self.assertEqual(self.coord.lock_file.stat().st_ino, lock_inode)
+
+
+class TestWorkCoordinatorEdgeCases(unittest.TestCase):
+    """Test edge cases in work coordination."""
+
+    def setUp(self):
+        """Create an in-memory coordinator for each test."""
+        self.coord = WorkCoordinator(wip_limit=2, persist=False)
 
     def test_empty_queue(self):
         """Test scheduling from empty queue."""
@@ -347,6 +638,36 @@ class TestWorkCoordinatorEdgeCases(unittest.TestCase):
         # Nothing should start (circular dependency)
         self.assertEqual(len(started), 0)
 
+    def test_cyclic_ids(self):
+        """Work on or behind a cycle is reported; missing dependencies are not cycles."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5, dependencies=["w2"]))
+        self.coord.add_work(WorkItem(id="w2", description="Task 2", priority=5, dependencies=["w1"]))
+        self.coord.add_work(WorkItem(id="w3", description="Task 3", priority=5, dependencies=["w2"]))
+        self.coord.add_work(WorkItem(id="w4", description="Task 4", priority=5, dependencies=["nonexistent"]))
+        self.coord.add_work(WorkItem(id="w5", description="Task 5", priority=5, dependencies=["w4"]))
+
+        self.assertEqual(self.coord.get_cyclic_ids(), {"w1", "w2", "w3"})
+
+        # Cached result is refreshed once the graph changes
+        self.coord.add_work(WorkItem(id="w6", description="Task 6", priority=5, dependencies=["w3"]))
+        self.assertEqual(self.coord.get_cyclic_ids(), {"w1", "w2", "w3", "w6"})
+
+    def test_repeat_schedule_skips_rebuild(self):
+        """The ready heap is only rebuilt after dependency edges are added."""
+        self.coord.add_work(WorkItem(id="w1", description="Task 1", priority=5, dependencies=["w2"]))
+        self.coord.add_work(WorkItem(id="w2", description="Task 2", priority=5, dependencies=["w1"]))
+        self.coord.add_work(WorkItem(id="w3", description="Task 3", priority=5))
+
+        with mock.patch.object(self.coord, "_refresh_graph", wraps=self.coord._refresh_graph) as refresh:
+            self.assertEqual([w.id for w in self.coord.schedule_work()], ["w3"])
+            self.coord.complete_work("w3")
+            self.assertEqual(self.coord.schedule_work(), [])
+            self.coord.add_work(WorkItem(id="w4", description="Task 4", priority=5))
+            self.coord.add_work(WorkItem(id="w5", description="Task 5", priority=5, dependencies=["later"]))
+            self.assertEqual([w.id for w in self.coord.schedule_work()], ["w4"])
+
+        self.assertEqual(refresh.call_count, 1)
+
     def test_missing_dependency(self):
         """Test work with missing dependency."""
         # Add task with non-existent dependency